@@ -12,6 +12,11 @@ import re
 import itertools
 import seaborn as sns  # NEW: Import seaborn for the new chart
 
+try:
+    from ami_scripts.reporting_dates import parse_date_created
+except ImportError:
+    from reporting_dates import parse_date_created
+
 
 def fetch_data_from_jdbc():
     # Load environment variables
@@ -133,8 +138,8 @@ def process_data(df, division=None, overall_months=18, recent_months=3):
     - overall_months: how many months to include for the table ranking and overall aggregations.
     - recent_months : how many months to include for the recent-activity bar chart.
     """
-    # 1) Convert dateCreated to datetime
-    df['dateCreated'] = pd.to_datetime(df['dateCreated'], errors='coerce')
+    # 1) Convert dateCreated (YYYY-MM-DD or M/D/YYYY) to datetime
+    df['dateCreated'] = parse_date_created(df['dateCreated'])
 
     # 2) Combine the division codes
     df = combine_division_codes(df)
@@ -6,6 +6,7 @@ import os
 import re
 import pandas as pd
 from fmrest import Server
+from fmrest.exceptions import FileMakerError
 from collections import defaultdict
 from bookops_nypl_platform import PlatformSession, PlatformToken
 import logging
@@ -14,6 +15,18 @@ from openpyxl.styles import Font
 from typing import Dict, List, Set, Optional, Tuple, Any
 from dataclasses import dataclass, field
 
+try:
+    from ami_scripts.catalog_clients import (SCSBClient, SierraClient, ResponseCache,
+                                             DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_CACHE_TTL)
+except ImportError:
+    from catalog_clients import (SCSBClient, SierraClient, ResponseCache,
+                                 DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_CACHE_TTL)
+
+# Number of AMI IDs / box barcodes OR-combined into a single FileMaker find
+FIND_BATCH_SIZE = 50
+FM_PAGE_SIZE = 100
+FM_NO_RECORDS_ERROR = 401
+
 
 @dataclass
 class MigrationStatusSummary:
@@ -95,16 +108,20 @@ class Config:
 class APIClient:
     """Base class for API clients."""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 cache: Optional[ResponseCache] = None):
         self.config = config
+        self.concurrency = concurrency
+        self.rate = rate
+        self.cache = cache
         self.logger = logging.getLogger(self.__class__.__name__)
 
 
 class PlatformAPIClient(APIClient):
     """Client for Platform API interactions."""
     
-    def __init__(self, config: Config):
-        super().__init__(config)
+    def __init__(self, config: Config, **kwargs):
+        super().__init__(config, **kwargs)
         self.session = None
     
     def connect(self) -> bool:
@@ -136,6 +153,14 @@ class PlatformAPIClient(APIClient):
         except Exception as e:
             self.logger.error(f"Error fetching item from Sierra: {e}")
             return {"error": str(e)}
+
+    def get_sierra_items(self, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get Sierra items for many barcodes concurrently (rate limited, cached)."""
+        if not self.session:
+            return {bc: {"error": "Platform session not established"} for bc in barcodes}
+        client = SierraClient(lambda bc: self.session.get_item_list(barcode=bc),
+                              concurrency=self.concurrency, rate=self.rate, cache=self.cache)
+        return client.items(barcodes)
     
     def extract_sierra_location(self, data: Dict[str, Any]) -> Tuple[str, str]:
         """Extract Sierra location from API response."""
@@ -176,6 +201,12 @@ class SCSBAPIClient(APIClient):
         except requests.RequestException as e:
             self.logger.error(f"SCSB API request failed: {e}")
             return [{"error": str(e)}]
+
+    def get_availabilities(self, barcodes: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get SCSB availability for many barcodes, batched over the multi-barcode endpoint."""
+        client = SCSBClient(self.config.scsb_api_url, self.config.scsb_api_key,
+                            concurrency=self.concurrency, rate=self.rate, cache=self.cache)
+        return {bc: [item] for bc, item in client.items(barcodes).items()}
     
     def extract_availability_status(self, json_response: List[Dict[str, Any]]) -> str:
         """Extract availability status from SCSB response."""
@@ -229,6 +260,26 @@ class FileMakerClient(APIClient):
         found = self.fms.find([query], offset=offset, limit=limit)
         return [rec.to_dict() for rec in found]
 
+    def find_all_records(self, queries: List[Dict[str, Any]], page_size: int = FM_PAGE_SIZE) -> List[Dict[str, Any]]:
+        """
+        Runs an OR-combined find (one find request per query) and pages
+        through every matching record. No matches returns an empty list.
+        """
+        records: List[Dict[str, Any]] = []
+        offset = 1
+        while True:
+            try:
+                found = self.fms.find(queries, offset=offset, limit=page_size)
+            except FileMakerError:
+                if str(self.fms.last_error) == str(FM_NO_RECORDS_ERROR):
+                    return records
+                raise
+            page = [rec.to_dict() for rec in found]
+            records.extend(page)
+            if len(page) < page_size:
+                return records
+            offset += page_size
+
     
     def disconnect(self) -> None:
         """Disconnect from FileMaker database."""
@@ -353,35 +404,99 @@ class RecordProcessor:
         self.platform_client = platform_client
         self.scsb_client = scsb_client
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._box_records: Dict[str, List[Dict[str, Any]]] = {}
+        self._sierra_cache: Dict[str, Tuple[str, str]] = {}
+        self._scsb_cache: Dict[str, str] = {}
 
     def _fetch_all_box_records(self, box_barcode: str) -> List[Dict[str,Any]]:
-        all_records = []
-        page_size  = 100
-        offset     = 1
+        if box_barcode not in self._box_records:
+            self._prefetch_boxes([box_barcode])
+        return self._box_records[box_barcode]
 
-        while True:
-            page = self.fm_client.find_records(
-                {"OBJECTS_parent_from_OBJECTS::id_barcode": box_barcode},
-                offset=offset,
-                limit=page_size
+    @staticmethod
+    def _normalize_ami_id(value: Any) -> str:
+        text = str(value).strip()
+        try:
+            return f"{int(float(text)):06d}"
+        except ValueError:
+            return text
+
+    @staticmethod
+    def _chunks(values: List[str], size: int = FIND_BATCH_SIZE):
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+    def _resolve_ami_ids(self, ami_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Look up AMI IDs with OR-combined finds, FIND_BATCH_SIZE IDs per request."""
+        resolved: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for chunk in self._chunks(ami_ids):
+            self.logger.info(f"Looking up {len(chunk)} AMI IDs ({chunk[0]} - {chunk[-1]})")
+            for record in self.fm_client.find_all_records([{"ref_ami_id": ami_id} for ami_id in chunk]):
+                resolved[self._normalize_ami_id(record.get('ref_ami_id'))].append(record)
+        return resolved
+
+    def _prefetch_boxes(self, box_barcodes: List[str]) -> None:
+        """Fetch every item in the given boxes with OR-combined finds; memoized by barcode for the run."""
+        pending = sorted({b for b in box_barcodes if b and b not in self._box_records})
+        for chunk in self._chunks(pending):
+            for barcode in chunk:
+                self._box_records[barcode] = []
+            queries = [{"OBJECTS_parent_from_OBJECTS::id_barcode": barcode} for barcode in chunk]
+            for record in self.fm_client.find_all_records(queries):
+                barcode = record.get('OBJECTS_parent_from_OBJECTS::id_barcode')
+                if barcode in self._box_records:
+                    self._box_records[barcode].append(record)
+
+    def _sierra_location(self, barcode: str) -> Tuple[str, str]:
+        """Sierra location for a barcode, looked up once per run."""
+        if barcode not in self._sierra_cache:
+            platform_data = self.platform_client.get_sierra_item(barcode)
+            self._sierra_cache[barcode] = self.platform_client.extract_sierra_location(platform_data)
+        return self._sierra_cache[barcode]
+
+    def _scsb_availability(self, barcode: str) -> str:
+        """SCSB availability for a barcode, looked up once per run."""
+        if barcode not in self._scsb_cache:
+            self._scsb_cache[barcode] = self.scsb_client.extract_availability_status(
+                self.scsb_client.get_availability(barcode)
             )
-            all_records.extend(page)
-            if len(page) < page_size:
-                # we hit the last page
-                break
-            offset += page_size
-        return all_records
-    
+        return self._scsb_cache[barcode]
+    
+    def _prefetch_catalog(self, records: List[Dict[str, Any]]) -> None:
+        """Look up Sierra locations for every box and SCSB availability for every box and single item up front."""
+        box_barcodes = sorted({r.get('OBJECTS_parent_from_OBJECTS::id_barcode') for r in records} - {None, ''})
+        item_barcodes = sorted({r.get('id_barcode') for r in records
+                                if not r.get('OBJECTS_parent_from_OBJECTS::id_barcode')} - {None, ''})
+
+        sierra_pending = [b for b in box_barcodes if b not in self._sierra_cache]
+        if sierra_pending:
+            self.logger.info(f"Looking up {len(sierra_pending)} box barcodes in Sierra")
+            for barcode, data in self.platform_client.get_sierra_items(sierra_pending).items():
+                self._sierra_cache[barcode] = self.platform_client.extract_sierra_location(data)
+
+        scsb_pending = [b for b in box_barcodes + item_barcodes if b not in self._scsb_cache]
+        if scsb_pending:
+            self.logger.info(f"Looking up {len(scsb_pending)} barcodes in SCSB")
+            for barcode, response in self.scsb_client.get_availabilities(scsb_pending).items():
+                self._scsb_cache[barcode] = self.scsb_client.extract_availability_status(response)
+
     def process_records(self, spec_ami_ids: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, BoxSummary]]:
         """Process all records and return details and box summary."""
         ami_id_details = []
         box_summary = defaultdict(BoxSummary)
         spec_ami_id_set = {str(i) for i in spec_ami_ids}
+
+        records_by_id = self._resolve_ami_ids(sorted({str(i) for i in spec_ami_ids}))
+        self._prefetch_boxes([
+            record.get('OBJECTS_parent_from_OBJECTS::id_barcode')
+            for records in records_by_id.values() for record in records
+        ])
+        self._prefetch_catalog([record for records in records_by_id.values() for record in records])
         
         for ami_id in sorted(spec_ami_ids):
             self.logger.info(f"Processing AMI ID: {ami_id}")
             
-            records = self.fm_client.find_records({"ref_ami_id": ami_id})
+            records = records_by_id.get(self._normalize_ami_id(ami_id), [])
             
             if not records:
                 self.logger.warning(f"No records found for AMI ID: {ami_id}")
@@ -416,9 +531,7 @@ class RecordProcessor:
         
         if ami_barcode:
             self.logger.info(f"Handling single item in SCSB: {ami_barcode}")
-            scsb_availability = self.scsb_client.extract_availability_status(
-                self.scsb_client.get_availability(ami_barcode)
-            )
+            scsb_availability = self._scsb_availability(ami_barcode)
         else:
             scsb_availability = 'No Barcode for Single Item'
         
@@ -454,11 +567,8 @@ class RecordProcessor:
         
         # Get Sierra and SCSB data (only once per box)
         if not box_summary[box_name].scsb_availabilities:
-            platform_data = self.platform_client.get_sierra_item(box_barcode)
-            sierra_location_code, sierra_location_display = self.platform_client.extract_sierra_location(platform_data)
-            
-            scsb_response = self.scsb_client.get_availability(box_barcode)
-            scsb_availability = self.scsb_client.extract_availability_status(scsb_response)
+            sierra_location_code, sierra_location_display = self._sierra_location(box_barcode)
+            scsb_availability = self._scsb_availability(box_barcode)
             
             box_summary[box_name].scsb_availabilities.add(scsb_availability)
         else:
@@ -669,6 +779,24 @@ def parse_arguments() -> argparse.Namespace:
         required=True,
         help="Path to output XLSX file for exported data"
     )
+    parser.add_argument(
+        '--api-concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum concurrent Sierra/SCSB requests (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        '--api-rate',
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"Maximum Sierra/SCSB requests per second (default: {DEFAULT_RATE})"
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=DEFAULT_CACHE_TTL / 3600,
+        help=f"Reuse cached Sierra/SCSB responses up to this many hours old; 0 disables the cache (default: {DEFAULT_CACHE_TTL // 3600})"
+    )
     return parser.parse_args()
 
 
@@ -692,9 +820,11 @@ def main() -> None:
         logger.info("Starting SPEC AMI processing...")
         
         # Initialize clients
+        cache = ResponseCache(ttl=args.cache_ttl * 3600) if args.cache_ttl > 0 else None
+        api_options = {'concurrency': args.api_concurrency, 'rate': args.api_rate, 'cache': cache}
         fm_client = FileMakerClient(config)
-        platform_client = PlatformAPIClient(config)
-        scsb_client = SCSBAPIClient(config)
+        platform_client = PlatformAPIClient(config, **api_options)
+        scsb_client = SCSBAPIClient(config, **api_options)
         
         # Connect to services
         if not fm_client.connect(args.username, args.password):
@@ -729,6 +859,8 @@ def main() -> None:
         # Cleanup
         if 'fm_client' in locals():
             fm_client.disconnect()
+        if locals().get('cache'):
+            cache.close()
 
 
 if __name__ == "__main__":
@@ -17,6 +17,7 @@ from typing import Any, Dict, List, Optional, Set
 from collections import defaultdict
 
 import pandas as pd
+import requests
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.backends.backend_pdf import PdfPages
@@ -26,10 +27,11 @@ import numpy as np
 from datetime import datetime, date
 
 try:
-    from fmrest import Server
+    from ami_scripts.s3_inventory import S3Inventory, DEFAULT_MAX_AGE_HOURS
+    from ami_scripts.fm_data_api import DataAPIFetcher, DataAPIError, DEFAULT_SESSIONS
 except ImportError:
-    logging.error("fmrest package not found. Install with: pip install python-fmrest")
-    sys.exit(1)
+    from s3_inventory import S3Inventory, DEFAULT_MAX_AGE_HOURS
+    from fm_data_api import DataAPIFetcher, DataAPIError, DEFAULT_SESSIONS
 
 # Set up enhanced styling
 plt.style.use('seaborn-v0_8-whitegrid')
@@ -116,11 +118,26 @@ class Config:
 
 class AWSChecker:
     """Handles S3 bulk inventory building and dataframe augmentation."""
-    def __init__(self, profile_name: Optional[str] = None):
+    def __init__(self, profile_name: Optional[str] = None, refresh: bool = False,
+                 max_age_hours: float = DEFAULT_MAX_AGE_HOURS, inventory_report: Optional[str] = None):
         self.profile_name = profile_name
         self.bucket_name = 'ami-carnegie-servicecopies'
         self.s3_client = None
+        self.refresh = refresh
+        self.max_age_hours = max_age_hours
+        self.inventory_report = inventory_report
         self.inventory = defaultdict(list)
+        self._inventory_frame: Optional[pd.DataFrame] = None
+
+    def needs_listing(self) -> bool:
+        """True if build_inventory() will have to list the bucket (and so needs AWS)."""
+        if self.inventory_report:
+            return False
+        with S3Inventory(self.bucket_name) as index:
+            return self._should_list(index)
+
+    def _should_list(self, index: S3Inventory) -> bool:
+        return self.refresh or index.is_stale(self.max_age_hours) or index.object_count() == 0
 
     def connect(self):
         try:
@@ -143,66 +160,68 @@ class AWSChecker:
             raise
 
     def build_inventory(self):
-        """Pulls all keys from the bucket and maps 6-digit IDs to file lists."""
-        logging.info(f"Building local S3 inventory from '{self.bucket_name}'. This may take a moment...")
-        
-        paginator = self.s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=self.bucket_name)
-        
-        # Matches exactly 6 digits not surrounded by other digits
-        id_pattern = re.compile(r'(?<!\d)(\d{6})(?!\d)')
-        count = 0
-        
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    key = obj['Key']
-                    count += 1
-                    
-                    # Find any 6-digit sequences in the filename
-                    matches = id_pattern.findall(key)
-                    for match in matches:
-                        self.inventory[match].append(key)
-                        
+        """Loads the shared S3 inventory index, refreshing it if stale, and maps 6-digit IDs to file lists."""
+        with S3Inventory(self.bucket_name) as index:
+            if self.inventory_report:
+                index.ingest_inventory(Path(self.inventory_report))
+            elif self._should_list(index):
+                logging.info(f"Refreshing S3 inventory for '{self.bucket_name}'. This may take a moment...")
+                index.refresh(self.s3_client)
+            else:
+                age_hours = (datetime.now().timestamp() - index.refreshed_at()) / 3600
+                logging.info(f"Using cached S3 inventory ({age_hours:.1f} hours old; --refresh-aws to re-list)")
+            count = index.object_count()
+            self.inventory = defaultdict(list, index.id_map())
+            self._inventory_frame = None
+
         logging.info(f"✅ S3 inventory built! Scanned {count:,} files and found {len(self.inventory):,} unique IDs.")
 
+    def inventory_frame(self) -> pd.DataFrame:
+        """The inventory as one row per (6-digit ID, S3 key)."""
+        if self._inventory_frame is None:
+            self._inventory_frame = pd.DataFrame(
+                [(ami_id, key) for ami_id, keys in self.inventory.items() for key in keys],
+                columns=['AMI ID Key', 'Key']
+            )
+        return self._inventory_frame
+
     def apply_to_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """Injects S3 validation data into the dataframe for Migrated items."""
         if df.empty or 'AMI ID' not in df.columns or 'Migration Status' not in df.columns:
             return df
             
         df = df.copy()
-        # Initialize columns
-        df['S3 File Count'] = ''
-        df['S3 Files'] = ''
+        # Initialize columns (object dtype, since counts are ints and blanks are '')
+        df['S3 File Count'] = pd.Series('', index=df.index, dtype=object)
+        df['S3 Files'] = pd.Series('', index=df.index, dtype=object)
         
         migrated_mask = df['Migration Status'].fillna('').str.strip().str.lower() == 'migrated'
+        ami_ids = pd.to_numeric(df['AMI ID'], errors='coerce')
+        eligible = migrated_mask & ami_ids.notna()
         
-        if not migrated_mask.any():
+        if not eligible.any():
             return df
 
-        # Apply mapping only to migrated items
-        for idx, row in df[migrated_mask].iterrows():
-            ami_id = row['AMI ID']
-            if pd.isna(ami_id):
-                continue
-                
-            # Ensure it's treated as a 6 digit string
-            id_str = f"{int(ami_id):06d}"
-            matched_files = self.inventory.get(id_str, [])
-            
-            df.at[idx, 'S3 File Count'] = len(matched_files)
-            if matched_files:
-                df.at[idx, 'S3 Files'] = ", ".join(matched_files)
+        # Join migrated items to the inventory on the zero-padded 6 digit ID,
+        # then count and concatenate keys only for the IDs actually requested
+        id_keys = pd.DataFrame({'AMI ID Key': ami_ids[eligible].astype('int64').map('{:06d}'.format)})
+        hits = self.inventory_frame().merge(id_keys.drop_duplicates(), on='AMI ID Key')
+        grouped = (hits['Key'].astype(object) + ', ').groupby(hits['AMI ID Key'], sort=False)
+        per_id = pd.DataFrame({'S3 File Count': grouped.size(), 'S3 Files': grouped.sum().str[:-2]})
+        matched = id_keys.merge(per_id, how='left', left_on='AMI ID Key', right_index=True)
+
+        df.loc[eligible, 'S3 File Count'] = matched['S3 File Count'].fillna(0).astype(int).tolist()
+        df.loc[eligible, 'S3 Files'] = matched['S3 Files'].fillna('').tolist()
                 
         return df
 
 
 class FileMakerClient:
     """Enhanced FileMaker client with better error handling and logging."""
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, sessions: int = DEFAULT_SESSIONS):
         self.config = config
-        self.fms: Optional[Server] = None
+        self.sessions = sessions
+        self.fms: Optional[DataAPIFetcher] = None
         self._connected = False
 
     def connect(self, username: str, password: str) -> bool:
@@ -210,19 +229,20 @@ class FileMakerClient:
             url = f"https://{self.config.server}"
             logging.info(f"Connecting to FileMaker at {self.config.server}...")
             
-            self.fms = Server(
+            self.fms = DataAPIFetcher(
                 url,
                 database=self.config.database,
                 layout=self.config.layout,
-                user=username,
+                username=username,
                 password=password,
-                verify_ssl=True,
-                api_version='v1'
+                sessions=self.sessions,
+                verify_ssl=True
             )
             
             self.fms.login()
             self._connected = True
-            logging.info(f"Successfully connected to database '{self.config.database}' on layout '{self.config.layout}'")
+            logging.info(f"Successfully connected to database '{self.config.database}' on layout '{self.config.layout}' "
+                         f"({self.sessions} sessions)")
             return True
             
         except Exception as e:
@@ -234,40 +254,13 @@ class FileMakerClient:
         if not self._connected or not self.fms:
             raise FileMakerConnectionError("Not connected to FileMaker")
 
-        offset = 1
-        all_records: List[Dict[str, Any]] = []
-
         logging.info(f"Starting paginated fetch for query: {query}")
-        while True:
-            try:
-                page = self.fms.find(
-                    [query],
-                    offset=offset,
-                    limit=page_size,
-                    portals=portals
-                )
-
-                records: List[Dict[str, Any]] = []
-                for rec in page:
-                    d = rec.to_dict()
-                    for key in list(d.keys()):
-                        if key.startswith('portal_'):
-                            fs = getattr(rec, key, None)
-                            if fs is not None:
-                                d[key] = [row.to_dict() for row in fs]
-                    records.append(d)
-                    
-                logging.info(f"Fetched {len(records)} records (offset {offset})")
-
-                all_records.extend(records)
-
-                if len(records) < page_size:
-                    break
-                offset += page_size
-
-            except Exception as e:
-                logging.error(f"Error fetching records at offset {offset}: {e}")
-                raise FileMakerConnectionError(f"Query failed: {e}") from e
+        try:
+            # First page gives the found count; remaining pages are fetched concurrently
+            all_records = self.fms.find_all([query], page_size=page_size, portals=portals)
+        except (DataAPIError, requests.RequestException) as e:
+            logging.error(f"Error fetching records: {e}")
+            raise FileMakerConnectionError(f"Query failed: {e}") from e
 
         logging.info(f"Total records fetched: {len(all_records)}")
         return all_records
@@ -805,7 +798,13 @@ Examples:
     parser.add_argument('--pdf', action='store_true', help='Generate PDF report alongside Excel file')
     parser.add_argument('-v', '--verbose', action='store_true', help='Enable verbose logging')
     parser.add_argument('--check-aws', action='store_true', help='Check S3 for migrated files (Requires AWS credentials)')
+    parser.add_argument('--fm-sessions', type=int, default=DEFAULT_SESSIONS,
+                        help=f'Concurrent FileMaker Data API sessions used to fetch pages (default: {DEFAULT_SESSIONS})')
     parser.add_argument('--aws-profile', help='AWS CLI profile to use (if using --check-aws)')
+    parser.add_argument('--refresh-aws', action='store_true', help='Re-list the S3 bucket even if the cached inventory is fresh')
+    parser.add_argument('--aws-max-age', type=float, default=DEFAULT_MAX_AGE_HOURS,
+                        help=f'Re-list the bucket when the cached inventory is older than this many hours (default: {DEFAULT_MAX_AGE_HOURS})')
+    parser.add_argument('--aws-inventory-report', help='Load the S3 inventory from an S3 Inventory manifest.json/CSV/Parquet instead of listing')
     
     return parser.parse_args()
 
@@ -846,9 +845,12 @@ def main() -> int:
         # Initialize AWS Checker Early (Fail fast if requested but unauthenticated)
         aws_checker = None
         if args.check_aws:
-            aws_checker = AWSChecker(profile_name=args.aws_profile)
+            aws_checker = AWSChecker(profile_name=args.aws_profile, refresh=args.refresh_aws,
+                                     max_age_hours=args.aws_max_age,
+                                     inventory_report=args.aws_inventory_report)
             try:
-                aws_checker.connect()
+                if aws_checker.needs_listing():
+                    aws_checker.connect()
                 # Fetch the inventory NOW so it's ready when the dataframes are built
                 aws_checker.build_inventory()
             except Exception as e:
@@ -868,7 +870,7 @@ def main() -> int:
             pdf_file = desktop_dir / f"{args.collection_id}_Migration_Status.pdf"
             pdf_path = validate_output_path(str(pdf_file))
 
-        fm_client = FileMakerClient(config)
+        fm_client = FileMakerClient(config, sessions=args.fm_sessions)
 
         try:
             fm_client.connect(username, password)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Local SQLite snapshot of AMIDB tables for the reporting scripts.
+
+The snapshot mirrors the queried columns of a FileMaker table together with
+FileMaker's ROWID and ROWMODID system columns. A refresh first pulls only the
+(ROWID, ROWMODID) pairs, then fetches full rows just for records that are new
+or whose modification count changed, and drops records deleted upstream.
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_SNAPSHOT_PATH = Path(
+    os.environ.get('AMIDB_SNAPSHOT', Path.home() / '.ami_snapshots' / 'amidb.sqlite')
+)
+FETCH_CHUNK_SIZE = 500
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sqlite(value):
+    """Convert JDBC values (which may be Java objects) to SQLite-storable types."""
+    if value is None or isinstance(value, (int, float, str, bytes)):
+        return value
+    return str(value)
+
+
+class AMIDBSnapshot:
+    """Incrementally refreshed local copy of selected AMIDB table columns."""
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_log ("
+            "table_name TEXT PRIMARY KEY, columns TEXT NOT NULL, synced_at REAL NOT NULL)"
+        )
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _ensure_table(self, table, columns):
+        """Create the mirror table, rebuilding it if the column list changed."""
+        column_key = '\t'.join(columns)
+        row = self.conn.execute(
+            "SELECT columns FROM sync_log WHERE table_name = ?", (table,)
+        ).fetchone()
+        if row and row[0] != column_key:
+            self.conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+            self.conn.execute("DELETE FROM sync_log WHERE table_name = ?", (table,))
+        col_defs = ', '.join(_quote(c) for c in columns)
+        self.conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_quote(table)} "
+            f"(ROWID_FM INTEGER PRIMARY KEY, ROWMODID_FM INTEGER, {col_defs})"
+        )
+
+    def last_synced(self, table):
+        row = self.conn.execute(
+            "SELECT synced_at FROM sync_log WHERE table_name = ?", (table,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def has_table(self, table):
+        return self.last_synced(table) is not None
+
+    def refresh(self, jdbc_conn, table, columns, chunk_size=FETCH_CHUNK_SIZE):
+        """
+        Bring the local mirror of `table` up to date over JDBC.
+
+        Returns:
+            Tuple of (added, updated, deleted) record counts
+        """
+        self._ensure_table(table, columns)
+        curs = jdbc_conn.cursor()
+
+        curs.execute(f"SELECT ROWID, ROWMODID FROM {table}")
+        remote = {int(rowid): int(modid) for rowid, modid in curs.fetchall()}
+        local = dict(self.conn.execute(
+            f"SELECT ROWID_FM, ROWMODID_FM FROM {_quote(table)}"
+        ).fetchall())
+
+        added = [r for r in remote if r not in local]
+        updated = [r for r in remote if r in local and local[r] != remote[r]]
+        deleted = [r for r in local if r not in remote]
+
+        select_cols = ', '.join(_quote(c) for c in columns)
+        placeholders = ', '.join('?' * (len(columns) + 2))
+        insert_sql = f"INSERT OR REPLACE INTO {_quote(table)} VALUES ({placeholders})"
+        to_fetch = sorted(added + updated)
+        for start in range(0, len(to_fetch), chunk_size):
+            chunk = to_fetch[start:start + chunk_size]
+            id_list = ', '.join(str(r) for r in chunk)
+            curs.execute(
+                f"SELECT ROWID, ROWMODID, {select_cols} FROM {table} WHERE ROWID IN ({id_list})"
+            )
+            self.conn.executemany(
+                insert_sql, ([_to_sqlite(v) for v in row] for row in curs.fetchall())
+            )
+
+        self.conn.executemany(
+            f"DELETE FROM {_quote(table)} WHERE ROWID_FM = ?", ((r,) for r in deleted)
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_log (table_name, columns, synced_at) VALUES (?, ?, ?)",
+            (table, '\t'.join(columns), time.time())
+        )
+        self.conn.commit()
+        curs.close()
+        return len(added), len(updated), len(deleted)
+
+    def read(self, table, columns=None):
+        """Load the mirrored table (optionally a subset of columns) as a DataFrame."""
+        select_cols = ', '.join(_quote(c) for c in columns) if columns else '*'
+        df = pd.read_sql_query(f"SELECT {select_cols} FROM {_quote(table)}", self.conn)
+        return df.drop(columns=['ROWID_FM', 'ROWMODID_FM'], errors='ignore')
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Single-decode audio level analysis shared by the service copy scripts.
+
+Each audio stream is decoded once by ffmpeg into a float32 NumPy array of
+shape (samples, channels). All per-channel statistics used for auto-panning
+are then computed from that one buffer:
+
+* windowed RMS levels (1024-sample windows, as astats reports per frame) and
+  their 20th/50th/95th percentiles, used as noise floor / median / peak
+* the share of windows more than `headroom_db` above the noise floor
+* mean and max volume over the whole probe (what volumedetect reports)
+
+The decoded buffer is also handed to ltc_decoder for LTC detection, so a
+stream is read from disk once no matter how many channels are checked.
+"""
+
+import json
+import logging
+import subprocess
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+ANALYSIS_SAMPLE_RATE = 48000
+RMS_WINDOW = 1024
+LEVEL_FLOOR_DB = -120.0
+VOLUME_FLOOR_DB = -91.0  # volumedetect's floor for digital silence
+PERCENTILES = (20, 50, 95)
+
+
+def probe_audio_streams(input_file) -> List[Tuple[int, int]]:
+    """Return (stream index, channel count) for every audio stream in the file."""
+    cmd = [
+        "ffprobe", "-v", "error", "-select_streams", "a",
+        "-show_entries", "stream=index,channels", "-of", "json", str(input_file)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or not result.stdout.strip():
+        return []
+    streams = json.loads(result.stdout).get('streams', [])
+    return [(int(s['index']), int(s.get('channels') or 1)) for s in streams]
+
+
+def decode_stream_pcm(input_file, stream_index: int, channels: int, duration: float,
+                      start_time: float = 0.0, sample_rate: int = ANALYSIS_SAMPLE_RATE) -> np.ndarray:
+    """Decode one audio stream to a (samples, channels) float32 array in a single ffmpeg pass."""
+    cmd = ["ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error"]
+    if start_time > 0.0:
+        cmd.extend(["-ss", f"{start_time:.6f}"])
+    cmd.extend([
+        "-t", str(duration), "-i", str(input_file),
+        "-map", f"0:{stream_index}", "-vn",
+        "-ar", str(sample_rate), "-ac", str(channels),
+        "-f", "f32le", "pipe:1"
+    ])
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode("utf-8", errors="replace").strip()
+                           or f"ffmpeg decode failed for stream {stream_index}")
+    pcm = np.frombuffer(result.stdout, dtype=np.float32)
+    usable = (pcm.size // channels) * channels
+    return pcm[:usable].reshape((-1, channels))
+
+
+def _db(values: np.ndarray, floor: float, power: bool = False) -> np.ndarray:
+    scale = 10.0 if power else 20.0
+    with np.errstate(divide='ignore'):
+        return np.maximum(scale * np.log10(values), floor)
+
+
+def empty_levels(min_active_ratio: float = 0.01) -> Dict[str, Any]:
+    """Stats for a channel with no decodable audio (treated as silent)."""
+    return {
+        "noise_floor": -90.0, "median": -90.0, "p95": -90.0, "threshold": -60.0,
+        "active_ratio": 0.0, "is_silent": 0.0 < min_active_ratio,
+        "mean_vol": None, "max_vol": None
+    }
+
+
+def channel_levels(samples: np.ndarray, window: int = RMS_WINDOW, headroom_db: float = 8.0,
+                   min_active_ratio: float = 0.01) -> List[Dict[str, Any]]:
+    """Level statistics for every channel of a (samples, channels) buffer, computed in one vectorized pass."""
+    channels = samples.shape[1]
+    windows = samples.shape[0] // window
+    if windows == 0:
+        return [empty_levels(min_active_ratio) for _ in range(channels)]
+
+    # Windowed RMS with each window's DC offset removed (stands in for the 20 Hz highpass)
+    framed = samples[:windows * window].reshape(windows, window, channels)
+    centered = framed - framed.mean(axis=1, keepdims=True)
+    levels = _db(np.sqrt(np.mean(np.square(centered), axis=1, dtype=np.float64)), LEVEL_FLOOR_DB)
+
+    noise_floor, median, p95 = np.percentile(levels, PERCENTILES, axis=0, method='nearest')
+    threshold = noise_floor + headroom_db
+    active_ratio = np.mean(levels > threshold, axis=0)
+
+    mean_vol = _db(np.mean(np.square(samples), axis=0, dtype=np.float64), VOLUME_FLOOR_DB, power=True)
+    max_vol = _db(np.max(np.abs(samples), axis=0).astype(np.float64), VOLUME_FLOOR_DB)
+
+    return [
+        {
+            "noise_floor": float(noise_floor[c]), "median": float(median[c]), "p95": float(p95[c]),
+            "threshold": float(threshold[c]), "active_ratio": float(active_ratio[c]),
+            "is_silent": bool(active_ratio[c] < min_active_ratio),
+            "mean_vol": round(float(mean_vol[c]), 1), "max_vol": round(float(max_vol[c]), 1)
+        }
+        for c in range(channels)
+    ]
+
+
+def analyze_stream(input_file, stream_index: int, channels: int, duration: float, start_time: float = 0.0,
+                   headroom_db: float = 8.0, min_active_ratio: float = 0.01) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """Decode a stream once and return the PCM buffer with per-channel level statistics."""
+    samples = decode_stream_pcm(input_file, stream_index, channels, duration, start_time=start_time)
+    return samples, channel_levels(samples, headroom_db=headroom_db, min_active_ratio=min_active_ratio)
+
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+In-place BagIt manifest updater shared by remake_servicecopy_bags and
+fix_sc_sidecars.
+
+Only the payload files that were modified are rehashed (in parallel), the
+Payload-Oxum is adjusted arithmetically from the old and new file sizes
+instead of re-walking data/, and tagmanifest entries are recomputed only for
+tag files that actually changed. Every rewritten manifest is replaced
+atomically.
+
+Typical use:
+
+    updater = BagUpdater(bag_path)
+    updater.snapshot(files_about_to_change)
+    ...modify files...
+    updater.commit(modified_files)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+_MANIFEST_RE = re.compile(r'^(tag)?manifest-(\w+)\.txt$')
+_OXUM_RE = re.compile(r'^Payload-Oxum:\s*(\d+)\.(\d+)\s*$')
+
+
+def hash_file(file_path: Path, algorithms: Iterable[str]) -> Dict[str, str]:
+    """
+    Hash a file once for every requested algorithm.
+
+    Args:
+        file_path: Path to file
+        algorithms: Hash algorithm names as used in manifest filenames (e.g. 'md5')
+
+    Returns:
+        Mapping of algorithm name to hex digest
+    """
+    hashers = {alg: hashlib.new(alg) for alg in algorithms}
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            for h in hashers.values():
+                h.update(chunk)
+    return {alg: h.hexdigest() for alg, h in hashers.items()}
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to a temporary file beside `path` and atomically replace it."""
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def read_manifest(manifest_path: Path) -> List[Tuple[str, str]]:
+    """Parse a BagIt manifest into an ordered list of (checksum, relative path)."""
+    entries = []
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\r\n')
+            if not line.strip():
+                continue
+            parts = line.split(None, 1)
+            if len(parts) != 2:
+                logger.warning(f"Skipping malformed line in {manifest_path.name}: {line}")
+                continue
+            checksum, rel_path = parts
+            entries.append((checksum, rel_path.lstrip('*').strip()))
+    return entries
+
+
+def format_manifest(entries: List[Tuple[str, str]]) -> str:
+    return ''.join(f"{checksum}  {rel_path}\n" for checksum, rel_path in entries)
+
+
+class BagUpdater:
+    """Incrementally update the manifests and bag-info.txt of an existing bag."""
+
+    def __init__(self, bag_path: Path, workers: int = DEFAULT_HASH_WORKERS):
+        self.bag_path = Path(bag_path).resolve()
+        self.workers = max(1, workers)
+        self._old_sizes: Dict[str, Optional[int]] = {}
+        self.payload_manifests: Dict[str, Path] = {}
+        self.tag_manifests: Dict[str, Path] = {}
+        for item in self.bag_path.iterdir():
+            match = _MANIFEST_RE.match(item.name)
+            if match and item.is_file():
+                target = self.tag_manifests if match.group(1) else self.payload_manifests
+                target[match.group(2)] = item
+
+    def rel(self, path) -> str:
+        """Return a bag-relative, forward-slashed path (given absolute or relative to the working directory)."""
+        return Path(os.path.relpath(Path(path).resolve(), start=self.bag_path)).as_posix()
+
+    def snapshot(self, paths: Iterable) -> None:
+        """
+        Record the current sizes of files that are about to be modified.
+
+        Files that do not exist yet are recorded as new, so that committing
+        them later adds them to the manifest and the Payload-Oxum count.
+        """
+        for path in paths:
+            rel_path = self.rel(path)
+            full_path = self.bag_path / rel_path
+            self._old_sizes[rel_path] = full_path.stat().st_size if full_path.is_file() else None
+
+    def _hash_many(self, rel_paths: List[str], algorithms: List[str]) -> Dict[str, Dict[str, str]]:
+        if not rel_paths:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(rel_paths))) as pool:
+            digests = pool.map(lambda p: hash_file(self.bag_path / p, algorithms), rel_paths)
+            return dict(zip(rel_paths, digests))
+
+    def _update_payload_manifests(self, modified: List[str]) -> Tuple[int, int, List[str]]:
+        """Rehash modified payload files; returns (size delta, count delta, changed tag files)."""
+        missing = [p for p in modified if p not in self._old_sizes]
+        if missing:
+            raise ValueError(f"No size snapshot for modified files {missing}; "
+                             "call snapshot() before changing them")
+
+        present = [p for p in modified if (self.bag_path / p).is_file()]
+        removed = set(modified) - set(present)
+        algorithms = sorted(self.payload_manifests)
+        digests = self._hash_many(present, algorithms)
+
+        size_delta = 0
+        count_delta = 0
+        for rel_path in modified:
+            old_size = self._old_sizes[rel_path]
+            new_size = (self.bag_path / rel_path).stat().st_size if rel_path in digests else None
+            if old_size is None and new_size is not None:
+                count_delta += 1
+            elif old_size is not None and new_size is None:
+                count_delta -= 1
+            size_delta += (new_size or 0) - (old_size or 0)
+
+        changed_tag_files = []
+        for alg, manifest_path in self.payload_manifests.items():
+            entries = read_manifest(manifest_path)
+            known = {rel_path for _, rel_path in entries}
+            updated = []
+            for checksum, rel_path in entries:
+                if rel_path in removed:
+                    continue
+                if rel_path in digests:
+                    checksum = digests[rel_path][alg]
+                updated.append((checksum, rel_path))
+            for rel_path in present:
+                if rel_path not in known:
+                    updated.append((digests[rel_path][alg], rel_path))
+            if updated != entries:
+                atomic_write_text(manifest_path, format_manifest(updated))
+                changed_tag_files.append(manifest_path.name)
+                logger.info(f"Updated {manifest_path.name}")
+
+        return size_delta, count_delta, changed_tag_files
+
+    def _update_payload_oxum(self, size_delta: int, count_delta: int) -> bool:
+        """Adjust Payload-Oxum in bag-info.txt; returns True if the file changed."""
+        bag_info_path = self.bag_path / 'bag-info.txt'
+        if not bag_info_path.exists() or (size_delta == 0 and count_delta == 0):
+            return False
+
+        with open(bag_info_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        updated_lines = []
+        new_oxum = None
+        for line in lines:
+            match = _OXUM_RE.match(line.rstrip('\r\n'))
+            if match and new_oxum is None:
+                total_size = int(match.group(1)) + size_delta
+                total_files = int(match.group(2)) + count_delta
+                new_oxum = f"{total_size}.{total_files}"
+                updated_lines.append(f'Payload-Oxum: {new_oxum}\n')
+            else:
+                updated_lines.append(line)
+
+        if new_oxum is None:
+            logger.warning(f"No Payload-Oxum in {bag_info_path}; recomputing from data/")
+            new_oxum = self._walk_payload_oxum()
+            updated_lines.append(f'Payload-Oxum: {new_oxum}\n')
+
+        atomic_write_text(bag_info_path, ''.join(updated_lines))
+        logger.info(f"Updated Payload-Oxum to {new_oxum}")
+        return True
+
+    def _walk_payload_oxum(self) -> str:
+        total_size = 0
+        total_files = 0
+        for root, _, files in os.walk(self.bag_path / 'data'):
+            for name in files:
+                total_size += os.path.getsize(os.path.join(root, name))
+                total_files += 1
+        return f"{total_size}.{total_files}"
+
+    def _update_tag_manifests(self, changed_tag_files: List[str]) -> None:
+        if not changed_tag_files:
+            return
+        changed = sorted(set(changed_tag_files))
+        algorithms = sorted(self.tag_manifests)
+        digests = self._hash_many(changed, algorithms)
+        for alg, tag_manifest_path in self.tag_manifests.items():
+            entries = read_manifest(tag_manifest_path)
+            known = {rel_path for _, rel_path in entries}
+            updated = [(digests[p][alg] if p in digests else c, p) for c, p in entries]
+            updated.extend((digests[p][alg], p) for p in changed if p not in known)
+            if updated != entries:
+                atomic_write_text(tag_manifest_path, format_manifest(updated))
+                logger.info(f"Updated {tag_manifest_path.name}")
+
+    def commit(self, modified_paths: Iterable, modified_tag_files: Iterable[str] = ()) -> None:
+        """
+        Write updated manifests, Payload-Oxum and tagmanifests for modified files.
+
+        Args:
+            modified_paths: Payload files (absolute or relative to the working directory) changed since snapshot()
+            modified_tag_files: Additional tag files, relative to the bag (e.g. 'bag-info.txt'), changed by the caller
+        """
+        modified = sorted({self.rel(p) for p in modified_paths})
+        changed_tag_files = [self.rel(self.bag_path / p) for p in modified_tag_files]
+
+        if modified:
+            size_delta, count_delta, changed_manifests = self._update_payload_manifests(modified)
+            changed_tag_files.extend(changed_manifests)
+            if self._update_payload_oxum(size_delta, count_delta):
+                changed_tag_files.append('bag-info.txt')
+
+        self._update_tag_manifests(changed_tag_files)
+        for rel_path in modified:
+            self._old_sizes.pop(rel_path, None)
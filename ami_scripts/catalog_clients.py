@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Concurrent, rate-limited Sierra (Platform API) and SCSB lookups with an
+on-disk response cache.
+
+Both clients take a list of barcodes, drop duplicates and anything still
+fresh in the cache, and run the remaining requests on a thread pool capped
+at `concurrency` in-flight requests. A shared token bucket keeps the request
+rate under `rate` requests per second. SCSB barcodes are sent in batches of
+up to `batch_size` per request, since its availability endpoint accepts a
+list. Successful responses are cached per barcode in a SQLite file for
+`ttl` seconds; errors are never cached.
+
+A local stub server for both APIs is included for testing:
+
+    python3 catalog_clients.py --barcodes 1000 --rate 20
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get('AMI_API_CACHE', Path.home() / '.ami_api_cache' / 'catalog.sqlite')
+)
+DEFAULT_CACHE_TTL = 6 * 3600
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RATE = 5.0
+SCSB_BATCH_SIZE = 100
+
+
+class TokenBucket:
+    """Blocking token bucket: at most `rate` acquisitions per second, bursting to `burst`."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = max(1, burst or 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResponseCache:
+    """Thread-safe SQLite cache of JSON responses keyed by (namespace, key), expiring after `ttl` seconds."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_CACHE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self.conn.commit()
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        cutoff = time.time() - self.ttl
+        found = {}
+        with self.lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                for key, value in self.conn.execute(
+                    f"SELECT key, value FROM responses WHERE namespace = ? AND stored_at >= ? "
+                    f"AND key IN ({placeholders})", [namespace, cutoff, *chunk]
+                ):
+                    found[key] = json.loads(value)
+        return found
+
+    def set_many(self, namespace: str, values: Dict[str, Any]) -> None:
+        if not values:
+            return
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                [(namespace, key, json.dumps(value), now) for key, value in values.items()]
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class _ThrottledClient:
+    namespace = ''
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, rate: float = DEFAULT_RATE,
+                 cache: Optional[ResponseCache] = None):
+        self.concurrency = max(1, concurrency)
+        self.bucket = TokenBucket(rate, burst=self.concurrency)
+        self.cache = cache
+        self.requests_made = 0
+        self._count_lock = threading.Lock()
+
+    def _throttle(self) -> None:
+        self.bucket.acquire()
+        with self._count_lock:
+            self.requests_made += 1
+
+    def _lookup(self, barcodes: Iterable[str], fetch_batch: Callable[[List[str]], Dict[str, Any]],
+                batch_size: int, is_cacheable: Callable[[Any], bool]) -> Dict[str, Any]:
+        unique = list(dict.fromkeys(b for b in barcodes if b))
+        results = self.cache.get_many(self.namespace, unique) if self.cache else {}
+        pending = [b for b in unique if b not in results]
+        if results:
+            logging.info(f"{self.namespace}: {len(results)} of {len(unique)} barcodes served from cache")
+        if not pending:
+            return results
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as pool:
+            for fetched in pool.map(fetch_batch, batches):
+                results.update(fetched)
+                if self.cache:
+                    self.cache.set_many(self.namespace, {b: v for b, v in fetched.items() if is_cacheable(v)})
+        return results
+
+
+class SCSBClient(_ThrottledClient):
+    """SCSB item availability, batched over the multi-barcode endpoint."""
+    namespace = 'scsb'
+
+    def __init__(self, url: str, api_key: str, batch_size: int = SCSB_BATCH_SIZE, timeout: float = 30, **kwargs):
+        super().__init__(**kwargs)
+        self.url = url
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.headers = {
+            'accept': 'application/json',
+            'api_key': api_key,
+            'Content-Type': 'application/json'
+        }
+
+    def _fetch_batch(self, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        self._throttle()
+        try:
+            response = requests.post(self.url, json={"barcodes": barcodes}, headers=self.headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            logging.error(f"SCSB API request failed: {e}")
+            return {bc: {"error": str(e)} for bc in barcodes}
+        if response.status_code != 200:
+            logging.error(f"SCSB API returned status code: {response.status_code}")
+            return {bc: {"error": f"API returned {response.status_code}"} for bc in barcodes}
+        try:
+            items = response.json() or []
+        except ValueError as e:
+            return {bc: {"error": f"JSON parse error - {e}"} for bc in barcodes}
+        by_barcode = {item.get('itemBarcode', ''): item for item in items}
+        return {bc: by_barcode.get(bc, {"error": "Barcode missing from SCSB response"}) for bc in barcodes}
+
+    def items(self, barcodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Map each barcode to its SCSB item dict, or {'error': ...}."""
+        return self._lookup(barcodes, self._fetch_batch, self.batch_size, lambda v: 'error' not in v)
+
+    def availability(self, barcodes: Iterable[str]) -> Dict[str, str]:
+        """Map each barcode to its availability status, or 'Error: ...'."""
+        return {
+            bc: f"Error: {item['error']}" if 'error' in item else item.get('itemAvailabilityStatus', 'unknown')
+            for bc, item in self.items(barcodes).items()
+        }
+
+
+class SierraClient(_ThrottledClient):
+    """
+    Sierra item lookups, one request per barcode.
+
+    `get_item` is called as get_item(barcode) and must return a response
+    with status_code and json(); normally PlatformSession.get_item_list.
+    """
+    namespace = 'sierra'
+
+    def __init__(self, get_item: Callable[[str], Any], **kwargs):
+        super().__init__(**kwargs)
+        self.get_item = get_item
+
+    def _fetch_one(self, barcodes: List[str]) -> Dict[str, Dict[str, Any]]:
+        barcode = barcodes[0]
+        self._throttle()
+        try:
+            response = self.get_item(barcode)
+            if response.status_code == 200 and response.json().get("data"):
+                return {barcode: response.json()}
+            return {barcode: {"error": "Item barcode does not exist in Sierra database."}}
+        except Exception as e:
+            logging.error(f"Error fetching item from Sierra: {e}")
+            return {barcode: {"error": str(e)}}
+
+    def items(self, barcodes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Map each barcode to the Platform API item list response, or {'error': ...}."""
+        return self._lookup(barcodes, self._fetch_one, 1, lambda v: 'error' not in v)
+
+
+# ----- local stub server -----
+
+class StubCatalogServer:
+    """
+    Threaded stand-in for the SCSB availability endpoint (POST /scsb) and the
+    Platform API item list (GET /items?barcode=...). Barcodes ending in 0
+    are unknown to both. Records request counts and peak concurrency.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = {'scsb': 0, 'sierra': 0}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def get_item(self, barcode: str):
+        return requests.get(f"{self.url}/items", params={'barcode': barcode}, timeout=30)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _enter(self, api):
+                with server._lock:
+                    server.requests[api] += 1
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                time.sleep(server.latency)
+
+            def _leave(self):
+                with server._lock:
+                    server.in_flight -= 1
+
+            def do_POST(self):
+                self._enter('scsb')
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                    self._reply(200, [
+                        {'itemBarcode': bc,
+                         'itemAvailabilityStatus': "Item Barcode doesn't exist in SCSB database."
+                         if bc.endswith('0') else ('Available' if int(bc[-1]) % 2 else 'Not Available'),
+                         'errorMessage': None}
+                        for bc in body.get('barcodes', [])
+                    ])
+                finally:
+                    self._leave()
+
+            def do_GET(self):
+                self._enter('sierra')
+                try:
+                    barcode = parse_qs(urlparse(self.path).query).get('barcode', [''])[0]
+                    if barcode.endswith('0'):
+                        return self._reply(404, {'statusCode': 404, 'type': 'exception'})
+                    self._reply(200, {'data': [{'barcode': barcode,
+                                                'fixedFields': {'79': {'label': 'Location', 'value': 'rc2ma',
+                                                                       'display': 'Offsite'}}}]})
+                finally:
+                    self._leave()
+
+        return Handler
+
+
+def demo(barcode_count, concurrency, rate, latency):
+    barcodes = [f"33433{n:09d}" for n in range(barcode_count)]
+    with StubCatalogServer(latency=latency) as stub, tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / 'catalog.sqlite', ttl=60)
+        try:
+            for attempt in ('cold', 'warm'):
+                scsb = SCSBClient(f"{stub.url}/scsb", 'key', concurrency=concurrency, rate=rate, cache=cache)
+                sierra = SierraClient(stub.get_item, concurrency=concurrency, rate=rate, cache=cache)
+                start = time.perf_counter()
+                availability = scsb.availability(barcodes + barcodes[:10])
+                items = sierra.items(barcodes)
+                elapsed = time.perf_counter() - start
+                print(f"{attempt}: {len(availability)} SCSB statuses in {scsb.requests_made} requests, "
+                      f"{len(items)} Sierra items in {sierra.requests_made} requests, {elapsed:.2f} s")
+            print(f"stub saw {stub.requests}, peak {stub.peak_in_flight} concurrent requests "
+                  f"(cap {concurrency}, {rate}/s)")
+        finally:
+            cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exercise the Sierra/SCSB clients against a local stub server.')
+    parser.add_argument('--barcodes', type=int, default=500, help='Number of synthetic barcodes (default: 500).')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help=f'Max in-flight requests (default: {DEFAULT_CONCURRENCY}).')
+    parser.add_argument('--rate', type=float, default=50.0, help='Requests per second (default: 50).')
+    parser.add_argument('--latency', type=float, default=0.02, help='Stub seconds per request (default: 0.02).')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    demo(args.barcodes, args.concurrency, args.rate, args.latency)
+
+
+if __name__ == '__main__':
+    main()
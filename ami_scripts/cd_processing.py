@@ -12,9 +12,17 @@ import os
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
 import unicodedata
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-import json
+
+import numpy as np
+
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)   # discs rendered at once
 
 
 def strip_accents(txt: str) -> str:
@@ -45,78 +53,300 @@ def _probe_audio(wav: Path) -> tuple[int, int]:
     bd = next((int(v) for v in out if v.isdigit() and int(v) in (16, 24, 32)), 16)
     return sr, bd
 
-def measure_loudness(wav: Path) -> float | None:
-    cmd = [
-        "ffmpeg", "-nostats", "-i", str(wav),
-        "-filter_complex", "ebur128=peak=true",
-        "-f", "null", "-"
-    ]
-    proc = subprocess.run(cmd, stderr=subprocess.PIPE, text=True)
-    # find every “I: <number> LUFS”
-    values = re.findall(r"\bI:\s*(-?\d+(?:\.\d*)?) LUFS", proc.stderr)
+def _probe_channels(wav: Path) -> int:
+    cmd = ["ffprobe", "-v", "error",
+           "-select_streams", "a:0",
+           "-show_entries", "stream=channels",
+           "-of", "default=noprint_wrappers=1:nokey=1",
+           str(wav)]
+    out = subprocess.run(cmd, capture_output=True, text=True).stdout.split()
+    return next((int(v) for v in out if v.isdigit() and int(v) > 0), 2)
+
+# ── SINGLE-PASS ENGINE ─────────────────────────────────────────────────────
+# One ffmpeg decode per master feeds both the EBU R128 meter and a raw PCM
+# stream that Python splits into tracks; Edit Masters are then a plain gain
+# applied to the samples.
+EBUR128_FILTER = "ebur128=peak=true:dualmono=true:framelog=verbose"   # mono measured as dual mono, as loudnorm did
+PCM_BLOCK_SECONDS = 10
+
+@dataclass
+class PCMLayout:
+    sample_rate: int
+    bit_depth: int          # 16, or 24 for anything deeper (as pcm_s24le EMs always were)
+    channels: int
+
+    @property
+    def raw_format(self) -> str:
+        # 24-bit audio travels left-justified in 32-bit words
+        return "s16le" if self.bit_depth <= 16 else "s32le"
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype("<i2") if self.bit_depth <= 16 else np.dtype("<i4")
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.dtype.itemsize * self.channels
+
+def probe_layout(path: Path) -> PCMLayout:
+    sample_rate, bit_depth = _probe_audio(path)
+    return PCMLayout(sample_rate, 16 if bit_depth <= 16 else 24, _probe_channels(path))
+
+def parse_ebur128_summary(stderr: str) -> dict | None:
+    """Integrated loudness, loudness range and true peak from ffmpeg's ebur128 summary."""
+    # the last “I:” is the summary “Integrated loudness”
+    values = re.findall(r"\bI:\s*(-?\d+(?:\.\d*)?) LUFS", stderr)
     if not values:
         return None
+    lra = re.findall(r"\bLRA:\s*(-?\d+(?:\.\d*)?) LU\b", stderr)
+    peak = re.findall(r"\bPeak:\s*(-?(?:\d+(?:\.\d*)?|inf))", stderr)
+    return {
+        "I": float(values[-1]),
+        "LRA": float(lra[-1]) if lra else None,
+        "TP": float(peak[-1]) if peak else None,
+    }
+
+def _drain(stream, sink: list[str]) -> threading.Thread:
+    thread = threading.Thread(target=lambda: sink.append(stream.read()), daemon=True)
+    thread.start()
+    return thread
+
+def measure_loudness(wav: Path) -> float | None:
+    stats = scan_master(wav, probe_layout(wav))
+    return stats["I"] if stats else None
+
+def measure_sources(sources: list[Path]) -> dict | None:
+    """EBU R128 stats of `sources` played back to back (a single file, or a disc's tracks in join order)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if len(sources) == 1:
+            input_args = ["-i", str(sources[0])]
+        else:
+            concat_list = Path(tmp) / "tracks.txt"
+            concat_list.write_text(
+                "".join("file '" + str(src.resolve()).replace("'", "'\\''") + "'\n" for src in sources),
+                encoding="utf-8"
+            )
+            input_args = ["-f", "concat", "-safe", "0", "-i", str(concat_list)]
+        proc = subprocess.run(
+            ["ffmpeg", "-nostats", *input_args,
+             "-map", "0:a:0", "-af", EBUR128_FILTER, "-f", "null", "-"],
+            stderr=subprocess.PIPE, text=True
+        )
+    return parse_ebur128_summary(proc.stderr)
+
+def cue_split_points(cue_path: Path, sample_rate: int) -> list[tuple[int, int]]:
+    """(track number, first sample) for every TRACK's INDEX 01, as shnsplit splits."""
+    points = []
+    track = None
+    for line in cue_path.read_text(encoding="utf-8", errors="ignore").splitlines():
+        m = re.match(r"^\s*TRACK\s+(\d+)", line)
+        if m:
+            track = int(m.group(1))
+            continue
+        m = re.match(r"^\s*INDEX\s+01\s+(\d+):(\d{2}):(\d{2})", line)
+        if m and track is not None:
+            minutes, seconds, frames = map(int, m.groups())
+            cd_frames = (minutes * 60 + seconds) * 75 + frames
+            points.append((track, cd_frames * sample_rate // 75))
+            track = None
+    return points
+
+def _wav_bytes(block: np.ndarray, layout: PCMLayout) -> bytes:
+    if layout.bit_depth <= 16:
+        return block.astype("<i2", copy=False).tobytes()
+    # drop the low padding byte of each left-justified 32-bit word → packed 24-bit
+    raw = block.astype("<i4", copy=False).reshape(-1).view(np.uint8).reshape(-1, 4)
+    return raw[:, 1:].tobytes()
+
+def _open_wav(path: Path, layout: PCMLayout) -> wave.Wave_write:
+    writer = wave.open(str(path), "wb")
+    writer.setnchannels(layout.channels)
+    writer.setsampwidth(2 if layout.bit_depth <= 16 else 3)
+    writer.setframerate(layout.sample_rate)
+    return writer
+
+class TrackSplitter:
+    """Writes TrackNN.wav files from consecutive PCM blocks, cutting at the given first samples."""
+
+    def __init__(self, dest: Path, points: list[tuple[int, int]], layout: PCMLayout):
+        # audio before the first track's INDEX 01 becomes a Track00 pregap file, as with shnsplit
+        self.segments = ([(0, 0)] if points and points[0][1] > 0 else []) + points
+        self.dest = dest
+        self.layout = layout
+        self.position = 0
+        self.index = -1
+        self.writer = None
+        self.written: list[Path] = []
+
+    def _next_track(self) -> None:
+        if self.writer:
+            self.writer.close()
+        self.index += 1
+        path = self.dest / f"Track{self.segments[self.index][0]:02d}.wav"
+        self.writer = _open_wav(path, self.layout)
+        self.written.append(path)
+
+    def write(self, block: np.ndarray) -> None:
+        start = 0
+        while start < len(block):
+            if self.writer is None or (self.index + 1 < len(self.segments)
+                                       and self.position >= self.segments[self.index + 1][1]):
+                self._next_track()
+            end = len(block)
+            if self.index + 1 < len(self.segments):
+                end = min(end, start + self.segments[self.index + 1][1] - self.position)
+            self.writer.writeframesraw(_wav_bytes(block[start:end], self.layout))
+            self.position += end - start
+            start = end
+
+    def close(self) -> None:
+        if self.writer:
+            self.writer.close()
+
+def scan_master(pm: Path, layout: PCMLayout, splitter: TrackSplitter | None = None,
+                measure: bool = True) -> dict | None:
+    """
+    Read a master once: ffmpeg decodes it a single time, meters that decode
+    with ebur128 and, when splitting, pipes the same PCM to `splitter`.
+    Returns the loudness stats (None if not measured or unreadable).
+    """
+    cmd = ["ffmpeg", "-nostats", "-i", str(pm)]
+    if splitter is not None:
+        cmd += ["-map", "0:a:0", "-f", layout.raw_format, "-c:a", f"pcm_{layout.raw_format}", "pipe:1"]
+    if measure:
+        cmd += ["-map", "0:a:0", "-af", EBUR128_FILTER, "-f", "null", "-"]
+
+    stderr: list[str] = []
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=False)
+    drain = _drain(proc.stderr, stderr)
     try:
-        # the last match is the summary “Integrated loudness”
-        return float(values[-1])
-    except ValueError:
-        return None
+        if splitter is not None:
+            block_bytes = layout.frame_bytes * layout.sample_rate * PCM_BLOCK_SECONDS
+            while True:
+                data = proc.stdout.read(block_bytes)
+                if not data:
+                    break
+                usable = len(data) - len(data) % layout.frame_bytes
+                splitter.write(np.frombuffer(data[:usable], dtype=layout.dtype).reshape(-1, layout.channels))
+    finally:
+        if splitter is not None:
+            splitter.close()
+        proc.stdout.close()
+        proc.wait()
+        drain.join()
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return parse_ebur128_summary(b"".join(stderr).decode("utf-8", errors="replace")) if measure else None
+
+def pcm_blocks(path: Path, layout: PCMLayout):
+    """Yield (frames, channels) blocks; PCM WAVs are read directly, anything else is decoded once by ffmpeg."""
+    block_frames = layout.sample_rate * PCM_BLOCK_SECONDS
+    if path.suffix.lower() == ".wav":
+        try:
+            reader = wave.open(str(path), "rb")
+        except (wave.Error, EOFError):
+            reader = None
+        if reader is not None and reader.getsampwidth() in (2, 3):
+            with reader:
+                width = reader.getsampwidth()
+                while True:
+                    data = reader.readframes(block_frames)
+                    if not data:
+                        return
+                    if width == 2:
+                        yield np.frombuffer(data, dtype="<i2").reshape(-1, layout.channels)
+                    else:
+                        packed = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+                        words = np.zeros((len(packed), 4), dtype=np.uint8)
+                        words[:, 1:] = packed
+                        yield words.view("<i4").reshape(-1, layout.channels)
+        elif reader is not None:
+            reader.close()
+
+    cmd = ["ffmpeg", "-nostats", "-loglevel", "error", "-i", str(path),
+           "-map", "0:a:0", "-f", layout.raw_format, "-c:a", f"pcm_{layout.raw_format}", "pipe:1"]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    try:
+        while True:
+            data = proc.stdout.read(block_frames * layout.frame_bytes)
+            if not data:
+                break
+            usable = len(data) - len(data) % layout.frame_bytes
+            yield np.frombuffer(data[:usable], dtype=layout.dtype).reshape(-1, layout.channels)
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+def apply_gain(src: Path, dst: Path, gain_db: float, layout: PCMLayout) -> None:
+    """Second, lightweight pass: scale every sample by gain_db and write WAV (or FLAC via the encoder only)."""
+    scale = 10 ** (gain_db / 20)
+    # 24-bit samples sit in the top three bytes of each 32-bit word
+    shift = 0 if layout.bit_depth <= 16 else 8
+    info = np.iinfo(layout.dtype)
+    low, high = info.min >> shift, info.max >> shift
+    if dst.suffix.lower() == ".flac":
+        encoder = subprocess.Popen(
+            ["ffmpeg", "-y", "-nostats", "-loglevel", "error",
+             "-f", layout.raw_format, "-ar", str(layout.sample_rate), "-ac", str(layout.channels),
+             "-i", "pipe:0", "-c:a", "flac", str(dst)],
+            stdin=subprocess.PIPE
+        )
+        write = lambda block: encoder.stdin.write(block.astype(layout.dtype).tobytes())
+    else:
+        writer = _open_wav(dst, layout)
+        write = lambda block: writer.writeframesraw(_wav_bytes(block, layout))
+    try:
+        for block in pcm_blocks(src, layout):
+            scaled = np.clip(np.rint((block >> shift) * scale), low, high)
+            write(scaled.astype(layout.dtype) << shift)
+    finally:
+        if dst.suffix.lower() == ".flac":
+            encoder.stdin.close()
+            if encoder.wait() != 0:
+                raise subprocess.CalledProcessError(encoder.returncode, encoder.args)
+        else:
+            writer.close()
 
-def create_edit_master(pm_wav: Path, em_dir: Path) -> None:
-    em_dir.mkdir(exist_ok=True)
+def edit_master_path(pm_wav: Path, em_dir: Path) -> Path:
     base = pm_wav.stem.replace("_pm", "_em") if "_pm" in pm_wav.stem else pm_wav.stem + "_em"
-    # Determine correct extension: .wav or .flac for loudnorm output
+    # Determine correct extension: .wav or .flac for the Edit Master
     orig_ext = pm_wav.suffix.lower()
     out_ext = orig_ext if orig_ext in ('.wav', '.flac') else '.wav'
-    em_wav = em_dir / f"{base}{out_ext}"
+    return em_dir / f"{base}{out_ext}"
+
+def create_edit_master(pm_wav: Path, em_dir: Path, stats: dict | None = None) -> None:
+    """
+    Bring pm_wav to TARGET_I in em_dir with a single linear gain, limited so the
+    true peak stays at or below TARGET_TP. `stats` are EBU R128 results already
+    measured from the same audio; without them the PM is measured here.
+    """
+    em_dir.mkdir(exist_ok=True)
+    orig_ext = pm_wav.suffix.lower()
+    em_wav = edit_master_path(pm_wav, em_dir)
 
     # Preserve original sample rate & bit depth
-    sample_rate, bit_depth = _probe_audio(pm_wav)
-    codec = "pcm_s16le" if bit_depth <= 16 else "pcm_s24le"
+    layout = probe_layout(pm_wav)
+    codec = "pcm_s16le" if layout.bit_depth <= 16 else "pcm_s24le"
 
     # ── FIRST PASS: MEASURE ────────────────────────────────────────────────
-    print(f"   ↳ {pm_wav.name}: running first-pass loudnorm analysis…")
-    analysis_filter = (
-        f"loudnorm=dual_mono=true:"
-        f"I={TARGET_I}:LRA={TARGET_LRA}:TP={TARGET_TP}:print_format=json"
-    )
-    proc = subprocess.run(
-        ["ffmpeg", "-y", "-nostats", "-i", str(pm_wav),
-         "-af", analysis_filter,
-         "-f", "null", "-"],
-        stderr=subprocess.PIPE, text=True
-    )
-    stderr = proc.stderr
-
-    # If no JSON found, dump last lines and copy unchanged
-    if "{" not in stderr:
-        print(f"     ⚠  could not find JSON in ffmpeg output; copying as-is.")
-        print("     └─ stderr preview:")
-        print("\n".join(stderr.splitlines()[-10:]))
-        shutil.copy2(pm_wav, em_wav)
-        return
-
-    # Extract JSON blob between first '{' and last '}'
-    start = stderr.find("{")
-    end   = stderr.rfind("}") + 1
-    try:
-        stats = json.loads(stderr[start:end])
-    except Exception as e:
-        print(f"     ⚠  JSON parse error ({e}); copying as-is.")
-        print(stderr[start:end])
+    if stats is None:
+        print(f"   ↳ {pm_wav.name}: measuring EBU R128 loudness…")
+        try:
+            stats = scan_master(pm_wav, layout)
+        except subprocess.CalledProcessError as e:
+            print(f"     ⚠  ffmpeg could not read {pm_wav.name} ({e}).")
+    else:
+        print(f"   ↳ {pm_wav.name}: using loudness measured earlier from the same audio")
+    if stats is None:
+        print("     ⚠  no loudness summary in ffmpeg output; copying as-is.")
         shutil.copy2(pm_wav, em_wav)
         return
 
-    # Cast all values to float for formatting & calculation
-    input_i      = float(stats["input_i"])
-    input_lra    = float(stats["input_lra"])
-    input_tp     = float(stats["input_tp"])
-    input_thresh = float(stats["input_thresh"])
-    offset       = float(stats["target_offset"])
-
+    input_i, input_lra, input_tp = stats["I"], stats["LRA"], stats["TP"]
     print(f"     measured: I={input_i:.1f}, "
-          f"LRA={input_lra:.1f}, TP={input_tp:.1f}, "
-          f"offset={offset:.2f}")
+          f"LRA={input_lra if input_lra is not None else float('nan'):.1f}, "
+          f"TP={input_tp if input_tp is not None else float('nan'):.1f}")
 
     # If already within tolerance: copy WAV/FLAC, but re-encode AEA (or other) via FFmpeg
     if abs(input_i - TARGET_I) <= TOLERANCE:
@@ -127,26 +357,19 @@ def create_edit_master(pm_wav: Path, em_dir: Path) -> None:
             print(f"     within ±{TOLERANCE} LU → re-encoding {orig_ext[1:]} → PCM WAV for playback.")
             subprocess.run([
                 "ffmpeg", "-y", "-i", str(pm_wav),
-                "-ar", str(sample_rate),
+                "-ar", str(layout.sample_rate),
                 "-c:a", codec,
                 str(em_wav),
             ], check=True)
         return
 
-    # ── SECOND PASS: NORMALIZE ─────────────────────────────────────────────
-    print(f"     normalizing {input_i:.1f} → {TARGET_I} LUFS")
-    normalize_filter = (
-        f"loudnorm=I={TARGET_I}:LRA={TARGET_LRA}:TP={TARGET_TP}:"
-        f"measured_I={input_i}:measured_LRA={input_lra}:"
-        f"measured_TP={input_tp}:measured_thresh={input_thresh}:offset={offset}"
-    )
-    subprocess.run([
-        "ffmpeg", "-y", "-i", str(pm_wav),
-        "-af", normalize_filter,
-        "-ar", str(sample_rate),
-        "-c:a", codec,
-        str(em_wav),
-    ], check=True)
+    # ── SECOND PASS: SCALE ─────────────────────────────────────────────────
+    gain_db = TARGET_I - input_i
+    if input_tp is not None and input_tp != float("-inf") and input_tp + gain_db > TARGET_TP:
+        gain_db = TARGET_TP - input_tp
+        print(f"     gain limited by true peak ({input_tp:.1f} dBTP → {TARGET_TP} dBTP)")
+    print(f"     normalizing {input_i:.1f} → {input_i + gain_db:.1f} LUFS (gain {gain_db:+.2f} dB)")
+    apply_gain(pm_wav, em_wav, gain_db, layout)
 
     print(f"     → wrote {em_wav.name}")
 
@@ -213,228 +436,317 @@ def parse_cue_file(cue_path: Path) -> list[dict]:
     return tracks
 
 # ── JOIN LOGIC ─────────────────────────────────────────────────────────────
-def join_discs(root: Path, prefix: str, make_edit: bool) -> None:
+@dataclass
+class DiscPlan:
+    disc_dir: Path
+    cue_path: Path
+    ordered: list[Path]
+    out_wav: Path
+    out_cue: Path
+
+def plan_disc(disc_dir: Path, prefix: str, pm_dir: Path) -> DiscPlan | None:
     """
-    Pass 1  →  create Preservation Masters for every disc.
-    Pass 2  →  (optional) create loudness‑checked Edit Masters.
+    Find the CUE and WAVs for one disc and decide the track order of its
+    Preservation Master. Nothing is written.
     """
-    processed_dir = root / "Processed"
-    pm_dir = root / "PreservationMasters"
-    em_dir = root / "EditMasters"
-    processed_dir.mkdir(exist_ok=True)
-    pm_dir.mkdir(exist_ok=True)
-    if make_edit:
-        em_dir.mkdir(exist_ok=True)
-
-    pm_files: list[Path] = []          # remember all PMs for the 2nd pass
+    # only real .cue files, not macOS AppleDouble sidecars:
+    # ── find the directory that actually holds the .cue + .wav files ──
+    work_dir = disc_dir
+    cue_files = [p for p in work_dir.glob("*.cue") if not p.name.startswith("._")]
+
+    # if there was no .cue at this level, look one level down
+    if not cue_files:
+        subdirs = [d for d in disc_dir.iterdir() if d.is_dir()]
+        if len(subdirs) == 1:
+            work_dir = subdirs[0]
+            cue_files = [p for p in work_dir.glob("*.cue") if not p.name.startswith("._")]
+            print(f"Using subdirectory `{work_dir.name}` for assets")
+    
+    if not cue_files:
+        print(f"No .cue file in {disc_dir.name}, skipping.")
+        return None
 
-    # ── PASS 1: JOIN PER DISC ────────────────────────────────────────────
-    for disc_dir in sorted(p for p in root.iterdir() if p.is_dir()):
-        if disc_dir.name in ("Processed", "PreservationMasters", "EditMasters"):
-            continue
-        if not (disc_dir.name.isdigit() and len(disc_dir.name) == 6):
-            print(f"Skipping {disc_dir.name}: not a six‑digit ID.")
-            continue
-        print(f"\nNow processing 💿 {disc_dir.name}\n")
-        # only real .cue files, not macOS AppleDouble sidecars:
-        # ── find the directory that actually holds the .cue + .wav files ──
-        work_dir = disc_dir
-        cue_files = [p for p in work_dir.glob("*.cue") if not p.name.startswith("._")]
-
-        # if there was no .cue at this level, look one level down
-        if not cue_files:
-            subdirs = [d for d in disc_dir.iterdir() if d.is_dir()]
-            if len(subdirs) == 1:
-                work_dir = subdirs[0]
-                cue_files = [p for p in work_dir.glob("*.cue") if not p.name.startswith("._")]
-                print(f"Using subdirectory `{work_dir.name}` for assets")
-        
-        if not cue_files:
-            print(f"No .cue file in {disc_dir.name}, skipping.")
-            continue
+    cue_path = cue_files[0]
 
-        cue_path = cue_files[0]
+    track_info = parse_cue_file(cue_path)
 
-        track_info = parse_cue_file(cue_path)
+    # now gather your WAVs from the same work_dir
+    all_wavs = [p for p in work_dir.glob("*.wav")]
+    if not all_wavs:
+        print(f"No WAVs in {disc_dir.name} (or its only subdir), skipping.")
+        return None
 
-        # now gather your WAVs from the same work_dir
-        all_wavs = [p for p in work_dir.glob("*.wav")]
-        if not all_wavs:
-            print(f"No WAVs in {disc_dir.name} (or its only subdir), skipping.")
-            continue
+    def norm(p: Path | str) -> str:
+        """
+        Aggressive normaliser:
+        • strip accents
+        • case‑fold to lower
+        • map all punctuation to spaces
+        • retain only a‑z 0‑9 and single spaces
+        """
+        text = p.stem if isinstance(p, Path) else p
+        text = strip_accents(text).casefold()
 
-        def norm(p: Path | str) -> str:
-            """
-            Aggressive normaliser:
-            • strip accents
-            • case‑fold to lower
-            • map all punctuation to spaces
-            • retain only a‑z 0‑9 and single spaces
-            """
-            text = p.stem if isinstance(p, Path) else p
-            text = strip_accents(text).casefold()
+        # replace Unicode punctuation (including curly apostrophes, dashes, etc.)
+        text = re.sub(r"[^\w\s]", " ", text, flags=re.UNICODE)
 
-            # replace Unicode punctuation (including curly apostrophes, dashes, etc.)
-            text = re.sub(r"[^\w\s]", " ", text, flags=re.UNICODE)
+        # keep only a‑z 0‑9 and spaces, then collapse whitespace
+        text = re.sub(r"[^a-z0-9\s]+", " ", text)
+        text = re.sub(r"\s+", " ", text).strip()
 
-            # keep only a‑z 0‑9 and spaces, then collapse whitespace
-            text = re.sub(r"[^a-z0-9\s]+", " ", text)
-            text = re.sub(r"\s+", " ", text).strip()
+        return text
 
-            return text
+    # Map wavs by normalized name for easier matching
+    exact_map = {norm(w): w for w in all_wavs}
+    
+    used, ordered = set(), []
 
-        # Map wavs by normalized name for easier matching
-        exact_map = {norm(w): w for w in all_wavs}
+    # Use CUE track info to order WAVs
+    if track_info:
+        print(f"Found {len(track_info)} tracks in CUE file")
         
-        used, ordered = set(), []
-
-        # Use CUE track info to order WAVs
-        if track_info:
-            print(f"Found {len(track_info)} tracks in CUE file")
+        for track in track_info:
+            title = track.get("title", "")
+            performer = track.get("performer", "")
+            track_num = track.get("number", 0)
+            print(f"\nProcessing track {track_num}: '{title}' by '{performer}'")
             
-            for track in track_info:
-                title = track.get("title", "")
-                performer = track.get("performer", "")
-                track_num = track.get("number", 0)
-                print(f"\nProcessing track {track_num}: '{title}' by '{performer}'")
-                
-                search_terms = []
-                
-                # Add exact title+performer combinations first (highest priority)
-                if performer and title:
-                    search_terms.append(f"{performer} - {title}")
-                
-                # Add title and performer separately
-                if title:
-                    search_terms.append(title)
-                if performer:
-                    search_terms.append(performer)
-                    
-                # Add performer-title variations if both exist
-                if performer and title:
-                    search_terms.append(f"{performer} {title}")
-                
-                chosen = None
-                matched_term = None
-                
-                print(f"Search terms: {search_terms}")
+            search_terms = []
+            
+            # Add exact title+performer combinations first (highest priority)
+            if performer and title:
+                search_terms.append(f"{performer} - {title}")
+            
+            # Add title and performer separately
+            if title:
+                search_terms.append(title)
+            if performer:
+                search_terms.append(performer)
                 
-                # Try exact matches first (highest priority)
+            # Add performer-title variations if both exist
+            if performer and title:
+                search_terms.append(f"{performer} {title}")
+            
+            chosen = None
+            matched_term = None
+            
+            print(f"Search terms: {search_terms}")
+            
+            # Try exact matches first (highest priority)
+            for term in search_terms:
+                norm_term = norm(term)
+                if norm_term in exact_map and exact_map[norm_term] not in used:
+                    chosen = exact_map[norm_term]
+                    matched_term = term
+                    print(f"Exact match found for term: '{term}'")
+                    break
+            
+            # If no exact match, try partial matches with filename containing the term
+            if not chosen:
                 for term in search_terms:
                     norm_term = norm(term)
-                    if norm_term in exact_map and exact_map[norm_term] not in used:
-                        chosen = exact_map[norm_term]
-                        matched_term = term
-                        print(f"Exact match found for term: '{term}'")
-                        break
+                    # Try performers first if available
+                    if term == performer:
+                        cands = [w for w in all_wavs if norm_term in norm(w) and w not in used]
+                        if cands:
+                            chosen = sorted(cands, key=lambda p: len(p.name))[0]
+                            matched_term = f"performer partial: '{term}'"
+                            print(f"Partial match found with performer: '{term}'")
+                            break
                 
-                # If no exact match, try partial matches with filename containing the term
+                # If still no match, try with any search term
                 if not chosen:
+                    print("Trying broader partial matches...")
                     for term in search_terms:
                         norm_term = norm(term)
-                        # Try performers first if available
-                        if term == performer:
-                            cands = [w for w in all_wavs if norm_term in norm(w) and w not in used]
-                            if cands:
-                                chosen = sorted(cands, key=lambda p: len(p.name))[0]
-                                matched_term = f"performer partial: '{term}'"
-                                print(f"Partial match found with performer: '{term}'")
-                                break
-                    
-                    # If still no match, try with any search term
-                    if not chosen:
-                        print("Trying broader partial matches...")
-                        for term in search_terms:
-                            norm_term = norm(term)
-                            cands = [w for w in all_wavs if norm_term in norm(w) and w not in used]
-                            if cands:
-                                chosen = sorted(cands, key=lambda p: len(p.name))[0]
-                                matched_term = f"partial: '{term}'"
-                                print(f"Partial match found for term: '{term}'")
-                                break
-                
-                # Last resort: try with individual words from the title or performer
-                if not chosen and (title or performer):
-                    words = []
-                    if title:
-                        words.extend([w for w in re.split(r'\W+', title) if len(w) > 3])
-                    if performer:
-                        words.extend([w for w in re.split(r'\W+', performer) if len(w) > 3])
-                    
-                    print(f"Trying individual keywords: {words}")
-                    for word in words:
-                        norm_word = norm(word)
-                        cands = [w for w in all_wavs if norm_word in norm(w) and w not in used]
+                        cands = [w for w in all_wavs if norm_term in norm(w) and w not in used]
                         if cands:
                             chosen = sorted(cands, key=lambda p: len(p.name))[0]
-                            matched_term = f"keyword: '{word}'"
-                            print(f"Keyword match found for: '{word}'")
+                            matched_term = f"partial: '{term}'"
+                            print(f"Partial match found for term: '{term}'")
                             break
+            
+            # Last resort: try with individual words from the title or performer
+            if not chosen and (title or performer):
+                words = []
+                if title:
+                    words.extend([w for w in re.split(r'\W+', title) if len(w) > 3])
+                if performer:
+                    words.extend([w for w in re.split(r'\W+', performer) if len(w) > 3])
                 
-                if chosen:
-                    ordered.append(chosen)
-                    used.add(chosen)
-                    print(f"Matched track {track_num}: '{title}' → {chosen.name} via {matched_term}")
-                else:
-                    ordered.append(None)
-                    print(f"Warning: Track {track_num} '{title}' unmatched in {disc_dir.name}")
-                    
-                # Print remaining unused files for debugging
-                if not chosen:
-                    print(f"Remaining unused files: {[w.name for w in all_wavs if w not in used]}")
-
-            # Fill in any unmatched tracks with remaining files
-            remaining = [w for w in sorted(all_wavs) if w not in used]
-            for i, v in enumerate(ordered):
-                if v is None and remaining:
-                    next_file = remaining.pop(0)
-                    ordered[i] = next_file
-                    print(f"Filling unmatched track {i+1} with: {next_file.name}")
+                print(f"Trying individual keywords: {words}")
+                for word in words:
+                    norm_word = norm(word)
+                    cands = [w for w in all_wavs if norm_word in norm(w) and w not in used]
+                    if cands:
+                        chosen = sorted(cands, key=lambda p: len(p.name))[0]
+                        matched_term = f"keyword: '{word}'"
+                        print(f"Keyword match found for: '{word}'")
+                        break
             
-            # Add any remaining WAVs at the end
-            for remaining_wav in remaining:
-                ordered.append(remaining_wav)
-                print(f"Adding remaining unused WAV at end: {remaining_wav.name}")
-        else:
-            print("No valid track info in CUE file, falling back to alphabetical order")
-            ordered = sorted(all_wavs)
-
-        # Filter out any None values that might remain
-        ordered = [o for o in ordered if o is not None]
+            if chosen:
+                ordered.append(chosen)
+                used.add(chosen)
+                print(f"Matched track {track_num}: '{title}' → {chosen.name} via {matched_term}")
+            else:
+                ordered.append(None)
+                print(f"Warning: Track {track_num} '{title}' unmatched in {disc_dir.name}")
+                
+            # Print remaining unused files for debugging
+            if not chosen:
+                print(f"Remaining unused files: {[w.name for w in all_wavs if w not in used]}")
+
+        # Fill in any unmatched tracks with remaining files
+        remaining = [w for w in sorted(all_wavs) if w not in used]
+        for i, v in enumerate(ordered):
+            if v is None and remaining:
+                next_file = remaining.pop(0)
+                ordered[i] = next_file
+                print(f"Filling unmatched track {i+1} with: {next_file.name}")
         
-        # Print the final ordering for confirmation
-        print("\nFinal track order:")
-        for i, wav in enumerate(ordered):
-            print(f"{i+1}: {wav.name}")
-
-        out_base = f"{prefix}_{disc_dir.name}_v01f01_pm"
-        out_wav = pm_dir / f"{out_base}.wav"
-        out_cue = pm_dir / f"{out_base}.cue"
+        # Add any remaining WAVs at the end
+        for remaining_wav in remaining:
+            ordered.append(remaining_wav)
+            print(f"Adding remaining unused WAV at end: {remaining_wav.name}")
+    else:
+        print("No valid track info in CUE file, falling back to alphabetical order")
+        ordered = sorted(all_wavs)
 
-        if len(ordered) > 1:
+    # Filter out any None values that might remain
+    ordered = [o for o in ordered if o is not None]
+    
+    # Print the final ordering for confirmation
+    print("\nFinal track order:")
+    for i, wav in enumerate(ordered):
+        print(f"{i+1}: {wav.name}")
+
+    out_base = f"{prefix}_{disc_dir.name}_v01f01_pm"
+    out_wav = pm_dir / f"{out_base}.wav"
+    out_cue = pm_dir / f"{out_base}.cue"
+
+    return DiscPlan(disc_dir=disc_dir, cue_path=cue_path, ordered=ordered,
+                    out_wav=out_wav, out_cue=out_cue)
+
+def join_wavs(ordered: list[Path], out_wav: Path) -> None:
+    if len(ordered) > 1:
+        # each disc joins in its own scratch dir so parallel joins don't share joined.wav
+        join_dir = out_wav.parent / f".{out_wav.stem}.join"
+        join_dir.mkdir(exist_ok=True)
+        try:
             run(["shntool", "join", "-o", "wav", "-r", "none",
-                 "-d", str(pm_dir), *map(str, ordered)])
-            joined = pm_dir / "joined.wav"
+                 "-d", str(join_dir), *map(str, ordered)])
+            joined = join_dir / "joined.wav"
             if joined.exists():
                 joined.rename(out_wav)
+        finally:
+            shutil.rmtree(join_dir, ignore_errors=True)
+    else:
+        shutil.copy2(ordered[0], out_wav)
+
+def render_disc(plan: DiscPlan, processed_dir: Path, em_dir: Path,
+                make_edit: bool) -> tuple[Path, bool]:
+    """
+    Join one disc's Preservation Master and, with make_edit, its Edit Master.
+    The EBU R128 measurement reads the same tracks back to back while shntool
+    joins them, so the joined PM is not decoded again just to be measured.
+    Returns the PM path and whether its Edit Master (if requested) succeeded;
+    an Edit Master failure does not undo the finished PM and disc move.
+    """
+    stats = None
+    if make_edit:
+        with ThreadPoolExecutor(max_workers=1) as measure:
+            analysis = measure.submit(measure_sources, plan.ordered)
+            join_wavs(plan.ordered, plan.out_wav)
+            stats = analysis.result()
+    else:
+        join_wavs(plan.ordered, plan.out_wav)
+
+    safe_copy(plan.cue_path, plan.out_cue, "CUE")
+    if not plan.out_cue.exists():
+        print(f"⚠  Copy verification failed for {plan.out_cue.name}")
+    shutil.move(str(plan.disc_dir), processed_dir)
+    print(f"Finished {plan.disc_dir.name}: {plan.out_wav.name}")
+
+    if make_edit:
+        try:
+            create_edit_master(plan.out_wav, em_dir, stats=stats)
+        except Exception as e:              # noqa: BLE001
+            print(f"⚠  {plan.disc_dir.name}: PM done, Edit Master failed: {e}")
+            return plan.out_wav, False
+    return plan.out_wav, True
+
+def print_join_plan(plans: list[DiscPlan], em_dir: Path, make_edit: bool, jobs: int) -> None:
+    print(f"\nDry run: {len(plans)} disc(s) on {jobs} worker(s); nothing is written.")
+    for plan in plans:
+        if len(plan.ordered) > 1:
+            step = f"shntool join {len(plan.ordered)} WAVs"
         else:
-            shutil.copy2(ordered[0], out_wav)
+            step = "copy 1 WAV"
+        if make_edit:
+            step += " ‖ loudness measurement of the same tracks"
+        print(f"  💿 {plan.disc_dir.name}: {step} → {plan.out_wav.name}")
+        print(f"     ├─ copy CUE → {plan.out_cue.name}")
+        if make_edit:
+            print(f"     ├─ edit master (after join + analysis) → {edit_master_path(plan.out_wav, em_dir).name}")
+        print(f"     └─ move {plan.disc_dir.name}/ → Processed/")
+
+def join_discs(root: Path, prefix: str, make_edit: bool, jobs: int = DEFAULT_JOBS,
+               dry_run: bool = False) -> None:
+    """
+    Plan every disc (CUE parsing and track matching, in order), then render
+    discs in parallel: each worker joins a disc's Preservation Master and,
+    with make_edit, goes straight on to its loudness‑checked Edit Master.
+    """
+    processed_dir = root / "Processed"
+    pm_dir = root / "PreservationMasters"
+    em_dir = root / "EditMasters"
 
-        safe_copy(cue_path, out_cue, "CUE")
-        if not out_cue.exists():
-            print(f"⚠  Copy verification failed for {out_cue.name}")
-        shutil.move(str(disc_dir), processed_dir)
-        pm_files.append(out_wav)
-        print(f"Finished {disc_dir.name}: {out_wav.name}")
+    plans: list[DiscPlan] = []
+    for disc_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        if disc_dir.name in ("Processed", "PreservationMasters", "EditMasters"):
+            continue
+        if not (disc_dir.name.isdigit() and len(disc_dir.name) == 6):
+            print(f"Skipping {disc_dir.name}: not a six‑digit ID.")
+            continue
+        print(f"\nNow processing 💿 {disc_dir.name}\n")
+        plan = plan_disc(disc_dir, prefix, pm_dir)
+        if plan:
+            plans.append(plan)
 
-    print("All Preservation Masters created.")
+    if dry_run:
+        print_join_plan(plans, em_dir, make_edit, jobs)
+        return
 
-    # ── PASS 2: EDIT MASTERS ────────────────────────────────────────────
-    if make_edit and pm_files:
-        print("\nNow creating Edit Masters…")
-        for pm in pm_files:
-            create_edit_master(pm, em_dir)
+    processed_dir.mkdir(exist_ok=True)
+    pm_dir.mkdir(exist_ok=True)
+    if make_edit:
+        em_dir.mkdir(exist_ok=True)
+
+    pm_files: list[Path] = []
+    failed: list[str] = []
+    em_failed: list[str] = []
+    if plans:
+        print(f"\nRendering {len(plans)} disc(s) on {jobs} worker(s)…")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [(plan, executor.submit(render_disc, plan, processed_dir, em_dir, make_edit))
+                   for plan in plans]
+        for plan, future in futures:
+            try:
+                pm_file, em_ok = future.result()
+                pm_files.append(pm_file)
+                if not em_ok:
+                    em_failed.append(plan.disc_dir.name)
+            except Exception as e:          # noqa: BLE001
+                print(f"⚠  {plan.disc_dir.name} failed: {e}")
+                failed.append(plan.disc_dir.name)
+
+    print("All Preservation Masters created.")
+    if make_edit and len(pm_files) > len(em_failed):
         print("Edit Master generation complete.")
+    if em_failed:
+        print(f"⚠  {len(em_failed)} disc(s) have a PM but no Edit Master: {', '.join(em_failed)}")
+    if failed:
+        print(f"⚠  {len(failed)} disc(s) failed and were left in place: {', '.join(failed)}")
 
     mode = "join+edit" if make_edit else "join"
     print(f"All done ({mode} mode).")
@@ -448,66 +760,98 @@ def join_discs(root: Path, prefix: str, make_edit: bool) -> None:
     else:
         print("\n✅ All Preservation Masters have matching CUE sheets. You’re all good!")
 
-# ── SPLIT LOGIC (unchanged) ────────────────────────────────────────────────
-def split_masters(pm_dir: Path) -> None:
+# ── SPLIT LOGIC ────────────────────────────────────────────────────────────
+def split_master(master: Path, out_root: Path, em_dir: Path, make_edit: bool) -> None:
     """
-    Walk a PreservationMasters directory, split each master WAV/FLAC by its CUE.
+    Split one master WAV/FLAC by its CUE. WAV masters are read once: the same
+    decode is metered for the Edit Master and cut into TrackNN.wav files.
     Masters that contain only a single track (one TRACK entry in the CUE) are
     handled by copying the whole file to Track01.ext.
     """
+    m = re.search(r"(\d{6})", master.stem)
+    if not m:
+        print(f"Skipping {master.name}: no 6‑digit ID in filename.")
+        return
+    disc_id   = m.group(1)
+    cue_path  = master.with_suffix(".cue")
+    if not cue_path.exists():
+        print(f"Missing CUE for {master.name}, skipping.")
+        return
+
+    track_count = sum(1 for line in cue_path.read_text(
+                      encoding="utf‑8", errors="ignore").splitlines()
+                      if re.match(r"^\s*TRACK", line))
+
+    dest = out_root / disc_id
+    dest.mkdir(exist_ok=True)
+
+    stats = None
+    points = []
+    if track_count > 1 and master.suffix.lower() == ".wav":
+        layout = probe_layout(master)
+        points = cue_split_points(cue_path, layout.sample_rate)
+        if len(points) < track_count:
+            print(f"   ↳ {cue_path.name}: {len(points)} of {track_count} tracks have an INDEX 01; "
+                  f"splitting with shnsplit instead.")
+
+    if track_count <= 1:
+        new_name = f"Track01{master.suffix.lower()}"
+        shutil.copy2(master, dest / new_name)
+        shutil.copy2(cue_path, dest)
+        print(f"Copied single‑track {master.name} → {dest/new_name}")
+    elif len(points) >= track_count:
+        splitter = TrackSplitter(dest, points, layout)
+        try:
+            stats = scan_master(master, layout, splitter, measure=make_edit)
+        except subprocess.CalledProcessError as e:
+            print(f"Split failed on {master.name}: {e}")
+            return
+        shutil.copy2(cue_path, dest)
+        print(f"Split {master.name} → {dest} ({len(splitter.written)} files)")
+    else:
+        try:
+            run(["shnsplit", "-f", str(cue_path), "-o", master.suffix.lower()[1:],
+                 "-t", "Track%n", "-d", str(dest), str(master)])
+            shutil.copy2(cue_path, dest)
+            print(f"Split {master.name} → {dest}")
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            print(f"shnsplit failed on {master.name}: {e}")
+            return
+
+    if make_edit:
+        create_edit_master(master, em_dir, stats=stats)
+
+def split_masters(pm_dir: Path, make_edit: bool = False, jobs: int = DEFAULT_JOBS) -> None:
+    """
+    Walk a PreservationMasters directory and split each master by its CUE,
+    several masters at once. With make_edit, each master also gets an Edit
+    Master in the sibling EditMasters directory.
+    """
     parent   = pm_dir.parent
     out_root = parent / "Processed_Split"
     out_root.mkdir(exist_ok=True)
+    em_dir   = parent / "EditMasters"
 
     masters = sorted(p for p in pm_dir.iterdir()
                      if p.suffix.lower() in (".wav", ".flac"))
 
-    for master in masters:
-        m = re.search(r"(\d{6})", master.stem)
-        if not m:
-            print(f"Skipping {master.name}: no 6‑digit ID in filename.")
-            continue
-        disc_id   = m.group(1)
-        cue_path  = master.with_suffix(".cue")
-        if not cue_path.exists():
-            print(f"Missing CUE for {master.name}, skipping.")
-            continue
-
-        track_count = sum(1 for line in cue_path.read_text(
-                          encoding="utf‑8", errors="ignore").splitlines()
-                          if re.match(r"^\s*TRACK", line))
-
-        dest = out_root / disc_id
-        dest.mkdir(exist_ok=True)
-
-        if track_count <= 1:
-            new_name = f"Track01{master.suffix.lower()}"
-            shutil.copy2(master, dest / new_name)
-            shutil.copy2(cue_path, dest)
-            print(f"Copied single‑track {master.name} → {dest/new_name}")
-            continue
-
-        fmt_out = "flac" if master.suffix.lower() == ".flac" else "wav"
-        try:
-            run(["shnsplit", "-f", str(cue_path), "-o", fmt_out,
-                 "-t", "Track%n", "-d", str(dest), str(master)])
-            shutil.copy2(cue_path, dest)
-            print(f"Split {master.name} → {dest}")
-        except subprocess.CalledProcessError as e:
-            print(f"shnsplit failed on {master.name}: {e}")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        list(executor.map(lambda master: split_master(master, out_root, em_dir, make_edit), masters))
 
     print("All done (split mode).")
 
 # ── MINI DISC LOGIC ─────────────────────────────────────────────────────────
 
-def process_minidiscs(root: Path, prefix: str, make_edit: bool) -> list[Path]:
+def process_minidiscs(root: Path, prefix: str, make_edit: bool, jobs: int = DEFAULT_JOBS,
+                      dry_run: bool = False) -> list[Path]:
     pm_dir = root / "PreservationMasters"
     em_dir = root / "EditMasters"
     processed_dir = root / "Processed"
-    for d in (pm_dir, processed_dir):
-        d.mkdir(exist_ok=True)
-    if make_edit:
-        em_dir.mkdir(exist_ok=True)
+    if not dry_run:
+        for d in (pm_dir, processed_dir):
+            d.mkdir(exist_ok=True)
+        if make_edit:
+            em_dir.mkdir(exist_ok=True)
 
     pm_files: list[Path] = []
 
@@ -523,6 +867,12 @@ def process_minidiscs(root: Path, prefix: str, make_edit: bool) -> list[Path]:
 
         print(f"\nDetected MiniDisc package in {disc_dir.name}")
 
+        if dry_run:
+            print(f"   ↳ would copy {len(aea_files)} AEA file(s) to PreservationMasters"
+                  + (" and make Edit Masters" if make_edit else "")
+                  + f", then move {disc_dir.name}/ → Processed/")
+            continue
+
         # rename CSV like we do for CUE
         if csv_files:
             csv_src = csv_files[0]
@@ -543,11 +893,11 @@ def process_minidiscs(root: Path, prefix: str, make_edit: bool) -> list[Path]:
         shutil.move(str(disc_dir), processed_dir)
         print(f"   → Moved {disc_dir.name} to Processed/")
 
-    # if requested, run two-pass loudnorm Edit Masters using existing create_edit_master
+    # if requested, measure and gain-scale Edit Masters using create_edit_master
     if make_edit and pm_files:
-        print("\nNow creating MiniDisc Edit Masters with loudnorm…")
-        for pm in pm_files:
-            create_edit_master(pm, em_dir)
+        print("\nNow creating MiniDisc Edit Masters…")
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            list(executor.map(lambda pm: create_edit_master(pm, em_dir), pm_files))
         print("MiniDisc Edit Master generation complete.")
 
     return pm_files
@@ -562,17 +912,23 @@ def cli() -> None:
     ap.add_argument("-s", "--split", action="store_true",
                     help="Activate split mode (default is join)")
     ap.add_argument("-e", "--editmasters", action="store_true",
-                    help="After joining, create loudness‑checked EditMasters")
+                    help="Create loudness‑checked EditMasters (after joining, or alongside splitting)")
+    ap.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS,
+                    help=f"Discs processed at once (default: {DEFAULT_JOBS})")
+    ap.add_argument("-n", "--dry-run", action="store_true",
+                    help="Print the per-disc plan (track order, joins, Edit Masters) without writing anything (join mode only)")
     args = ap.parse_args()
+    if args.split and args.dry_run:
+        ap.error("--dry-run is only available in join mode")
 
     path = Path(args.input).expanduser().resolve()
     # Process MiniDiscs first (will skip if none)
-    process_minidiscs(path, args.prefix, args.editmasters)
+    process_minidiscs(path, args.prefix, args.editmasters, jobs=args.jobs, dry_run=args.dry_run)
 
     if args.split:
-        split_masters(path)
+        split_masters(path, make_edit=args.editmasters, jobs=args.jobs)
     else:
-        join_discs(path, args.prefix, args.editmasters)
+        join_discs(path, args.prefix, args.editmasters, jobs=args.jobs, dry_run=args.dry_run)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Per-Stream / Per-Channel Audio Configuration Classifier (NumPy + ltcdump) - Late Audio Aware
+Per-Stream / Per-Channel Audio Configuration Classifier (NumPy) - Late Audio Aware
 WITH: lag-aligned pair metrics + 2-window confirmation for dual-mono
 WITH: Total Audio Track Count (including silent channels)
 
@@ -8,13 +8,13 @@ What it does:
 - Finds audio streams/channels with ffprobe
 - Searches for a non-silent analysis window even if audio starts late (0s, +step, +2*step...)
 - Labels each channel: None / Timecode / Mono / Stereo Left / Stereo Right
-- Uses ltcdump for LTC detection
+- Decodes LTC in-process (ltc_decoder) from the same samples used for analysis
 - Uses NumPy waveform similarity for dual-mono vs stereo:
     - estimate lag, align signals, then compute corr + best-fit residual
     - only calls Dual Mono if it passes in TWO windows (early + later) when possible
 - Reports Total Audio Tracks (container channel count)
 
-Requires: ffmpeg, ffprobe, ltcdump (ltc-tools), numpy
+Requires: ffmpeg, ffprobe, numpy
 
 Usage:
   python3 classify_audio_refactored.py -i <input_file_or_dir>
@@ -24,7 +24,6 @@ import argparse
 import subprocess
 import json
 import sys
-import re
 import math
 import os
 import shutil
@@ -36,6 +35,11 @@ from collections import Counter
 
 import numpy as np
 
+try:
+    from ami_scripts.ltc_decoder import detect_ltc
+except ImportError:
+    from ltc_decoder import detect_ltc
+
 # -------------------------
 # Configuration
 # -------------------------
@@ -135,7 +139,7 @@ KNOWN_CONFIGS = [
 
 def check_dependencies():
     """Ensure required external tools are available."""
-    required_tools = ["ffmpeg", "ffprobe", "ltcdump"]
+    required_tools = ["ffmpeg", "ffprobe"]
     missing = [tool for tool in required_tools if shutil.which(tool) is None]
     if missing:
         logger.error(f"Missing required tools: {', '.join(missing)}")
@@ -424,101 +428,28 @@ def analyze_pair_waveform(
     return "Stereo Left", "Stereo Right", metrics_out, flags
 
 # -------------------------
-# LTC detection (ltcdump)
+# LTC detection (in-process)
 # -------------------------
 
 def detect_ltc_in_channel(
-    input_file: str,
-    stream_index: int,
+    samples: np.ndarray,
     channel_1based: int,
     probe_duration: int,
-    start: int = 0,
     match_threshold: int = LTC_MATCH_THRESHOLD,
     min_unique: int = LTC_MIN_UNIQUE,
     min_monotonic_ratio: float = LTC_MIN_MONOTONIC_RATIO,
     fps_candidates: Tuple[int, ...] = LTC_FPS_CANDIDATES
 ) -> Tuple[bool, Optional[int], float, List[Tuple[int, int, int, int]]]:
-    ch0 = channel_1based - 1
-    pan_filter = f"pan=mono|c0=c{ch0}"
-
-    ffmpeg_command = [
-        "ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error",
-        "-ss", str(start),
-        "-t", str(probe_duration),
-        "-i", str(input_file),
-        "-map", f"0:{stream_index}",
-        "-af", pan_filter,
-        "-ar", "48000", "-ac", "1",
-        "-f", "wav", "pipe:1"
-    ]
-    ltcdump_command = ["ltcdump", "-"]
-
-    try:
-        ffmpeg_proc = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        ltcdump_proc = subprocess.Popen(
-            ltcdump_command,
-            stdin=ffmpeg_proc.stdout,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        if ffmpeg_proc.stdout:
-            ffmpeg_proc.stdout.close()
-        ltcdump_out, _ = ltcdump_proc.communicate()
-        ffmpeg_proc.wait()
-    except Exception as e:
-        logger.debug(f"[LTC] Exception for {input_file} s{stream_index} ch{channel_1based}: {e}")
-        return False, None, 0.0, []
-
-    tc_pat = re.compile(r'(?P<h>\d{2}):(?P<m>\d{2}):(?P<s>\d{2})[.:;](?P<f>\d{2})')
-    raw = [(int(m.group('h')), int(m.group('m')), int(m.group('s')), int(m.group('f')))
-           for m in tc_pat.finditer(ltcdump_out)]
-
-    if not raw:
-        return False, None, 0.0, []
-
-    def to_frames(h, m, s, f, fps):
-        return (((h * 60) + m) * 60 + s) * fps + f
-
-    # Deduplicate preserving order
-    seen = set()
-    ordered_unique = []
-    for tc in raw:
-        if tc not in seen:
-            seen.add(tc)
-            ordered_unique.append(tc)
-
-    best_ratio = 0.0
-    best_fps: Optional[int] = None
-    best_valid_seq: List[Tuple[int, int, int, int]] = []
-
-    for fps in fps_candidates:
-        valid = [(h, m, s, f) for (h, m, s, f) in ordered_unique
-                 if m < 60 and s < 60 and f < fps]
-
-        if len(valid) < match_threshold or len(set(valid)) < min_unique:
-            continue
-
-        frames = [to_frames(h, m, s, f, fps) for (h, m, s, f) in valid]
-        if len(frames) < 2:
-            continue
-
-        deltas = [frames[i + 1] - frames[i] for i in range(len(frames) - 1)]
-        max_jump = 2 * fps
-
-        good_fwd = sum(1 for d in deltas if 0 < d <= max_jump)
-        good_rev = sum(1 for d in deltas if -max_jump <= d < 0)
-        ratio = max(good_fwd, good_rev) / len(deltas)
-
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_fps = fps
-            best_valid_seq = valid
-
-    if best_fps is not None and best_ratio >= min_monotonic_ratio and len(best_valid_seq) >= match_threshold:
-        return True, best_fps, best_ratio, best_valid_seq
-
-    return False, best_fps, best_ratio, best_valid_seq
+    """Decode LTC from one channel of the stream's analysis samples (first probe_duration seconds)."""
+    signal = samples[:int(probe_duration * ANALYSIS_SAMPLE_RATE), channel_1based - 1]
+    result = detect_ltc(
+        signal, ANALYSIS_SAMPLE_RATE,
+        match_threshold=match_threshold,
+        min_unique=min_unique,
+        min_monotonic_ratio=min_monotonic_ratio,
+        fps_candidates=fps_candidates
+    )
+    return result.detected, result.fps, result.monotonic_ratio, result.timecodes
 
 # -------------------------
 # Analysis Helpers
@@ -563,31 +494,33 @@ def find_active_window(
     return None, None, 0, logs
 
 def process_stream_ltc(
-    input_file: str,
-    stream_index: int,
+    samples: np.ndarray,
     base_channel: int,
     local_channels: int,
-    start_time: int,
     ltc_duration: int,
     labels: Dict[int, str]
 ) -> List[str]:
     """
-    Check for LTC in channels that are not 'None'.
+    Check for LTC in channels that are not 'None', reusing the decoded analysis window.
     Updates 'labels' in place.
     """
     logs = []
-    probe = min(ltc_duration, LTC_PROBE_DURATION_DEFAULT)
+    requested = min(ltc_duration, LTC_PROBE_DURATION_DEFAULT)
+    # LTC is cut from the analysis window, so it can be no longer than what was decoded
+    available = samples.shape[0] / ANALYSIS_SAMPLE_RATE
+    probe = min(requested, available)
+    if probe < requested:
+        logs.append(f"LTC probe limited to {probe:.0f}s of decoded audio "
+                    f"(requested {requested}s; raise --analysis-seconds to probe longer)")
     for local_ch in range(1, local_channels + 1):
         gch = base_channel + (local_ch - 1)
         if labels.get(gch) == "None":
             continue
         
         is_ltc, best_fps, best_ratio, _ = detect_ltc_in_channel(
-            input_file=input_file,
-            stream_index=stream_index,
+            samples=samples,
             channel_1based=local_ch,
-            probe_duration=probe,
-            start=start_time
+            probe_duration=probe
         )
         if is_ltc:
             labels[gch] = "Timecode"
@@ -720,8 +653,7 @@ def analyze_file_per_stream(
         # D. LTC Detection
         if enable_ltc:
             ltc_logs = process_stream_ltc(
-                input_file, stream_index, base, n_ch, 
-                start_time, ltc_duration, labels
+                samples, base, n_ch, ltc_duration, labels
             )
             flags.extend(ltc_logs)
 
@@ -850,7 +782,7 @@ def main():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
     parser.add_argument("-i", "--input", required=True, help="Input file or directory")
-    parser.add_argument("-d", "--duration", type=int, default=240, help="LTC probe duration & max offset")
+    parser.add_argument("-d", "--duration", type=int, default=240, help="LTC probe duration & max offset (the probe is capped at --analysis-seconds)")
     parser.add_argument("--analysis-seconds", type=int, default=DEFAULT_ANALYSIS_SECONDS)
     parser.add_argument("--pair-seconds", type=int, default=DEFAULT_PAIR_SECONDS)
     parser.add_argument("--window-step-seconds", type=int, default=DEFAULT_WINDOW_STEP_SECONDS)
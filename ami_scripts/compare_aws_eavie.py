@@ -3,6 +3,11 @@
 import csv
 import argparse
 
+try:
+    from ami_scripts.s3_inventory import S3Inventory
+except ImportError:
+    from s3_inventory import S3Inventory
+
 def extract_unique_ids_from_bucket(bucket_csv):
     """Extracts unique 6-digit IDs from the bucket CSV."""
     unique_ids = set()
@@ -21,6 +26,14 @@ def extract_unique_ids_from_bucket(bucket_csv):
                 print(f"Error processing row {row_num}: {row}. Error: {e}")
     return unique_ids
 
+def extract_unique_ids_from_inventory(bucket_name):
+    """Reads unique 6-digit IDs from the local S3 inventory of a bucket."""
+    with S3Inventory(bucket_name) as inventory:
+        if inventory.object_count() == 0:
+            raise SystemExit(f"No local S3 inventory for '{bucket_name}'. "
+                             f"Build one with: export_s3_to_csv.py -b {bucket_name} -o <file>.csv")
+        return inventory.all_ids()
+
 def find_ids_with_issues(bucket_ids, streaming_csv):
     """Finds IDs present in the bucket but marked as FALSE in the streaming CSV."""
     issues = []
@@ -36,14 +49,20 @@ def find_ids_with_issues(bucket_ids, streaming_csv):
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description="Compare AWS bucket and streaming platform lists.")
-    parser.add_argument('-b', '--bucket', required=True, help="Path to the AWS bucket CSV file")
+    bucket_source = parser.add_mutually_exclusive_group(required=True)
+    bucket_source.add_argument('-b', '--bucket', help="Path to the AWS bucket CSV file")
+    bucket_source.add_argument('--bucket-name', help="Read IDs from the local S3 inventory of this bucket instead of a CSV")
     parser.add_argument('-s', '--streaming', required=True, help="Path to the streaming platform CSV file")
     parser.add_argument('-o', '--output', help="Output file to save the results", default='issues.txt')
     args = parser.parse_args()
 
-    # Extract IDs from bucket CSV
-    print("Extracting unique IDs from the bucket CSV...")
-    bucket_ids = extract_unique_ids_from_bucket(args.bucket)
+    # Extract IDs from bucket CSV or the local inventory
+    if args.bucket_name:
+        print("Reading unique IDs from the local S3 inventory...")
+        bucket_ids = extract_unique_ids_from_inventory(args.bucket_name)
+    else:
+        print("Extracting unique IDs from the bucket CSV...")
+        bucket_ids = extract_unique_ids_from_bucket(args.bucket)
     print(f"Found {len(bucket_ids)} unique IDs in the bucket.")
 
     # Compare with streaming platform CSV
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Local MediaConch result store shared by mkv_conformance_checker and
+mediaconch_checker.
+
+Results are keyed by file identity (resolved path, size, mtime) and by the
+SHA-256 of the policy XML used for the check, so editing a policy in
+MediaconchPolicies invalidates every cached result made with it.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_STORE_PATH = Path(
+    os.environ.get('AMI_CONFORMANCE_STORE',
+                   Path.home() / '.ami_conformance_store.sqlite')
+)
+
+# Policy key used when MediaConch runs without an explicit policy file
+# (implementation checks only, as in mkv_conformance_checker).
+IMPLEMENTATION_POLICY = 'implementation'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    policy_key TEXT NOT NULL,
+    output TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (path, policy_key)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    tool TEXT PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+"""
+
+_policy_hashes = {}
+
+
+def policy_hash(policy_path):
+    """Return the SHA-256 of a policy file, memoized on (path, size, mtime), or None if it is missing."""
+    policy_path = Path(policy_path).resolve()
+    try:
+        st = policy_path.stat()
+    except OSError:
+        return None
+    memo_key = (str(policy_path), st.st_size, st.st_mtime_ns)
+    if memo_key not in _policy_hashes:
+        _policy_hashes[memo_key] = hashlib.sha256(policy_path.read_bytes()).hexdigest()
+    return _policy_hashes[memo_key]
+
+
+def file_identity(file_path):
+    """Return (resolved path, size, mtime_ns) for a file, or None if missing."""
+    try:
+        st = Path(file_path).stat()
+    except OSError:
+        return None
+    return str(Path(file_path).resolve()), st.st_size, st.st_mtime_ns
+
+
+def parse_since(value, store=None, tool=None):
+    """
+    Convert a --since value to a POSIX timestamp.
+
+    Accepts an ISO date/datetime ('2025-06-01', '2025-06-01T12:00') or
+    'last', meaning the start of the previous run of `tool` in `store`.
+    Returns None when 'last' is requested but no earlier run is recorded.
+    """
+    if value is None:
+        return None
+    if value == 'last':
+        if store is None or tool is None:
+            raise ValueError("--since last requires a result store")
+        return store.last_run(tool)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid --since value '{value}': use YYYY-MM-DD[THH:MM] or 'last'")
+
+
+def modified_since(file_path, since_ts):
+    """True if the file's mtime (or ctime, for copies preserving mtime) is after since_ts."""
+    if since_ts is None:
+        return True
+    try:
+        st = Path(file_path).stat()
+    except OSError:
+        return False
+    return max(st.st_mtime, st.st_ctime) >= since_ts
+
+
+class ConformanceStore:
+    """SQLite-backed cache of MediaConch output per (file identity, policy key)."""
+
+    def __init__(self, db_path=DEFAULT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+    def lookup(self, file_path, policy_key):
+        """Return cached MediaConch output, or None if the file or policy changed."""
+        ident = file_identity(file_path)
+        if ident is None:
+            return None
+        path, size, mtime_ns = ident
+        row = self.conn.execute(
+            "SELECT output FROM results WHERE path = ? AND policy_key = ? "
+            "AND size = ? AND mtime_ns = ?",
+            (path, policy_key, size, mtime_ns)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def record(self, file_path, policy_key, output):
+        """Store MediaConch output for a file/policy pair, replacing any older result."""
+        ident = file_identity(file_path)
+        if ident is None or output is None:
+            return
+        path, size, mtime_ns = ident
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (path, size, mtime_ns, policy_key, output, checked_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, policy_key, output, time.time())
+        )
+        self.conn.commit()
+
+    def last_run(self, tool):
+        row = self.conn.execute(
+            "SELECT started_at FROM runs WHERE tool = ?", (tool,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def mark_run(self, tool, started_at):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs (tool, started_at) VALUES (?, ?)",
+            (tool, started_at)
+        )
+        self.conn.commit()
+
+    def prune_missing(self):
+        """Drop results for files that no longer exist; returns the number removed."""
+        paths = [row[0] for row in self.conn.execute("SELECT DISTINCT path FROM results")]
+        gone = [(p,) for p in paths if not os.path.exists(p)]
+        self.conn.executemany("DELETE FROM results WHERE path = ?", gone)
+        self.conn.commit()
+        return len(gone)
@@ -19,6 +19,11 @@ except ImportError:
     print("    python3 -m pip install boto3")
     sys.exit(1)
 
+try:
+    from ami_scripts.s3_inventory import S3Inventory
+except ImportError:
+    from s3_inventory import S3Inventory
+
 # Default hardcoded bucket for standard workflow
 DEFAULT_BUCKET = 'ami-carnegie-servicecopies'
 
@@ -70,6 +75,11 @@ def get_args():
         action='store_true',
         help='Simulate logic without executing FFmpeg or S3 uploads.'
     )
+    parser.add_argument(
+        '--refresh_inventory',
+        action='store_true',
+        help='Re-list the whole bucket into the local S3 inventory before checking.'
+    )
     
     return parser.parse_args()
 
@@ -187,9 +197,39 @@ def valid_json_barcode(json_files):
             if not re.search(r'^33433\d+', barcode): return f
     return True
 
-def check_bucket(s3_client, filenames_list, bucket_name):
+def missing_from_keys(filenames_list, found_keys):
+    to_upload = []
+    for file in filenames_list:
+        if file in found_keys: continue
+        if any(ext in file for ext in ['flac', 'wav']):
+            if file.replace('flac', 'mp4').replace('wav', 'mp4') in found_keys: continue
+        to_upload.append(file)
+    return to_upload
+
+def candidate_keys(filenames_list):
+    keys = set(filenames_list)
+    keys.update(f.replace('flac', 'mp4').replace('wav', 'mp4') for f in filenames_list)
+    return keys
+
+def check_bucket(s3_client, filenames_list, bucket_name, inventory=None):
+    """
+    Return the files not yet in the bucket.
+
+    With an S3Inventory, files the local index already knows about are taken
+    as uploaded; only when something looks missing is the bag's key prefix
+    re-listed (and the index updated) to confirm it.
+    """
     if not filenames_list: return []
     common_prefix = os.path.commonprefix(filenames_list)
+
+    if inventory is not None:
+        to_upload = missing_from_keys(filenames_list, inventory.existing_keys(candidate_keys(filenames_list)))
+        if not to_upload: return []
+        try:
+            inventory.refresh_prefix(s3_client, common_prefix)
+        except ClientError: pass
+        return missing_from_keys(filenames_list, inventory.existing_keys(candidate_keys(filenames_list)))
+
     found_keys = set()
     try:
         paginator = s3_client.get_paginator('list_objects_v2')
@@ -197,14 +237,7 @@ def check_bucket(s3_client, filenames_list, bucket_name):
             if 'Contents' in page:
                 for obj in page['Contents']: found_keys.add(obj['Key'])
     except ClientError: pass
-
-    to_upload = []
-    for file in filenames_list:
-        if file in found_keys: continue
-        if any(ext in file for ext in ['flac', 'wav']):
-            if file.replace('flac', 'mp4').replace('wav', 'mp4') in found_keys: continue
-        to_upload.append(file)
-    return to_upload
+    return missing_from_keys(filenames_list, found_keys)
 
 def transcode_flac(input_path, output_path, dry_run=False):
     cmd = ["ffmpeg", "-y", "-i", input_path, "-c:a", "aac", "-b:a", "320k", 
@@ -243,8 +276,8 @@ def prepare_transcodes(file_list, all_bag_files, temp_dir, dry_run=False):
             final.append(f)
     return sorted(list(set(final)))
 
-def cp_files(s3_client, file_list, bucket_name, dry_run=False):
-    failures = []
+def cp_files(s3_client, file_list, bucket_name, dry_run=False, inventory=None):
+    failures, uploaded = [], []
     for f in sorted(file_list):
         if not dry_run and not os.path.exists(f):
              failures.append(f)
@@ -255,12 +288,15 @@ def cp_files(s3_client, file_list, bucket_name, dry_run=False):
             try:
                 print(f"Uploading: {key}")
                 s3_client.upload_file(f, bucket_name, key)
+                uploaded.append(key)
             except Exception as e:
                  print(f"Failed {key}: {e}")
                  failures.append(f)
+    if inventory is not None and uploaded:
+        inventory.add_keys(uploaded)
     return failures
 
-def process_single_directory(directory, arguments, s3_client, bucket_name):
+def process_single_directory(directory, arguments, s3_client, bucket_name, inventory=None):
     bags, bag_ids = find_bags(directory)
     summary = {
         'directory': directory, 'num_bags_found': len(bag_ids), 'bag_ids': sorted(bag_ids),
@@ -283,7 +319,7 @@ def process_single_directory(directory, arguments, s3_client, bucket_name):
         if all(c is True for c in checks):
             to_proc = []
             if arguments.check_only or arguments.check_and_upload:
-                missing = check_bucket(s3_client, names, bucket_name)
+                missing = check_bucket(s3_client, names, bucket_name, inventory)
                 if missing:
                     summary['incomplete_in_bucket'].append(bag)
                     if arguments.check_and_upload: to_proc = [fn_map[m] for m in missing]
@@ -295,7 +331,7 @@ def process_single_directory(directory, arguments, s3_client, bucket_name):
                     if arguments.transcode:
                         to_proc = prepare_transcodes(to_proc, paths, tmp, arguments.dry_run)
                     
-                    failures = cp_files(s3_client, to_proc, bucket_name, arguments.dry_run)
+                    failures = cp_files(s3_client, to_proc, bucket_name, arguments.dry_run, inventory)
                     summary['failed_uploads'].extend(failures)
                     for f in to_proc:
                         for ext in ['mp4', 'wav', 'flac', 'json']:
@@ -322,10 +358,15 @@ def main():
     
     s3_client, active_bucket = get_s3_client(args)
 
-    for directory in args.directories:
-        print(f"\nProcessing: {directory}")
-        summary = process_single_directory(directory, args, s3_client, active_bucket)
-        print_summary(args, summary)
+    with S3Inventory(active_bucket) as inventory:
+        if args.refresh_inventory:
+            inventory.refresh(s3_client)
+            print(f"S3 inventory refreshed: {inventory.object_count():,} keys in {active_bucket}")
+
+        for directory in args.directories:
+            print(f"\nProcessing: {directory}")
+            summary = process_single_directory(directory, args, s3_client, active_bucket, inventory)
+            print_summary(args, summary)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
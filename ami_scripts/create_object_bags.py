@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import bagit
 import re
@@ -34,6 +36,16 @@ TIMEDTEXT_EXTENSIONS = {'.srt', '.scc', '.vtt'}
 # Pre-compiled regex patterns
 AMI_ID_RE = re.compile(r'_(\d{6})_')
 ROLE_RE = re.compile(r'(_pm|_em|_mz|_sc)', re.IGNORECASE)
+JSON_TYPE_RES = [
+    (re.compile(r'\bvideo\b'), 'Video'),
+    (re.compile(r'\bfilm\b'), 'Film'),
+    (re.compile(r'\baudio\b'), 'Audio'),
+    (re.compile(r'\bdata\b'), 'Data'),
+]
+
+# Bags with more payload than this are hashed with bagit's multiprocess option
+LARGE_BAG_BYTES = 20 * 1024 ** 3
+DEFAULT_BAG_PROCESSES = 4
 
 # --- End Constants ---
 
@@ -53,6 +65,11 @@ def get_args() -> argparse.Namespace:
     # CHANGED: -s/--source to -d/--directory
     parser.add_argument('-d', '--directory',
                         help='path to the directory of object files', required=True)
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of object bags to create concurrently (default: 1)')
+    parser.add_argument('--bag-processes', type=int, default=DEFAULT_BAG_PROCESSES,
+                        help='checksum processes per bag for bags larger than '
+                             f'{LARGE_BAG_BYTES // 1024 ** 3} GB (default: {DEFAULT_BAG_PROCESSES})')
     args = parser.parse_args()
     return args
 
@@ -77,6 +94,43 @@ def get_files(source_directory: Path) -> list[Path]:
     return file_paths
 
 
+def classify_json_text(content: str) -> str | None:
+    """Return the first media type keyword found in lowercased JSON text."""
+    for pattern, media_type in JSON_TYPE_RES:
+        if pattern.search(content):
+            return media_type
+    return None
+
+
+def classify_json_sidecar(json_path: Path, ami_id: str) -> str | None:
+    """
+    Classify a JSON sidecar by source.object.type, falling back to a
+    keyword search of the same text. The file is read only once.
+    """
+    try:
+        content = json_path.read_text(encoding='utf-8')
+    except Exception as e:
+        logging.warning(f"Could not read content of {json_path}: {e}")
+        return None
+
+    try:
+        data = json.loads(content)
+        # Try to extract source.object.type
+        obj_type = data.get('source', {}).get('object', {}).get('type', '')
+        if isinstance(obj_type, list) and len(obj_type) > 0:
+            obj_type = obj_type[0]
+        obj_type = str(obj_type).lower()
+        for keyword, media_type in (('video', 'Video'), ('film', 'Film'),
+                                    ('audio', 'Audio'), ('data', 'Data')):
+            if keyword in obj_type:
+                return media_type
+    except Exception as e:
+        logging.warning(f"Error reading JSON for {ami_id}: {e}")
+
+    # Fallback to searching the whole json file string
+    return classify_json_text(content.lower())
+
+
 def classify_ami_ids(source_directory: Path, file_list: list[Path]) -> dict[str, str]:
     """
     Classifies each AMI ID into a media type (video, film, audio, data) 
@@ -100,40 +154,7 @@ def classify_ami_ids(source_directory: Path, file_list: list[Path]) -> dict[str,
         # 1. Try to find and parse JSON
         json_files = [f for f in files if f.suffix.lower() == '.json']
         for jf in json_files:
-            json_path = source_directory / jf
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
-                # Try to extract source.object.type
-                obj_type = data.get('source', {}).get('object', {}).get('type', '')
-                if isinstance(obj_type, list) and len(obj_type) > 0:
-                    obj_type = obj_type[0]
-                obj_type = str(obj_type).lower()
-                
-                if 'video' in obj_type: media_type = 'Video'
-                elif 'film' in obj_type: media_type = 'Film'
-                elif 'audio' in obj_type: media_type = 'Audio'
-                elif 'data' in obj_type: media_type = 'Data'
-                else:
-                    # Fallback to searching the whole json file string
-                    content = json_path.read_text(encoding='utf-8').lower()
-                    if re.search(r'\bvideo\b', content): media_type = 'Video'
-                    elif re.search(r'\bfilm\b', content): media_type = 'Film'
-                    elif re.search(r'\baudio\b', content): media_type = 'Audio'
-                    elif re.search(r'\bdata\b', content): media_type = 'Data'
-            except Exception as e:
-                logging.warning(f"Error reading JSON for {ami_id}: {e}")
-                # Fallback to pure string search if JSON parsing failed entirely
-                try:
-                    content = json_path.read_text(encoding='utf-8').lower()
-                    if re.search(r'\bvideo\b', content): media_type = 'Video'
-                    elif re.search(r'\bfilm\b', content): media_type = 'Film'
-                    elif re.search(r'\baudio\b', content): media_type = 'Audio'
-                    elif re.search(r'\bdata\b', content): media_type = 'Data'
-                except Exception as e2:
-                    logging.warning(f"Could not read content of {json_path}: {e2}")
-
+            media_type = classify_json_sidecar(source_directory / jf, ami_id)
             if media_type:
                 break
 
@@ -221,31 +242,74 @@ def make_object_dirs(source_directory: Path, file_list: list[Path], media_mappin
 
     return ami_ids, unmoved, tags, data_files_moved_count
 
-def make_object_bags(source_directory: Path, ami_objects: set[str], media_mapping: dict[str, str]) -> tuple[int, int]:
+def payload_size(directory: Path) -> int:
+    """Total size in bytes of all files under a directory."""
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+
+def bag_object(bag_path: str, processes: int) -> None:
+    """Create a single md5 bag; runs in a worker process when bagging in parallel."""
+    bagit.make_bag(bag_path, checksums=['md5'], processes=processes)
+
+
+def make_object_bags(source_directory: Path, ami_objects: set[str], media_mapping: dict[str, str],
+                     jobs: int = 1, bag_processes: int = DEFAULT_BAG_PROCESSES) -> tuple[int, int]:
     """
     Creates BagIt bags for each AMI ID directory inside the media type directory.
 
+    Up to `jobs` bags are created concurrently in separate processes (bagit
+    changes the working directory while bagging, so threads cannot be used).
+    Bags larger than LARGE_BAG_BYTES are also hashed with `bag_processes`
+    processes.
+
     Returns:
         A tuple of (success_count, failure_count).
     """
     success_count = 0
     failure_count = 0
-    
-    for ami_id in ami_objects:
-        media_type = media_mapping.get(ami_id, 'Unknown')
-        bag_path = source_directory / media_type / ami_id
-        logging.info(f'Starting bagging for: {ami_id} in {media_type}')
-        try:
-            bagit.make_bag(str(bag_path), checksums=['md5'])
+
+    def record(ami_id, error):
+        nonlocal success_count, failure_count
+        if error is None:
             logging.info(f'Finished bagging object: {ami_id}')
             success_count += 1
-        except bagit.BagError as e:
-            logging.error(f'Failed to create bag for {ami_id}: {e}')
+        elif isinstance(error, bagit.BagError):
+            logging.error(f'Failed to create bag for {ami_id}: {error}')
             failure_count += 1
-        except Exception as e:
-            logging.error(f'An unexpected error occurred while bagging {ami_id}: {e}')
+        else:
+            logging.error(f'An unexpected error occurred while bagging {ami_id}: {error}')
             failure_count += 1
-            
+
+    work = []
+    for ami_id in sorted(ami_objects):
+        media_type = media_mapping.get(ami_id, 'Unknown')
+        bag_path = source_directory / media_type / ami_id
+        processes = bag_processes if payload_size(bag_path) > LARGE_BAG_BYTES else 1
+        work.append((ami_id, media_type, str(bag_path), processes))
+
+    if jobs <= 1:
+        for ami_id, media_type, bag_path, processes in work:
+            logging.info(f'Starting bagging for: {ami_id} in {media_type}')
+            try:
+                bag_object(bag_path, processes)
+                record(ami_id, None)
+            except Exception as e:
+                record(ami_id, e)
+        return success_count, failure_count
+
+    logging.info(f'Bagging {len(work)} objects with {jobs} parallel jobs')
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for ami_id, media_type, bag_path, processes in work:
+            logging.info(f'Starting bagging for: {ami_id} in {media_type}')
+            futures[pool.submit(bag_object, bag_path, processes)] = ami_id
+        for future in as_completed(futures):
+            record(futures[future], future.exception())
+
     return success_count, failure_count
 
 
@@ -343,7 +407,8 @@ def main():
         
         # --- Capture return values ---
         ami_objects, unmoved, tags, data_files_moved = make_object_dirs(source_directory, file_list, media_mapping)
-        bags_created, bags_failed = make_object_bags(source_directory, ami_objects, media_mapping)
+        bags_created, bags_failed = make_object_bags(source_directory, ami_objects, media_mapping,
+                                                     arguments.jobs, arguments.bag_processes)
         tags_moved = move_tag_files(source_directory, tags, media_mapping)
         clean_up(source_directory) # Runs but is not reported in summary
         
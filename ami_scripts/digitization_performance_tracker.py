@@ -10,6 +10,13 @@ import numpy as np
 import datetime
 from matplotlib.backends.backend_pdf import PdfPages
 
+try:
+    from ami_scripts.amidb_snapshot import AMIDBSnapshot, DEFAULT_SNAPSHOT_PATH
+    from ami_scripts.reporting_dates import add_date_buckets, fiscal_year_label, prior_fiscal_year_label
+except ImportError:
+    from amidb_snapshot import AMIDBSnapshot, DEFAULT_SNAPSHOT_PATH
+    from reporting_dates import add_date_buckets, fiscal_year_label, prior_fiscal_year_label
+
 # Setup display options for better readability in the output
 pd.set_option('display.max_rows', None)
 pd.set_option('display.max_columns', None)
@@ -37,10 +44,53 @@ def get_args():
     parser.add_argument('--output_csv',
                         help='Path to output the fetched database data as CSV.',
                         type=str, default=None)
+    parser.add_argument('--snapshot',
+                        help=f'Path to the local AMIDB snapshot (default: {DEFAULT_SNAPSHOT_PATH}).',
+                        type=str, default=str(DEFAULT_SNAPSHOT_PATH))
+    parser.add_argument('--offline', action='store_true',
+                        help='Report from the local snapshot without syncing changes from AMIDB.')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='Fetch the full tables over JDBC instead of using the local snapshot.')
     return parser.parse_args()
 
 
-def fetch_data_from_jdbc(args):
+VENDOR_TABLE = 'tbl_vendor_mediainfo'
+VENDOR_COLUMNS = [
+    "asset.referenceFilename",
+    "bibliographic.primaryID",
+    "technical.dateCreated",
+    "technical.fileFormat",
+    "technical.fileSize.measure",
+    "technical.durationMilli.measure",
+    "asset.fileRole",
+    "mediaType",
+    "bibliographic.vernacularDivisionCode",
+    "source.object.format",
+    "source.object.type",
+    "cmsCollectionTitle"
+]
+
+INHOUSE_TABLE = 'tbl_metadata'
+INHOUSE_COLUMNS = [
+    "asset.referenceFilename",
+    "bibliographic.primaryID",
+    "technical.dateCreated",
+    "technical.fileFormat",
+    "technical.fileSize.measure",
+    "technical.durationMilli.measure",
+    "asset.fileRole",
+    "digitizer.operator.lastName",
+    "digitizationProcess.playbackDevice.model", 
+    "digitizationProcess.playbackDevice.serialNumber",
+    "bibliographic.vernacularDivisionCode",
+    "source.object.format",
+    "source.object.type",
+    "cmsCollectionTitle",
+    "projectType"
+]
+
+
+def connect_to_amidb():
     # load environment
     server_ip = os.getenv('FM_SERVER')
     database_name = os.getenv('AMI_DATABASE')
@@ -48,94 +98,71 @@ def fetch_data_from_jdbc(args):
     password = os.getenv('AMI_DATABASE_PASSWORD')
     jdbc_path = os.path.expanduser('~/Desktop/ami-preservation/ami_scripts/jdbc/fmjdbc.jar')
 
+    conn = jaydebeapi.connect(
+        'com.filemaker.jdbc.Driver',
+        f'jdbc:filemaker://{server_ip}/{database_name}',
+        [username, password],
+        jdbc_path
+    )
+    print("Connection to AMIDB successful!")
+    return conn
+
+
+def build_query(table, columns):
+    column_list = ",\n    ".join(f'"{c}"' for c in columns)
+    return f"SELECT\n    {column_list}\nFROM {table}"
+
+
+def tables_for_args(args):
+    """Return the (table, columns) pairs needed for the requested source mode."""
+    if args.combined:
+        return [(VENDOR_TABLE, VENDOR_COLUMNS), (INHOUSE_TABLE, INHOUSE_COLUMNS)]
+    if args.vendor:
+        return [(VENDOR_TABLE, VENDOR_COLUMNS)]
+    return [(INHOUSE_TABLE, INHOUSE_COLUMNS)]
+
+
+def combine_sources(frames, args):
+    """Label vendor/in-house frames and combine them according to the source mode."""
+    df_vendor = frames.get(VENDOR_TABLE)
+    df_inhouse = frames.get(INHOUSE_TABLE)
+
+    if df_vendor is not None:
+        # Force these columns for vendor data
+        df_vendor['source'] = 'Vendor'
+        df_vendor['projectType'] = 'Programmatic Digitization'
+
+        # **Add or fill** digitizer.operator.lastName => 'Vendor'
+        if 'digitizer.operator.lastName' not in df_vendor.columns:
+            df_vendor['digitizer.operator.lastName'] = 'Vendor'
+        else:
+            df_vendor['digitizer.operator.lastName'] = df_vendor['digitizer.operator.lastName'].fillna('Vendor')
+
+    if df_inhouse is not None:
+        df_inhouse['source'] = 'In-House'
+
+    if df_vendor is not None and df_inhouse is not None:
+        return pd.concat([df_vendor, df_inhouse], ignore_index=True)
+    if df_vendor is not None:
+        return df_vendor
+    return df_inhouse if df_inhouse is not None else pd.DataFrame()
+
+
+def fetch_data_from_jdbc(args):
     conn = None
     df = pd.DataFrame()
 
     try:
-        conn = jaydebeapi.connect(
-            'com.filemaker.jdbc.Driver',
-            f'jdbc:filemaker://{server_ip}/{database_name}',
-            [username, password],
-            jdbc_path
-        )
-        print("Connection to AMIDB successful!")
+        conn = connect_to_amidb()
         print("Now Fetching Data (Expect 2-3 minutes)")
 
-        # -- If we want to optionally fetch vendor data, define it here:
-        vendor_query = '''
-        SELECT
-            "asset.referenceFilename",
-            "bibliographic.primaryID",
-            "technical.dateCreated",
-            "technical.fileFormat",
-            "technical.fileSize.measure",
-            "technical.durationMilli.measure",
-            "asset.fileRole",
-            "mediaType",
-            "bibliographic.vernacularDivisionCode",
-            "source.object.format",
-            "source.object.type",
-            "cmsCollectionTitle"
-        FROM tbl_vendor_mediainfo
-        '''
-
-        inhouse_query = '''
-        SELECT
-            "asset.referenceFilename",
-            "bibliographic.primaryID",
-            "technical.dateCreated",
-            "technical.fileFormat",
-            "technical.fileSize.measure",
-            "technical.durationMilli.measure",
-            "asset.fileRole",
-            "digitizer.operator.lastName",
-            "digitizationProcess.playbackDevice.model", 
-            "digitizationProcess.playbackDevice.serialNumber",
-            "bibliographic.vernacularDivisionCode",
-            "source.object.format",
-            "source.object.type",
-            "cmsCollectionTitle",
-            "projectType"
-        FROM tbl_metadata
-        '''
-
         curs = conn.cursor()
-
-        # If user wants vendor data only or combined
-        if args.vendor or args.combined:
-            # fetch vendor data
-            curs.execute(vendor_query)
-            columns = [desc[0] for desc in curs.description]
-            vendor_data = [dict(zip(columns, row)) for row in curs.fetchall()]
-            df_vendor = pd.DataFrame(vendor_data)
-            # Force these columns for vendor data
-            df_vendor['source'] = 'Vendor'
-            df_vendor['projectType'] = 'Programmatic Digitization'
-            
-            # **Add or fill** digitizer.operator.lastName => 'Vendor'
-            if 'digitizer.operator.lastName' not in df_vendor.columns:
-                df_vendor['digitizer.operator.lastName'] = 'Vendor'
-            else:
-                df_vendor['digitizer.operator.lastName'] = df_vendor['digitizer.operator.lastName'].fillna('Vendor')
-            
-            if args.combined:
-                # also fetch in-house
-                curs.execute(inhouse_query)
-                columns = [desc[0] for desc in curs.description]
-                inhouse_data = [dict(zip(columns, row)) for row in curs.fetchall()]
-                df_inhouse = pd.DataFrame(inhouse_data)
-                df_inhouse['source'] = 'In-House'
-                df = pd.concat([df_vendor, df_inhouse], ignore_index=True)
-            else:
-                # vendor only
-                df = df_vendor
-        else:
-            # default: in-house only
-            curs.execute(inhouse_query)
-            columns = [desc[0] for desc in curs.description]
-            data = [dict(zip(columns, row)) for row in curs.fetchall()]
-            df = pd.DataFrame(data)
-            df['source'] = 'In-House'
+        frames = {}
+        for table, columns in tables_for_args(args):
+            curs.execute(build_query(table, columns))
+            result_columns = [desc[0] for desc in curs.description]
+            frames[table] = pd.DataFrame([dict(zip(result_columns, row)) for row in curs.fetchall()])
+        df = combine_sources(frames, args)
 
         print(f"Data fetched successfully!")
         print(f"Total records fetched: {len(df)}")
@@ -150,6 +177,45 @@ def fetch_data_from_jdbc(args):
     return df
 
 
+def fetch_data_from_snapshot(args):
+    """
+    Read report data from the local AMIDB snapshot, first pulling only the
+    records created, modified or deleted since the last sync (unless --offline).
+    """
+    tables = tables_for_args(args)
+    frames = {}
+
+    with AMIDBSnapshot(args.snapshot) as snapshot:
+        if not args.offline:
+            conn = None
+            try:
+                conn = connect_to_amidb()
+                for table, columns in tables:
+                    first_sync = not snapshot.has_table(table)
+                    if first_sync:
+                        print(f"Creating local snapshot of {table} (first run, expect 2-3 minutes)")
+                    added, updated, deleted = snapshot.refresh(conn, table, columns)
+                    print(f"Synced {table}: {added} new, {updated} modified, {deleted} deleted")
+            except Exception as e:
+                print(f"Failed to refresh snapshot, using last synced data: {e}")
+            finally:
+                if conn:
+                    conn.close()
+
+        for table, columns in tables:
+            synced_at = snapshot.last_synced(table)
+            if synced_at is None:
+                print(f"No local snapshot of {table}; run without --offline first.")
+                return pd.DataFrame()
+            synced = datetime.datetime.fromtimestamp(synced_at).strftime('%Y-%m-%d %H:%M')
+            print(f"Reading {table} from snapshot (last synced {synced})")
+            frames[table] = snapshot.read(table, columns)
+
+    df = combine_sources(frames, args)
+    print(f"Total records loaded: {len(df)}")
+    return df
+
+
 def format_file_size(total_bytes):
     units = ["Bytes", "KB", "MB", "GB", "TB", "PB"]
     size = total_bytes
@@ -165,41 +231,17 @@ def format_file_size(total_bytes):
         return f"{size:.2f} {units[unit_index]}"  # Two decimal places for all other units
 
 
-def get_fiscal_year(date):
-    year = date.year
-    month = date.month
-
-    if month >= 7:
-        fiscal_year = year + 1
-    else:
-        fiscal_year = year
-
-    return f"FY{str(fiscal_year)[2:]}"
-
-
 def process_data(df, args, fiscal=False):
-    def convert_date(date_str):
-        if "-" in str(date_str):
-            # YYYY-MM-DD
-            return pd.to_datetime(date_str, format='%Y-%m-%d', errors='coerce')
-        else:
-            # M/D/Y
-            return pd.to_datetime(date_str, format='%m/%d/%Y', errors='coerce')
-
-    df['technical.dateCreated'] = df['technical.dateCreated'].apply(convert_date)
-
     # Filter by engineer if specified
     if args.engineer:
         df = df[df['digitizer.operator.lastName'].isin(args.engineer)].copy()
 
-    # Assign calendar/fiscal info
-    df.loc[:, 'calendar_year'] = df['technical.dateCreated'].dt.year
-    df.loc[:, 'fiscal_year'] = df['technical.dateCreated'].apply(get_fiscal_year)
-    df.loc[:, 'month'] = df['technical.dateCreated'].dt.strftime('%Y-%m')
+    # Normalize both date formats and assign calendar/fiscal info in bulk
+    df = add_date_buckets(df, 'technical.dateCreated')
 
     current_date = datetime.datetime.now()
-    current_fiscal_year = get_fiscal_year(current_date)
-    prior_fiscal_year = f"FY{int(current_fiscal_year[2:]) - 1}"
+    current_fiscal_year = fiscal_year_label(current_date)
+    prior_fiscal_year = prior_fiscal_year_label(current_fiscal_year)
 
     # 1) If user passed -H or --historical, skip year filtering
     if args.historical:
@@ -282,8 +324,8 @@ def display_monthly_output(df, args, fiscal=False):
     df_pm = classify_media_types(df_pm) 
 
     current_date = datetime.datetime.now()
-    current_fiscal_year = get_fiscal_year(current_date)
-    prior_fiscal_year = f"FY{int(current_fiscal_year[2:]) - 1}"
+    current_fiscal_year = fiscal_year_label(current_date)
+    prior_fiscal_year = prior_fiscal_year_label(current_fiscal_year)
 
     if args.historical:
         year_label = "All Years"
@@ -557,8 +599,8 @@ def plot_object_format_counts(df, args, fiscal=False, previous_fiscal=False, top
 
     # 3) Derive the chart title from the actual flags
     current_date = datetime.datetime.now()
-    current_fiscal_year = get_fiscal_year(current_date)
-    prior_fiscal_year = f"FY{int(current_fiscal_year[2:]) - 1}"
+    current_fiscal_year = fiscal_year_label(current_date)
+    prior_fiscal_year = prior_fiscal_year_label(current_fiscal_year)
 
     if args.historical:
         year_label = "All Years"
@@ -949,7 +991,10 @@ def main():
         df = pd.read_csv(args.input_csv, low_memory=False)
         df['technical.durationMilli.measure'] = pd.to_numeric(df['technical.durationMilli.measure'], errors='coerce')
     else:
-        df = fetch_data_from_jdbc(args)
+        if args.no_snapshot:
+            df = fetch_data_from_jdbc(args)
+        else:
+            df = fetch_data_from_snapshot(args)
         if not df.empty and args.output_csv:
             df.to_csv(args.output_csv, index=False)
             print(f"CSV output written to: {args.output_csv}")
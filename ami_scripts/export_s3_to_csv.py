@@ -3,37 +3,38 @@
 import boto3
 import csv
 import argparse
+from datetime import datetime
 
-def list_s3_objects(bucket_name, output_file):
-    # Initialize S3 client
-    s3 = boto3.client('s3')
+try:
+    from ami_scripts.s3_inventory import S3Inventory, DEFAULT_LIST_WORKERS
+except ImportError:
+    from s3_inventory import S3Inventory, DEFAULT_LIST_WORKERS
 
+def format_last_modified(value):
+    # Match the str(datetime) format boto3 listings were previously exported with
     try:
-        # Write to CSV
-        with open(output_file, mode='w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(['Key', 'LastModified', 'Size'])  # CSV header
-
-            # Pagination logic
-            continuation_token = None
-            total_files = 0
-
-            while True:
-                if continuation_token:
-                    response = s3.list_objects_v2(Bucket=bucket_name, ContinuationToken=continuation_token)
-                else:
-                    response = s3.list_objects_v2(Bucket=bucket_name)
-
-                # Write object details to CSV
-                for obj in response.get('Contents', []):
-                    writer.writerow([obj['Key'], obj['LastModified'], obj['Size']])
-                    total_files += 1
+        return str(datetime.fromisoformat(value))
+    except (TypeError, ValueError):
+        return value
 
-                # Check if there are more objects to fetch
-                if response.get('IsTruncated'):  # True if there are more objects to fetch
-                    continuation_token = response.get('NextContinuationToken')
-                else:
-                    break
+def list_s3_objects(bucket_name, output_file, workers=DEFAULT_LIST_WORKERS, cached=False, inventory_report=None):
+    try:
+        with S3Inventory(bucket_name) as inventory:
+            if inventory_report:
+                inventory.ingest_inventory(inventory_report)
+            elif not cached or inventory.object_count() == 0:
+                # Key ranges around division prefixes and IDs, paginated concurrently
+                inventory.refresh(boto3.client('s3'), workers)
+
+            # Write to CSV
+            with open(output_file, mode='w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['Key', 'LastModified', 'Size'])  # CSV header
+
+                total_files = 0
+                for key, size, last_modified, _ in inventory.iter_objects():
+                    writer.writerow([key, format_last_modified(last_modified), size])
+                    total_files += 1
 
         print(f"Export complete! {total_files} files written to {output_file}")
 
@@ -45,10 +46,17 @@ def main():
     parser = argparse.ArgumentParser(description="Export contents of an S3 bucket to a CSV file.")
     parser.add_argument('-b', '--bucket', required=True, help="Name of the S3 bucket")
     parser.add_argument('-o', '--out', required=True, help="Output CSV file location and name")
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_LIST_WORKERS,
+                        help=f"Number of key ranges listed in parallel (default: {DEFAULT_LIST_WORKERS})")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--cached', action='store_true',
+                        help="Export the local S3 inventory without re-listing the bucket")
+    source.add_argument('--inventory-report',
+                        help="Build the export from an S3 Inventory manifest.json, CSV(.gz) or Parquet file instead of listing")
     args = parser.parse_args()
 
     # Call the function to list S3 objects
-    list_s3_objects(args.bucket, args.out)
+    list_s3_objects(args.bucket, args.out, args.workers, args.cached, args.inventory_report)
 
 if __name__ == '__main__':
     main()
@@ -1,8 +1,6 @@
 #!/usr/bin/env python3
 
-import os
 import json
-import hashlib
 import logging
 import argparse
 from pathlib import Path
@@ -15,7 +13,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-CHUNK_SIZE = 8192
+try:
+    from ami_scripts.bag_updater import BagUpdater
+except ImportError:
+    from bag_updater import BagUpdater
 
 def fix_sc_json_filename(data_dir: Path) -> List[str]:
     """
@@ -55,144 +56,6 @@ def fix_sc_json_filename(data_dir: Path) -> List[str]:
 
     return modified_files
 
-def calculate_md5(file_path: Path) -> str:
-    """Calculate MD5 checksum for a file."""
-    hash_md5 = hashlib.md5()
-    try:
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-    except Exception as e:
-        logger.error(f"Failed to calculate MD5 for {file_path}: {e}")
-        raise
-
-def update_manifests(bag_path: Path, modified_paths: List[str]) -> None:
-    """Update BagIt manifest-md5.txt with new checksums."""
-    manifest_path = bag_path / 'manifest-md5.txt'
-
-    if manifest_path.exists():
-        try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-
-            updated_lines = []
-            for line in lines:
-                parts = line.strip().split(' ', 1)
-                if len(parts) != 2:
-                    updated_lines.append(line)
-                    continue
-                    
-                old_checksum, rel_path = parts
-                rel_path = rel_path.strip()
-                
-                # If this file was modified, calculate new checksum
-                if rel_path in modified_paths:
-                    full_path = bag_path / rel_path
-                    if full_path.is_file():
-                        new_checksum = calculate_md5(full_path)
-                        # BagIt spec requires double spaces or space-asterisk, standard is space-space for text
-                        updated_lines.append(f"{new_checksum}  {rel_path}\n")
-                    else:
-                        logger.warning(f"File not found for manifest update: {full_path}")
-                        updated_lines.append(line)
-                else:
-                    updated_lines.append(line)
-
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                f.writelines(updated_lines)
-                
-            logger.info("Updated manifest-md5.txt")
-
-        except Exception as e:
-            logger.error(f"Failed to update manifest: {e}")
-            raise
-
-def update_payload_oxum(bag_path: Path) -> None:
-    """Recalculate and update Payload-Oxum in bag-info.txt."""
-    data_path = bag_path / 'data'
-    bag_info_path = bag_path / 'bag-info.txt'
-
-    if not data_path.exists() or not bag_info_path.exists():
-        return
-
-    total_size = 0
-    total_files = 0
-
-    for file_path in data_path.rglob('*'):
-        if file_path.is_file():
-            total_size += file_path.stat().st_size
-            total_files += 1
-
-    new_oxum = f"{total_size}.{total_files}"
-
-    try:
-        with open(bag_info_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        updated_lines = []
-        oxum_found = False
-        
-        for line in lines:
-            if line.startswith('Payload-Oxum:'):
-                updated_lines.append(f'Payload-Oxum: {new_oxum}\n')
-                oxum_found = True
-            else:
-                updated_lines.append(line)
-
-        if not oxum_found:
-            updated_lines.append(f'Payload-Oxum: {new_oxum}\n')
-
-        with open(bag_info_path, 'w', encoding='utf-8') as f:
-            f.writelines(updated_lines)
-            
-        logger.info(f"Updated Payload-Oxum to {new_oxum}")
-            
-    except Exception as e:
-        logger.error(f"Failed to update bag-info.txt: {e}")
-        raise
-
-def update_tagmanifest(bag_path: Path) -> None:
-    """Update tagmanifest-md5.txt with new checksums for metadata files."""
-    tag_manifest_path = bag_path / 'tagmanifest-md5.txt'
-    bag_info_path = bag_path / 'bag-info.txt'
-    manifest_path = bag_path / 'manifest-md5.txt'
-
-    if not tag_manifest_path.exists():
-        return
-
-    try:
-        with open(tag_manifest_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        updated_lines = []
-        for line in lines:
-            parts = line.strip().split(' ', 1)
-            if len(parts) != 2:
-                updated_lines.append(line)
-                continue
-                
-            old_checksum, filename = parts
-            filename = filename.strip()
-
-            if filename == 'manifest-md5.txt' and manifest_path.exists():
-                new_checksum = calculate_md5(manifest_path)
-                updated_lines.append(f"{new_checksum}  {filename}\n")
-            elif filename == 'bag-info.txt' and bag_info_path.exists():
-                new_checksum = calculate_md5(bag_info_path)
-                updated_lines.append(f"{new_checksum}  {filename}\n")
-            else:
-                updated_lines.append(line)
-
-        with open(tag_manifest_path, 'w', encoding='utf-8') as f:
-            f.writelines(updated_lines)
-            
-        logger.info("Updated tagmanifest-md5.txt")
-
-    except Exception as e:
-        logger.error(f"Failed to update tagmanifest: {e}")
-        raise
-
 def process_bag(bag_path: Path) -> None:
     """Orchestrate the processing of a single BagIt bag."""
     logger.info(f"--- Processing Bag: {bag_path.name} ---")
@@ -203,23 +66,19 @@ def process_bag(bag_path: Path) -> None:
         return
 
     try:
-        # Step 1: Fix the JSON files
+        # Step 1: Record sidecar sizes before they are rewritten
+        updater = BagUpdater(bag_path)
+        updater.snapshot(data_dir.rglob('*_sc.json'))
+
+        # Step 2: Fix the JSON files
         modified_absolute_paths = fix_sc_json_filename(data_dir)
 
         if not modified_absolute_paths:
             logger.info("No files needed updating.")
             return
 
-        # Step 2: Convert to relative paths for BagIt manifest matching
-        rel_modified = [
-            os.path.relpath(path, start=bag_path).replace('\\', '/')
-            for path in modified_absolute_paths
-        ]
-
-        # Step 3: Update all standard BagIt manifests
-        update_manifests(bag_path, rel_modified)
-        update_payload_oxum(bag_path)
-        update_tagmanifest(bag_path)
+        # Step 3: Rehash only the fixed sidecars and update manifests/Payload-Oxum
+        updater.commit(modified_absolute_paths)
         
         logger.info(f"Successfully finished processing {bag_path.name}\n")
 
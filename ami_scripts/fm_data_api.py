@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Concurrent paginated finds against the FileMaker Data API.
+
+fmrest pages through a found set one request at a time. DataAPIFetcher logs
+in a small pool of Data API sessions, reads the found count from the first
+page, then requests the remaining pages concurrently (one in-flight request
+per session). Records are flattened straight from the JSON response into
+plain dicts, with portals as lists of row dicts, the same shape the reports
+previously built with Record.to_dict().
+
+The module also contains a local mock Data API server over a synthetic
+collection, used to test the fetcher and to benchmark it against serial
+pagination:
+
+    python3 fm_data_api.py --records 50000 --latency 0.02 --sessions 4
+"""
+
+import argparse
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_SESSIONS = 4
+NO_RECORDS_CODE = '401'
+
+
+class DataAPIError(Exception):
+    """Raised when the Data API returns an error message."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(f"FileMaker Data API error {code}: {message}")
+        self.code = code
+
+
+def portal_params(portals: Optional[Dict[str, Dict[str, int]]]) -> Dict[str, Any]:
+    """Translate fmrest-style {name: {'offset': o, 'limit': l}} into Data API find parameters."""
+    if not portals:
+        return {}
+    params: Dict[str, Any] = {'portal': list(portals)}
+    for name, options in portals.items():
+        if 'offset' in options:
+            params[f'offset.{name}'] = options['offset']
+        if 'limit' in options:
+            params[f'limit.{name}'] = options['limit']
+    return params
+
+
+def flatten_records(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Flatten a page of Data API records into plain dicts.
+
+    Field data is merged with recordId/modId, and each portal becomes a
+    'portal_<name>' list of row dicts.
+    """
+    return [
+        {
+            **rec['fieldData'],
+            'recordId': rec.get('recordId'),
+            'modId': rec.get('modId'),
+            **{f'portal_{name}': rows for name, rows in rec.get('portalData', {}).items()},
+        }
+        for rec in data
+    ]
+
+
+class DataAPIFetcher:
+    """Pool of Data API sessions for one database layout."""
+
+    def __init__(self, url: str, database: str, layout: str, username: str, password: str,
+                 sessions: int = DEFAULT_SESSIONS, verify_ssl: bool = True, timeout: float = 60):
+        self.base = f"{url.rstrip('/')}/fmi/data/v1/databases/{requests.utils.quote(database)}"
+        self.layout = layout
+        self.auth = (username, password)
+        self.size = max(1, sessions)
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self._pool: "queue.Queue[Tuple[requests.Session, str]]" = queue.Queue()
+        self._sessions: List[Tuple[requests.Session, str]] = []
+
+    def login(self) -> None:
+        for _ in range(self.size):
+            http = requests.Session()
+            http.verify = self.verify_ssl
+            response = http.post(f"{self.base}/sessions", auth=self.auth, json={}, timeout=self.timeout)
+            token = self._parse(response)['token']
+            http.headers['Authorization'] = f"Bearer {token}"
+            self._sessions.append((http, token))
+            self._pool.put((http, token))
+
+    def logout(self) -> None:
+        for http, token in self._sessions:
+            try:
+                http.delete(f"{self.base}/sessions/{token}", timeout=self.timeout)
+            except requests.RequestException as e:
+                logging.warning(f"Error closing Data API session: {e}")
+            finally:
+                http.close()
+        self._sessions = []
+        self._pool = queue.Queue()
+
+    @staticmethod
+    def _parse(response: requests.Response) -> Dict[str, Any]:
+        try:
+            payload = response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise DataAPIError(str(response.status_code), response.text[:200])
+        message = (payload.get('messages') or [{}])[0]
+        code = str(message.get('code', '0'))
+        if code != '0':
+            raise DataAPIError(code, message.get('message', ''))
+        return payload['response']
+
+    def _find_page(self, queries: List[Dict[str, Any]], offset: int, limit: int,
+                   portals: Optional[Dict[str, Dict[str, int]]]) -> Tuple[int, List[Dict[str, Any]]]:
+        body = {'query': queries, 'offset': offset, 'limit': limit, **portal_params(portals)}
+        http, token = self._pool.get()
+        try:
+            response = http.post(f"{self.base}/layouts/{requests.utils.quote(self.layout)}/_find",
+                                 json=body, timeout=self.timeout)
+            try:
+                result = self._parse(response)
+            except DataAPIError as e:
+                if e.code == NO_RECORDS_CODE:
+                    return 0, []
+                raise
+        finally:
+            self._pool.put((http, token))
+        return result['dataInfo']['foundCount'], flatten_records(result['data'])
+
+    def find_all(self, queries: List[Dict[str, Any]], page_size: int = DEFAULT_PAGE_SIZE,
+                 portals: Optional[Dict[str, Dict[str, int]]] = None) -> List[Dict[str, Any]]:
+        """
+        Return every record matching `queries` (OR-combined find requests).
+
+        The first page reports the found count; the remaining pages are then
+        requested concurrently and reassembled in offset order.
+        """
+        if not self._sessions:
+            raise DataAPIError('952', 'Not logged in')
+        found_count, first = self._find_page(queries, 1, page_size, portals)
+        offsets = list(range(1 + page_size, found_count + 1, page_size))
+        logging.info(f"Found {found_count} records; fetching {len(offsets)} more pages "
+                     f"over {self.size} sessions")
+        if not offsets:
+            return first
+
+        with ThreadPoolExecutor(max_workers=self.size) as pool:
+            pages = pool.map(lambda o: self._find_page(queries, o, page_size, portals)[1], offsets)
+            records = list(first)
+            for page in pages:
+                records.extend(page)
+        return records
+
+    def __enter__(self):
+        self.login()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.logout()
+
+
+# ----- mock Data API server -----
+
+def synthetic_collection(count: int, collection_id: str = 'COLL1', seed: int = 0) -> List[Dict[str, Any]]:
+    """Records shaped like the AMI OBJECTS layout, with an OBJ_ISSUES portal."""
+    rng = random.Random(seed)
+    statuses = ['Migrated', 'Not migrated', 'In progress', '']
+    records = []
+    for i in range(count):
+        issues = [{'recordId': str(j), 'modId': '0', 'OBJ_ISSUES::issue': rng.choice(['Mold', 'Sticky shed', 'Warped'])}
+                  for j in range(rng.randint(0, 3))]
+        records.append({
+            'recordId': str(i + 1),
+            'modId': '0',
+            'fieldData': {
+                'ref_collection_id': collection_id,
+                'ref_ami_id': 100000 + i,
+                'id_barcode': f"33433{rng.randint(10**8, 10**9 - 1)}",
+                'id_label_text': f"Item {i + 1}",
+                'OBJECTS_MIGRATION_STATUS_active::migration_status': rng.choice(statuses),
+                'format_1': 'video',
+                'format_2': 'videotape',
+                'format_3': 'Betacam SP',
+                'active': 1,
+            },
+            'portalData': {'OBJ_ISSUES': issues},
+        })
+    return records
+
+
+class MockDataAPIServer:
+    """
+    Minimal threaded FileMaker Data API server for local testing.
+
+    Supports session login/logout and _find with exact-match query fields,
+    offset/limit paging and portal limits. `latency` seconds are slept per
+    request to stand in for network round trips.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], latency: float = 0.0):
+        self.records = records
+        self.latency = latency
+        self.tokens = set()
+        self.find_requests = 0
+        self._found_sets: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> 'MockDataAPIServer':
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def find(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        def matches(rec):
+            return any(all(str(rec['fieldData'].get(k)) == str(v).lstrip('=') for k, v in q.items())
+                       for q in body.get('query', []))
+
+        query_key = json.dumps(body.get('query', []), sort_keys=True)
+        with self._lock:
+            found = self._found_sets.get(query_key)
+            if found is None:
+                found = self._found_sets[query_key] = [rec for rec in self.records if matches(rec)]
+        if not found:
+            return 500, {'messages': [{'code': NO_RECORDS_CODE, 'message': 'No records match the request'}],
+                         'response': {}}
+        offset, limit = int(body.get('offset', 1)), int(body.get('limit', DEFAULT_PAGE_SIZE))
+        page = found[offset - 1:offset - 1 + limit]
+        portals = body.get('portal')
+        data = []
+        for rec in page:
+            portal_data = {
+                name: rows[:int(body.get(f'limit.{name}', len(rows)))]
+                for name, rows in rec['portalData'].items()
+                if portals is None or name in portals
+            }
+            data.append({**rec, 'portalData': portal_data})
+        return 200, {'messages': [{'code': '0', 'message': 'OK'}],
+                     'response': {'dataInfo': {'foundCount': len(found), 'returnedCount': len(data)}, 'data': data}}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _authorized(self):
+                token = self.headers.get('Authorization', '').replace('Bearer ', '')
+                with server._lock:
+                    return token in server.tokens
+
+            def do_POST(self):
+                time.sleep(server.latency)
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if self.path.endswith('/sessions'):
+                    token = f"token-{random.getrandbits(64):x}"
+                    with server._lock:
+                        server.tokens.add(token)
+                    return self._reply(200, {'messages': [{'code': '0', 'message': 'OK'}],
+                                             'response': {'token': token}})
+                if self.path.endswith('/_find'):
+                    if not self._authorized():
+                        return self._reply(401, {'messages': [{'code': '952', 'message': 'Invalid token'}],
+                                                 'response': {}})
+                    with server._lock:
+                        server.find_requests += 1
+                    return self._reply(*server.find(body))
+                self._reply(404, {'messages': [{'code': '3', 'message': 'Unsupported'}], 'response': {}})
+
+            def do_DELETE(self):
+                token = self.path.rsplit('/', 1)[-1]
+                with server._lock:
+                    server.tokens.discard(token)
+                self._reply(200, {'messages': [{'code': '0', 'message': 'OK'}], 'response': {}})
+
+        return Handler
+
+
+def serial_find_all(fetcher: DataAPIFetcher, queries, page_size=DEFAULT_PAGE_SIZE, portals=None):
+    """The offset += page_size loop the reports used before, for comparison."""
+    offset, records = 1, []
+    while True:
+        _, page = fetcher._find_page(queries, offset, page_size, portals)
+        records.extend(page)
+        if len(page) < page_size:
+            return records
+        offset += page_size
+
+
+def benchmark(record_count, latency, sessions, page_size):
+    records = synthetic_collection(record_count)
+    query = [{'ref_collection_id': 'COLL1'}]
+    portals = {'OBJ_ISSUES': {'offset': 1, 'limit': 50}}
+    with MockDataAPIServer(records, latency=latency) as server:
+        print(f"Mock Data API at {server.url}: {record_count:,} records, {latency * 1000:.0f} ms per request")
+
+        with DataAPIFetcher(server.url, 'AMI', 'OBJECTS', 'user', 'pass', sessions=1) as serial:
+            start = time.perf_counter()
+            expected = serial_find_all(serial, query, page_size, portals)
+            serial_seconds = time.perf_counter() - start
+
+        with DataAPIFetcher(server.url, 'AMI', 'OBJECTS', 'user', 'pass', sessions=sessions) as fetcher:
+            start = time.perf_counter()
+            fetched = fetcher.find_all(query, page_size, portals)
+            concurrent_seconds = time.perf_counter() - start
+
+    assert fetched == expected, "concurrent fetch returned different records"
+    print(f"  serial pagination:           {serial_seconds:7.2f} s")
+    print(f"  concurrent ({sessions} sessions):     {concurrent_seconds:7.2f} s "
+          f"({serial_seconds / max(concurrent_seconds, 1e-9):.1f}x faster, {len(fetched):,} identical records)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent Data API pagination against a local mock server.')
+    parser.add_argument('--records', type=int, default=50000, help='Synthetic collection size (default: 50000).')
+    parser.add_argument('--latency', type=float, default=0.02, help='Simulated seconds per request (default: 0.02).')
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS, help=f'Concurrent sessions (default: {DEFAULT_SESSIONS}).')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help=f'Records per page (default: {DEFAULT_PAGE_SIZE}).')
+    args = parser.parse_args()
+    benchmark(args.records, args.latency, args.sessions, args.page_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -54,8 +54,12 @@ import os
 import shutil
 import json
 import re
+import threading
+import time
 from pymediainfo import MediaInfo
 from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 CATEGORIES = {
     "NTSC DVD SD (D1 Resolution)": {
@@ -130,6 +134,14 @@ CATEGORIES = {
     },
 }
 
+OCR_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_RIP_JOBS = 1
+DEFAULT_ENCODE_JOBS = max(1, (os.cpu_count() or 4) // 4)
+PROBE_WORKERS = min(8, os.cpu_count() or 1)
+PROPERTIES_CACHE_PATH = Path(
+    os.environ.get("AMI_MP4_PROPERTIES_CACHE", Path.home() / ".ami_mp4_properties_cache.json")
+)
+
 NON_LATIN_LANGS = {"chi", "zho", "jpn", "kor"}
 
 SUBTILE_LANG_MAP = {
@@ -169,6 +181,19 @@ COMMON_ENGLISH_WORDS = {
     "kill", "might", "feel", "write", "white", "hate", "gonna", "drawin"
 }
 
+# Plausibility scoring runs on every OCR'd track, so patterns and script tables are built once
+LATIN_TOKEN_RE = re.compile(r"[A-Za-z']+")
+LOWER_TOKEN_RE = re.compile(r"[a-z']+")
+ACCENTED_TOKEN_RE = re.compile(r"[A-Za-zÀ-ÿ']+")
+VOWEL_RE = re.compile(r"[aeiouy]")
+TWO_VOWELS_RE = re.compile(r"[aeiou].*[aeiou]")
+ACCENTED_VOWEL_RE = re.compile(r"[aeiouyà-ÿ]")
+TWO_ACCENTED_VOWELS_RE = re.compile(r"[aeiouyà-ÿ].*[aeiouyà-ÿ]")
+
+HAN_RANGES = ((0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF))
+KANA_RANGES = ((0x3040, 0x309F), (0x30A0, 0x30FF))
+HANGUL_RANGES = ((0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF))
+
 SUBTILE_OCR_INSTALL_MSG = """
 Required command 'subtile-ocr' not found in PATH.
 
@@ -200,6 +225,11 @@ except ImportError:
     print("colorama is not installed. Please install it by running: python3 -m pip install colorama")
     sys.exit(1)
 
+try:
+    from ami_scripts.stage_timer import StageTimer
+except ImportError:
+    from stage_timer import StageTimer
+
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 
@@ -274,11 +304,19 @@ def process_iso_with_makemkv(iso_path, output_directory):
         return None
 
 
-def build_ffmpeg_command(input_file, output_file, srt_files=None):
+def build_ffmpeg_command(input_file, output_file, srt_files=None, concat_list=False, threads=None, quiet=False):
     if srt_files is None:
         srt_files = []
 
-    ffmpeg_command = ["ffmpeg", "-i", str(input_file)]
+    ffmpeg_command = ["ffmpeg"]
+    if quiet:
+        # Several encodes share the terminal in pipeline mode; only report errors
+        ffmpeg_command.extend(["-hide_banner", "-nostats", "-loglevel", "error"])
+    if concat_list:
+        # input_file lists the title MKVs for the concat demuxer; they are read in sequence, nothing is written first
+        ffmpeg_command.extend(["-f", "concat", "-safe", "0", "-i", str(input_file)])
+    else:
+        ffmpeg_command.extend(["-i", str(input_file)])
     ffmpeg_command.extend([
         "-c:v", "libx264",
         "-movflags", "faststart",
@@ -290,6 +328,8 @@ def build_ffmpeg_command(input_file, output_file, srt_files=None):
         "-ar", "48000"
     ])
     ffmpeg_command.extend(["-map", "0:v", "-map", "0:a"])
+    if threads:
+        ffmpeg_command.extend(["-threads", str(threads)])
     ffmpeg_command.append(str(output_file))
     return ffmpeg_command
 
@@ -373,19 +413,17 @@ def strip_srt_structure(text):
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=None)
+def _range_class(ranges):
+    return re.compile("[" + "".join(f"{re.escape(chr(start))}-{re.escape(chr(end))}" for start, end in ranges) + "]")
+
+
 def count_chars_in_ranges(text, ranges):
-    total = 0
-    for ch in text:
-        cp = ord(ch)
-        for start, end in ranges:
-            if start <= cp <= end:
-                total += 1
-                break
-    return total
+    return len(_range_class(tuple(tuple(r) for r in ranges)).findall(text))
 
 
 def _alpha_tokens_with_case(text):
-    return re.findall(r"[A-Za-z']+", text)
+    return LATIN_TOKEN_RE.findall(text)
 
 
 def _looks_gibberish_line(line):
@@ -396,8 +434,8 @@ def _looks_gibberish_line(line):
     lower_tokens = [t.lower() for t in tokens]
     common_hits = sum(1 for t in lower_tokens if t in COMMON_ENGLISH_WORDS)
     uppercaseish = sum(1 for t in tokens if len(t) >= 4 and t.upper() == t)
-    weird = sum(1 for t in lower_tokens if len(t) >= 7 and not re.search(r"[aeiou].*[aeiou]", t))
-    vowelish = sum(1 for t in lower_tokens if re.search(r"[aeiouy]", t))
+    weird = sum(1 for t in lower_tokens if len(t) >= 7 and not TWO_VOWELS_RE.search(t))
+    vowelish = sum(1 for t in lower_tokens if VOWEL_RE.search(t))
 
     upper_ratio = uppercaseish / len(tokens)
     weird_ratio = weird / len(tokens)
@@ -409,7 +447,7 @@ def _looks_gibberish_line(line):
 def english_text_plausibility(text, strict=False):
     cleaned = strip_srt_structure(text)
     lower_cleaned = cleaned.lower()
-    tokens = re.findall(r"[a-z']+", lower_cleaned)
+    tokens = LOWER_TOKEN_RE.findall(lower_cleaned)
 
     if len(tokens) < 4:
         return False
@@ -417,17 +455,17 @@ def english_text_plausibility(text, strict=False):
     common_hits = sum(1 for t in tokens if t in COMMON_ENGLISH_WORDS)
     common_ratio = common_hits / len(tokens)
 
-    vowelish = sum(1 for t in tokens if re.search(r"[aeiouy]", t))
+    vowelish = sum(1 for t in tokens if VOWEL_RE.search(t))
     vowel_ratio = vowelish / len(tokens)
 
     weird_tokens = sum(
         1 for t in tokens
-        if len(t) >= 8 and not re.search(r"[aeiou].*[aeiou]", t)
+        if len(t) >= 8 and not TWO_VOWELS_RE.search(t)
     )
     weird_ratio = weird_tokens / len(tokens)
 
     text_lines = [ln.strip() for ln in cleaned.splitlines() if ln.strip()]
-    substantive_lines = [ln for ln in text_lines if len(re.findall(r"[A-Za-z']+", ln)) >= 2]
+    substantive_lines = [ln for ln in text_lines if len(LATIN_TOKEN_RE.findall(ln)) >= 2]
     gibberish_lines = sum(1 for ln in substantive_lines if _looks_gibberish_line(ln))
     gibberish_ratio = gibberish_lines / max(len(substantive_lines), 1)
 
@@ -452,16 +490,16 @@ def latin_text_plausibility(text):
     if len(visible) < 25:
         return False
 
-    tokens = re.findall(r"[A-Za-zÀ-ÿ']+", cleaned)
+    tokens = ACCENTED_TOKEN_RE.findall(cleaned)
     if len(tokens) < 4:
         return False
 
     lower_tokens = [t.lower() for t in tokens]
     common_hits = sum(1 for t in lower_tokens if t in COMMON_LATIN_WORDS)
-    vowelish = sum(1 for t in lower_tokens if re.search(r"[aeiouyà-ÿ]", t))
+    vowelish = sum(1 for t in lower_tokens if ACCENTED_VOWEL_RE.search(t))
     very_weird = sum(
         1 for t in lower_tokens
-        if len(t) >= 8 and not re.search(r"[aeiouyà-ÿ].*[aeiouyà-ÿ]", t)
+        if len(t) >= 8 and not TWO_ACCENTED_VOWELS_RE.search(t)
     )
 
     common_ratio = common_hits / max(len(lower_tokens), 1)
@@ -479,27 +517,13 @@ def latin_text_plausibility(text):
 def script_matches_expected_lang(text, lang):
     cleaned = strip_srt_structure(text)
 
-    han_count = count_chars_in_ranges(cleaned, [
-        (0x3400, 0x4DBF),
-        (0x4E00, 0x9FFF),
-        (0xF900, 0xFAFF),
-    ])
-    hira_kata_count = count_chars_in_ranges(cleaned, [
-        (0x3040, 0x309F),
-        (0x30A0, 0x30FF),
-    ])
-    hangul_count = count_chars_in_ranges(cleaned, [
-        (0x1100, 0x11FF),
-        (0x3130, 0x318F),
-        (0xAC00, 0xD7AF),
-    ])
-
+    # Only the scripts the expected language needs are counted
     if lang in HAN_LANGS:
-        return han_count >= 10
+        return count_chars_in_ranges(cleaned, HAN_RANGES) >= 10
     if lang in JP_LANGS:
-        return (hira_kata_count >= 5) or (han_count >= 10)
+        return count_chars_in_ranges(cleaned, KANA_RANGES) >= 5 or count_chars_in_ranges(cleaned, HAN_RANGES) >= 10
     if lang in KR_LANGS:
-        return hangul_count >= 10
+        return count_chars_in_ranges(cleaned, HANGUL_RANGES) >= 10
     if lang == "eng":
         return english_text_plausibility(cleaned, strict=False)
     if lang in LATIN_LANGS:
@@ -555,61 +579,33 @@ def move_failed_ocr_outputs(output_dir, final_base_name, track_id, temp_srt, ext
         )
 
 
-def extract_and_ocr(mkv_file, output_dir, final_base_name, bitmap_only=False):
-    sub_tracks = get_subtitle_tracks(mkv_file)
-    generated_srts = []
-
-    if not sub_tracks:
-        logging.info(f"No VobSub tracks found in {mkv_file.name} for extraction.")
-        return generated_srts
-
-    for track in sub_tracks:
-        track_id = track["id"]
-        lang = track["lang"]
-        lang_for_name = normalize_lang_for_filename(lang)
-        subtile_lang = SUBTILE_LANG_MAP.get(lang, "eng")
-
-        logging.info(
-            f"[{mkv_file.name}] Extracting Subtitle Track ID {track_id} "
-            f"(Lang: {lang}, Frames: {track['frames']}, Bytes: {track['bytes']})"
-        )
-
-        extracted_base = output_dir / f"{final_base_name}_track{track_id}_{lang_for_name}"
-        extracted_idx = extracted_base.with_suffix(".idx")
-        extracted_sub = extracted_base.with_suffix(".sub")
-        temp_srt = extracted_base.with_suffix(".srt")
+def set_ocr_workers(workers):
+    """Cap the OCR jobs running at once across every title and track in this process."""
+    global _ocr_slots
+    _ocr_slots = threading.BoundedSemaphore(max(1, workers))
 
-        mkvextract_cmd = [
-            "mkvextract", str(mkv_file), "tracks", f"{track_id}:{extracted_idx}"
-        ]
 
-        try:
-            subprocess.run(mkvextract_cmd, check=True, capture_output=True, text=True)
-        except subprocess.CalledProcessError as e:
-            logging.error(f"mkvextract failed for track ID {track_id}: {e.stderr}")
-            continue
+_ocr_slots = threading.BoundedSemaphore(OCR_WORKERS)
 
-        if not extracted_idx.exists():
-            logging.error(f"mkvextract failed to create .idx for track ID {track_id}")
-            continue
 
-        if not extracted_sub.exists():
-            logging.warning(
-                f"Expected companion .sub file was not found for track ID {track_id}. "
-                f"Check extraction results."
-            )
+def extract_vobsub_tracks(mkv_file, idx_paths):
+    """Extract every requested VobSub track (track ID -> .idx path) in a single mkvextract pass."""
+    cmd = ["mkvextract", str(mkv_file), "tracks"]
+    cmd.extend(f"{track_id}:{idx_path}" for track_id, idx_path in idx_paths.items())
+    try:
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        # Tracks written before the failure are still checked and used individually
+        logging.error(f"mkvextract failed for {mkv_file.name}: {e.stderr}")
 
-        logging.info(
-            f"Extracted bitmap subtitles: {extracted_idx.name}"
-            + (f" and {extracted_sub.name}" if extracted_sub.exists() else "")
-        )
 
-        if bitmap_only:
-            logging.info(
-                f"Skipping OCR for track ID {track_id} because --extract-subs-only is set."
-            )
-            continue
+def ocr_track(track, extracted_idx, temp_srt):
+    """OCR one extracted track with fallbacks and plausibility checks; returns (ok, suspicious, stderr)."""
+    track_id = track["id"]
+    lang = track["lang"]
+    subtile_lang = SUBTILE_LANG_MAP.get(lang, "eng")
 
+    with _ocr_slots:
         if temp_srt.exists():
             temp_srt.unlink()
 
@@ -652,17 +648,78 @@ def extract_and_ocr(mkv_file, output_dir, final_base_name, bitmap_only=False):
             if ok and temp_srt.exists():
                 suspicious = srt_is_suspicious(temp_srt, expected_lang=lang)
 
-        if ok and temp_srt.exists() and lang == "eng" and track.get("duplicate_lang") and used_fallback:
-            try:
-                text = temp_srt.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                text = ""
-            if not english_text_plausibility(text, strict=True):
-                logging.warning(
-                    f"Track {track_id} is a duplicate 'eng' subtitle track that required fallback OCR "
-                    f"and still does not look convincingly English."
-                )
-                suspicious = True
+    if ok and temp_srt.exists() and lang == "eng" and track.get("duplicate_lang") and used_fallback:
+        try:
+            text = temp_srt.read_text(encoding="utf-8", errors="ignore")
+        except Exception:
+            text = ""
+        if not english_text_plausibility(text, strict=True):
+            logging.warning(
+                f"Track {track_id} is a duplicate 'eng' subtitle track that required fallback OCR "
+                f"and still does not look convincingly English."
+            )
+            suspicious = True
+
+    return ok, suspicious, stderr
+
+
+def extract_and_ocr(mkv_file, output_dir, final_base_name, bitmap_only=False):
+    sub_tracks = get_subtitle_tracks(mkv_file)
+    generated_srts = []
+
+    if not sub_tracks:
+        logging.info(f"No VobSub tracks found in {mkv_file.name} for extraction.")
+        return generated_srts
+
+    tracks = []
+    for track in sub_tracks:
+        logging.info(
+            f"[{mkv_file.name}] Extracting Subtitle Track ID {track['id']} "
+            f"(Lang: {track['lang']}, Frames: {track['frames']}, Bytes: {track['bytes']})"
+        )
+        extracted_base = output_dir / f"{final_base_name}_track{track['id']}_{normalize_lang_for_filename(track['lang'])}"
+        tracks.append((track, extracted_base.with_suffix(".idx"), extracted_base.with_suffix(".sub"),
+                       extracted_base.with_suffix(".srt")))
+
+    extract_vobsub_tracks(mkv_file, {track["id"]: extracted_idx for track, extracted_idx, _, _ in tracks})
+
+    extracted = []
+    for track, extracted_idx, extracted_sub, temp_srt in tracks:
+        track_id = track["id"]
+        if not extracted_idx.exists():
+            logging.error(f"mkvextract failed to create .idx for track ID {track_id}")
+            continue
+
+        if not extracted_sub.exists():
+            logging.warning(
+                f"Expected companion .sub file was not found for track ID {track_id}. "
+                f"Check extraction results."
+            )
+
+        logging.info(
+            f"Extracted bitmap subtitles: {extracted_idx.name}"
+            + (f" and {extracted_sub.name}" if extracted_sub.exists() else "")
+        )
+
+        if bitmap_only:
+            logging.info(
+                f"Skipping OCR for track ID {track_id} because --extract-subs-only is set."
+            )
+            continue
+        extracted.append((track, extracted_idx, extracted_sub, temp_srt))
+
+    if not extracted:
+        return generated_srts
+
+    # Tracks OCR concurrently (bounded by the shared OCR slots); results are filed in track order
+    with ThreadPoolExecutor(max_workers=len(extracted)) as executor:
+        futures = [executor.submit(ocr_track, track, extracted_idx, temp_srt)
+                   for track, extracted_idx, _, temp_srt in extracted]
+        outcomes = [future.result() for future in futures]
+
+    for (track, extracted_idx, extracted_sub, temp_srt), (ok, suspicious, stderr) in zip(extracted, outcomes):
+        track_id = track["id"]
+        lang = track["lang"]
 
         if not ok or not temp_srt.exists():
             logging.error(f"OCR failed for track ID {track_id}: {stderr}")
@@ -685,6 +742,7 @@ def extract_and_ocr(mkv_file, output_dir, final_base_name, bitmap_only=False):
             f"({temp_srt.stat().st_size} bytes)."
         )
 
+        lang_for_name = normalize_lang_for_filename(lang)
         final_srt = output_dir / f"{final_base_name}_{lang_for_name}.srt"
         counter = 1
         while final_srt.exists():
@@ -788,6 +846,141 @@ def concatenate_mkvs(mkv_files):
         return None
 
 
+def get_duration_ms(mkv_file):
+    media_info = MediaInfo.parse(str(mkv_file))
+    for track in media_info.tracks:
+        if track.track_type == "General" and track.duration:
+            return float(track.duration)
+    return 0.0
+
+
+def write_concat_list(mkv_files, list_path):
+    with open(list_path, "w", encoding="utf-8") as f:
+        for mkv_file in mkv_files:
+            escaped = str(Path(mkv_file).resolve()).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    return list_path
+
+
+SRT_TIMESTAMP = re.compile(r"(\d{2}):(\d{2}):(\d{2}),(\d{3})")
+
+
+def _shift_timestamp(match, offset_ms):
+    h, m, sec, ms = (int(g) for g in match.groups())
+    total = max(((h * 60 + m) * 60 + sec) * 1000 + ms + offset_ms, 0)
+    h, rem = divmod(int(round(total)), 3600000)
+    m, rem = divmod(rem, 60000)
+    sec, ms = divmod(rem, 1000)
+    return f"{h:02d}:{m:02d}:{sec:02d},{ms:03d}"
+
+
+def merge_srt_parts(parts, output_file):
+    """Join per-title SRTs into one file, shifting each by its (offset_ms) and renumbering cues."""
+    cues = []
+    for srt_path, offset_ms in parts:
+        text = srt_path.read_text(encoding="utf-8", errors="ignore").replace("\r\n", "\n")
+        for block in re.split(r"\n\s*\n", text.strip()):
+            lines = block.splitlines()
+            if lines and lines[0].strip().isdigit():
+                lines = lines[1:]
+            if not lines or "-->" not in lines[0]:
+                continue
+            lines[0] = SRT_TIMESTAMP.sub(lambda m: _shift_timestamp(m, offset_ms), lines[0])
+            cues.append("\n".join(lines))
+    with open(output_file, "w", encoding="utf-8") as f:
+        for number, cue in enumerate(cues, start=1):
+            f.write(f"{number}\n{cue}\n\n")
+    return output_file
+
+
+def ocr_concat_parts(mkv_files, output_directory, final_base_name, bitmap_only=False):
+    """
+    OCR subtitles from each title MKV in parallel, then merge them per language onto the
+    concatenated timeline (each part shifted by the running duration of the titles before it).
+    Returns the merged SRTs and every path written to output_directory.
+    """
+    offsets, elapsed = [], 0.0
+    for mkv_file in mkv_files:
+        offsets.append(elapsed)
+        elapsed += get_duration_ms(mkv_file)
+
+    part_dirs = [Path(tempfile.mkdtemp(prefix=f"{final_base_name}_part{idx:02d}_"))
+                 for idx in range(1, len(mkv_files) + 1)]
+    with ThreadPoolExecutor(max_workers=min(len(mkv_files), OCR_WORKERS)) as executor:
+        futures = [
+            executor.submit(extract_and_ocr, mkv_file, part_dir, f"{final_base_name}_part{idx:02d}",
+                            bitmap_only=bitmap_only)
+            for idx, (mkv_file, part_dir) in enumerate(zip(mkv_files, part_dirs), start=1)
+        ]
+        part_results = [future.result() for future in futures]
+
+    # Tracks are matched across titles by language and order within that language
+    grouped = defaultdict(list)
+    for part_srts, offset_ms in zip(part_results, offsets):
+        seen = defaultdict(int)
+        for srt_path, lang in part_srts:
+            grouped[(lang, seen[lang])].append((srt_path, offset_ms))
+            seen[lang] += 1
+
+    generated_srts = []
+    for (lang, ordinal), parts in grouped.items():
+        lang_for_name = normalize_lang_for_filename(lang)
+        suffix = f"_{ordinal}" if ordinal else ""
+        final_srt = merge_srt_parts(parts, output_directory / f"{final_base_name}_{lang_for_name}{suffix}.srt")
+        logging.info(f"Success -> Merged {len(parts)} title SRT(s) into {final_srt.name}")
+        generated_srts.append((final_srt, lang))
+    written = [srt_path for srt_path, _ in generated_srts]
+
+    # Bitmap subtitles and OCR review outputs are kept next to the MP4, as in per-title mode
+    for part_dir in part_dirs:
+        for leftover in part_dir.iterdir():
+            if leftover.suffix != ".srt" or "_ocr_failed" in leftover.name:
+                moved = output_directory / leftover.name
+                shutil.move(str(leftover), str(moved))
+                written.append(moved)
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+    return generated_srts, written
+
+
+def stream_concat_transcode(mkv_files, output_directory, final_base_name, encode_threads=None):
+    """
+    Transcode the title MKVs as one MP4 through ffmpeg's concat demuxer, OCRing subtitles
+    from the source MKVs at the same time. No concatenated MKV is written.
+    """
+    if not verify_mkv_compatibility(mkv_files):
+        logging.error("MKV files are not compatible for concatenation")
+        return False
+
+    output_file = output_directory / f"{final_base_name}.mp4"
+    list_file = Path(tempfile.mkstemp(suffix=".txt", prefix=f"{final_base_name}_concat_")[1])
+    write_concat_list(mkv_files, list_file)
+    ffmpeg_command = build_ffmpeg_command(list_file, output_file, concat_list=True,
+                                          threads=encode_threads, quiet=bool(encode_threads))
+
+    logging.info(f"Streaming {len(mkv_files)} MKV files into {output_file}")
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ocr_future = executor.submit(ocr_concat_parts, mkv_files, output_directory, final_base_name)
+            transcode = subprocess.run(ffmpeg_command)
+            _generated_srts, ocr_outputs = ocr_future.result()
+    finally:
+        list_file.unlink(missing_ok=True)
+
+    if transcode.returncode != 0:
+        logging.error(f"Streaming concat transcode failed (ffmpeg exit code {transcode.returncode})")
+        output_file.unlink(missing_ok=True)
+        # the fallback OCRs again; leave no subtitle outputs behind for it to duplicate
+        for path in ocr_outputs:
+            path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def title_base_name(iso_basename, idx, title_count):
+    return f"{iso_basename}f01r{str(idx).zfill(2)}_sc" if title_count > 1 else f"{iso_basename}_sc"
+
+
 def transcode_mkv_files(
     mkv_directory,
     iso_basename,
@@ -795,6 +988,8 @@ def transcode_mkv_files(
     force_concat,
     extract_subs_only=False,
     srt_only=False,
+    concat_to_disk=False,
+    encode_threads=None,
 ):
     mkv_files = sorted(mkv_directory.glob("*.mkv"))
     if not mkv_files:
@@ -803,6 +998,10 @@ def transcode_mkv_files(
 
     if force_concat and not (extract_subs_only or srt_only):
         logging.info(f"Found {len(mkv_files)} MKV files to concatenate")
+        if not concat_to_disk:
+            if stream_concat_transcode(mkv_files, output_directory, f"{iso_basename}_sc", encode_threads):
+                return True
+            logging.warning("Streaming concatenation failed, retrying with mkvmerge concatenation")
         concatenated_mkv = concatenate_mkvs(mkv_files)
 
         if concatenated_mkv:
@@ -818,7 +1017,8 @@ def transcode_mkv_files(
 
             logging.info(f"Transcoding concatenated MKV to {output_file}")
             try:
-                ffmpeg_command = build_ffmpeg_command(concatenated_mkv, output_file, _generated_srts)
+                ffmpeg_command = build_ffmpeg_command(concatenated_mkv, output_file, _generated_srts,
+                                                      threads=encode_threads, quiet=bool(encode_threads))
                 subprocess.run(ffmpeg_command, check=True)
                 return True
             except subprocess.CalledProcessError as e:
@@ -836,16 +1036,13 @@ def transcode_mkv_files(
                 force_concat=False,
                 extract_subs_only=extract_subs_only,
                 srt_only=srt_only,
+                encode_threads=encode_threads,
             )
 
     else:
         success = True
         for idx, mkv_file in enumerate(mkv_files, start=1):
-            final_base_name = (
-                f"{iso_basename}f01r{str(idx).zfill(2)}_sc"
-                if len(mkv_files) > 1
-                else f"{iso_basename}_sc"
-            )
+            final_base_name = title_base_name(iso_basename, idx, len(mkv_files))
 
             generated_srts = extract_and_ocr(
                 mkv_file,
@@ -869,7 +1066,8 @@ def transcode_mkv_files(
             output_file = output_directory / f"{final_base_name}.mp4"
             logging.info(f"Transcoding {mkv_file} to {output_file}")
             try:
-                ffmpeg_command = build_ffmpeg_command(mkv_file, output_file, generated_srts)
+                ffmpeg_command = build_ffmpeg_command(mkv_file, output_file, generated_srts,
+                                                      threads=encode_threads, quiet=bool(encode_threads))
                 subprocess.run(ffmpeg_command, check=True)
             except subprocess.CalledProcessError as e:
                 logging.error(f"Transcoding failed for {mkv_file}: {e}")
@@ -878,6 +1076,137 @@ def transcode_mkv_files(
         return success
 
 
+class ISOPipeline:
+    """
+    Staged ISO processing: MakeMKV rips (I/O bound, limited to rip_jobs at once) feed a
+    subtitle OCR pool and an encode pool, so a batch keeps every stage busy instead of
+    taking one ISO end to end at a time. At most rip_jobs + encode_jobs ripped ISOs are
+    in flight, which bounds the temporary disk space used by MKVs waiting to be encoded.
+    """
+
+    def __init__(self, output_directory, force_concat=False, extract_subs_only=False, srt_only=False,
+                 concat_to_disk=False, rip_jobs=DEFAULT_RIP_JOBS, ocr_jobs=OCR_WORKERS,
+                 encode_jobs=DEFAULT_ENCODE_JOBS):
+        self.output_directory = output_directory
+        self.force_concat = force_concat
+        self.extract_subs_only = extract_subs_only
+        self.srt_only = srt_only
+        self.concat_to_disk = concat_to_disk
+        self.rip_jobs = max(1, rip_jobs)
+        self.ocr_jobs = max(1, ocr_jobs)
+        set_ocr_workers(self.ocr_jobs)
+        self.encode_jobs = max(1, encode_jobs)
+        # Split the cores between concurrent x264 encodes (ffmpeg's own default when encoding one at a time)
+        self.encode_threads = max(1, (os.cpu_count() or 1) // self.encode_jobs) if self.encode_jobs > 1 else None
+        self.rip_slots = threading.Semaphore(self.rip_jobs)
+        self.timer = StageTimer()
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._total = 0
+
+    def _stage(self, name, func, *args, **kwargs):
+        with self.timer.stage(name):
+            return func(*args, **kwargs)
+
+    def _encode(self, mkv_file, output_file):
+        logging.info(f"Transcoding {mkv_file} to {output_file}")
+        try:
+            subprocess.run(build_ffmpeg_command(mkv_file, output_file, threads=self.encode_threads,
+                                                quiet=self.encode_jobs > 1), check=True)
+            return True
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Transcoding failed for {mkv_file}: {e}")
+            return False
+
+    def _process_titles(self, mkv_directory, iso_basename, ocr_pool, encode_pool):
+        subs_only = self.extract_subs_only or self.srt_only
+        if self.force_concat and not subs_only:
+            # OCR and encode of a concatenated title already overlap inside transcode_mkv_files
+            return encode_pool.submit(
+                self._stage, "encode", transcode_mkv_files, mkv_directory, iso_basename,
+                self.output_directory, True, concat_to_disk=self.concat_to_disk,
+                encode_threads=self.encode_threads,
+            ).result()
+
+        mkv_files = sorted(mkv_directory.glob("*.mkv"))
+        if not mkv_files:
+            logging.error(f"No MKV files found in {mkv_directory}")
+            return False
+
+        futures = []
+        for idx, mkv_file in enumerate(mkv_files, start=1):
+            final_base_name = title_base_name(iso_basename, idx, len(mkv_files))
+            futures.append(ocr_pool.submit(
+                self._stage, "ocr", extract_and_ocr, mkv_file, self.output_directory, final_base_name,
+                bitmap_only=self.extract_subs_only,
+            ))
+            if not subs_only:
+                # Subtitles are sidecar files, so the encode does not wait for OCR
+                output_file = self.output_directory / f"{final_base_name}.mp4"
+                futures.append(encode_pool.submit(self._stage, "encode", self._encode, mkv_file, output_file))
+
+        # OCR results are lists of SRTs; only encode results can fail the ISO
+        return all(result for result in (future.result() for future in futures) if isinstance(result, bool))
+
+    def _process_iso(self, iso_file, ocr_pool, encode_pool):
+        iso_basename = iso_file.stem.replace("_pm", "")
+        with self.rip_slots:
+            start = time.perf_counter()
+            mkv_output_dir = self._stage("rip", process_iso_with_makemkv, iso_file, self.output_directory)
+        rip_seconds = time.perf_counter() - start
+
+        if not mkv_output_dir:
+            success = None
+        else:
+            try:
+                success = self._process_titles(mkv_output_dir, iso_basename, ocr_pool, encode_pool)
+            finally:
+                shutil.rmtree(mkv_output_dir, ignore_errors=True)
+
+        with self._lock:
+            self._completed += 1
+            logging.info(
+                f"[{self._completed}/{self._total}] {iso_file.name}: "
+                f"{'rip failed' if success is None else 'done' if success else 'failed'} "
+                f"(rip {rip_seconds:.0f}s, total {time.perf_counter() - start:.0f}s)"
+            )
+        return success
+
+    def run(self, iso_files):
+        """Process all ISOs; returns (processed ISO paths, MakeMKV failures) in input order."""
+        self._total = len(iso_files)
+        results = {}
+        start = time.perf_counter()
+        logging.info(
+            f"Pipeline: {self.rip_jobs} rip job(s), {self.ocr_jobs} OCR worker(s), {self.encode_jobs} encode job(s)"
+            + (f" x {self.encode_threads} threads" if self.encode_threads else "")
+        )
+        with ThreadPoolExecutor(max_workers=self.ocr_jobs) as ocr_pool, \
+                ThreadPoolExecutor(max_workers=self.encode_jobs) as encode_pool, \
+                ThreadPoolExecutor(max_workers=self.rip_jobs + self.encode_jobs) as iso_pool:
+            futures = {iso_pool.submit(self._process_iso, iso_file, ocr_pool, encode_pool): iso_file
+                       for iso_file in iso_files}
+            for future in as_completed(futures):
+                iso_file = futures[future]
+                try:
+                    results[iso_file] = future.result()
+                except Exception as e:
+                    logging.error(f"Unexpected error processing {iso_file}: {e}")
+                    results[iso_file] = False
+
+        processed_iso_paths, make_mkv_failures = [], []
+        for iso_file in iso_files:
+            if results[iso_file] is None:
+                logging.error(f"MakeMKV processing failed for {iso_file}.")
+                make_mkv_failures.append(iso_file)
+            elif results[iso_file]:
+                processed_iso_paths.append(iso_file)
+            else:
+                logging.error(f"Skipping verification for {iso_file} due to processing failure.")
+        self.timer.log_summary(time.perf_counter() - start)
+        return processed_iso_paths, make_mkv_failures
+
+
 def verify_transcoding(iso_paths, make_mkv_failures, output_directory):
     total_isos = len(iso_paths) + len(make_mkv_failures)
     successful_isos = []
@@ -910,6 +1239,78 @@ def verify_transcoding(iso_paths, make_mkv_failures, output_directory):
             print(f" - {iso}")
 
 
+CATEGORY_FIELDS = ("Width", "Height", "DisplayAspectRatio", "PixelAspectRatio", "FrameRate")
+
+
+def _normalize_property(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return str(value)
+
+
+def category_key(properties):
+    return tuple(_normalize_property(properties.get(field)) for field in CATEGORY_FIELDS)
+
+
+def build_category_lookup(categories):
+    """Map each category's normalized (width, height, DAR, PAR, frame rate) to its name; the first listed wins."""
+    lookup = {}
+    for category, criteria in categories.items():
+        lookup.setdefault(category_key(criteria), category)
+    return lookup
+
+
+CATEGORY_LOOKUP = build_category_lookup(CATEGORIES)
+
+
+class PropertiesCache:
+    """
+    MediaInfo video properties of checked MP4s, kept in a JSON file between runs and
+    reused while a file's size and modification time are unchanged.
+    """
+
+    def __init__(self, path=PROPERTIES_CACHE_PATH):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    @staticmethod
+    def _identity(file_path):
+        stat = os.stat(file_path)
+        return str(Path(file_path).resolve()), [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, file_path):
+        """Return (found, properties) for a file."""
+        key, identity = self._identity(file_path)
+        entry = self.entries.get(key)
+        if entry is not None and entry["identity"] == identity:
+            self.hits += 1
+            return True, entry["properties"]
+        self.misses += 1
+        return False, None
+
+    def put(self, file_path, properties):
+        key, identity = self._identity(file_path)
+        self.entries[key] = {"identity": identity, "properties": properties}
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logging.warning(f"Could not save MediaInfo cache {self.path}: {e}")
+
+
 def extract_video_properties(file_path):
     media_info = MediaInfo.parse(file_path)
     for track in media_info.tracks:
@@ -924,39 +1325,50 @@ def extract_video_properties(file_path):
     return None
 
 
-def classify_mp4(mp4_files):
+def probe_video_properties(files, workers=PROBE_WORKERS, cache=None):
+    """Video properties for each file; cache misses are probed with MediaInfo on a thread pool."""
+    properties = {}
+    to_probe = []
+    for file in files:
+        found, cached = cache.get(file) if cache is not None else (False, None)
+        if found:
+            properties[file] = cached
+        else:
+            to_probe.append(file)
+
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(to_probe)))) as executor:
+            futures = {executor.submit(extract_video_properties, file): file for file in to_probe}
+            for future in as_completed(futures):
+                file = futures[future]
+                try:
+                    properties[file] = future.result()
+                except Exception as e:
+                    logging.error(f"MediaInfo could not read {file}: {e}")
+                    properties[file] = None
+                    continue
+                if cache is not None:
+                    cache.put(file, properties[file])
+
+    return properties
+
+
+def classify_mp4(mp4_files, workers=PROBE_WORKERS, cache=None):
     classification_counts = defaultdict(int)
     outliers = []
 
+    properties_by_file = probe_video_properties(mp4_files, workers=workers, cache=cache)
     for file in mp4_files:
-        properties = extract_video_properties(file)
+        properties = properties_by_file.get(file)
         if not properties:
             outliers.append(file)
             continue
 
-        classified = False
-        for category, criteria in CATEGORIES.items():
-            match = True
-            for key, value in criteria.items():
-                prop_val = properties.get(key)
-                if prop_val is None:
-                    match = False
-                    break
-                try:
-                    if float(prop_val) != float(value):
-                        match = False
-                        break
-                except (ValueError, TypeError):
-                    if str(prop_val) != str(value):
-                        match = False
-                        break
-            if match:
-                classification_counts[category] += 1
-                classified = True
-                break
-
-        if not classified:
+        category = CATEGORY_LOOKUP.get(category_key(properties))
+        if category is None:
             outliers.append(file)
+        else:
+            classification_counts[category] += 1
 
     return classification_counts, outliers
 
@@ -974,9 +1386,12 @@ def summarize_classifications(classification_counts, outliers):
         print("None")
 
 
-def post_process_check(output_directory):
+def post_process_check(output_directory, workers=PROBE_WORKERS):
     mp4_files = list(Path(output_directory).glob("*.mp4"))
-    classification_counts, outliers = classify_mp4(mp4_files)
+    cache = PropertiesCache()
+    classification_counts, outliers = classify_mp4(mp4_files, workers=workers, cache=cache)
+    cache.save()
+    logging.info(f"MediaInfo: {cache.misses} MP4(s) probed, {cache.hits} reused from {cache.path}")
     summarize_classifications(classification_counts, outliers)
 
 
@@ -1019,6 +1434,15 @@ def main():
                         help="Output directory for MP4 and subtitle files")
     parser.add_argument("-f", "--force", action="store_true",
                         help="Force concatenation of MKV files before transcoding")
+    parser.add_argument("--concat-to-disk", action="store_true",
+                        help="With -f, concatenate with mkvmerge into a temporary MKV before transcoding "
+                             "instead of streaming the titles through ffmpeg's concat demuxer")
+    parser.add_argument("--rip-jobs", type=int, default=DEFAULT_RIP_JOBS,
+                        help=f"ISOs ripped by MakeMKV at the same time (default: {DEFAULT_RIP_JOBS})")
+    parser.add_argument("--ocr-jobs", type=int, default=OCR_WORKERS,
+                        help=f"Subtitle tracks OCR'd at once, across all titles (default: {OCR_WORKERS})")
+    parser.add_argument("--encode-jobs", type=int, default=DEFAULT_ENCODE_JOBS,
+                        help=f"Concurrent ffmpeg encodes; cores are split between them (default: {DEFAULT_ENCODE_JOBS})")
     parser.add_argument("--extract-subs-only", action="store_true",
                         help="Extract bitmap subtitle tracks only (.idx/.sub); skip OCR and MP4 transcoding")
     parser.add_argument("--srt-only", action="store_true",
@@ -1038,33 +1462,17 @@ def main():
     output_directory.mkdir(parents=True, exist_ok=True)
 
     iso_files = [file for file in sorted(input_directory.glob("*.iso")) if not file.name.startswith("._")]
-    processed_iso_paths = []
-    make_mkv_failures = []
-
-    for iso_file in iso_files:
-        iso_basename = iso_file.stem.replace("_pm", "")
-        mkv_output_dir = process_iso_with_makemkv(iso_file, output_directory)
-
-        if mkv_output_dir:
-            transcode_success = transcode_mkv_files(
-                mkv_output_dir,
-                iso_basename,
-                output_directory,
-                args.force,
-                extract_subs_only=args.extract_subs_only,
-                srt_only=args.srt_only,
-            )
-            if transcode_success:
-                processed_iso_paths.append(iso_file)
-            else:
-                logging.error(f"Skipping verification for {iso_file} due to processing failure.")
-
-            for mkv_file in mkv_output_dir.glob("*.mkv"):
-                mkv_file.unlink()
-            mkv_output_dir.rmdir()
-        else:
-            logging.error(f"MakeMKV processing failed for {iso_file}.")
-            make_mkv_failures.append(iso_file)
+    pipeline = ISOPipeline(
+        output_directory,
+        force_concat=args.force,
+        extract_subs_only=args.extract_subs_only,
+        srt_only=args.srt_only,
+        concat_to_disk=args.concat_to_disk,
+        rip_jobs=args.rip_jobs,
+        ocr_jobs=args.ocr_jobs,
+        encode_jobs=args.encode_jobs,
+    )
+    processed_iso_paths, make_mkv_failures = pipeline.run(iso_files)
 
     if args.extract_subs_only:
         print(f"\n{Style.BRIGHT}Subtitle Extraction Summary:{Style.RESET_ALL}")
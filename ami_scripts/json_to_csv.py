@@ -1,48 +1,225 @@
 #!/usr/bin/env python3
-import pandas as pd
 import os
+import csv
 import json
 import argparse
-from pandas import json_normalize  # for flattening the json file
 from pathlib import Path
 from multiprocessing import Pool, cpu_count
 
+DEFAULT_BATCH_SIZE = 5000
+
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('-s', '--source', required=True, help='Source directory containing JSON files')
-    parser.add_argument('-d', '--destination', required=True, help='Destination CSV file')
+    parser.add_argument('-d', '--destination', required=True, help='Destination CSV file (or .parquet file)')
+    parser.add_argument('-j', '--jobs', type=int, default=cpu_count(), help='Worker processes (default: all cores)')
+    parser.add_argument('-b', '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Rows held in memory before each write (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help='Append rows only for JSON files added since the last run; rewrite if files changed (CSV only)')
     return parser.parse_args()
 
-def read_json(file):
+def flatten(obj, prefix=''):
+    """Flatten nested dicts into dotted keys, in the same column order as pd.json_normalize."""
+    flat = {}
+    nested = []
+    for key, value in obj.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            # json_normalize moves top-level dicts after the scalars but keeps nested levels in order
+            if prefix:
+                flat.update(flatten(value, name))
+            else:
+                nested.append((name, value))
+        else:
+            flat[name] = value
+    for name, value in nested:
+        flat.update(flatten(value, name))
+    return flat
+
+def read_records(file):
+    """Return the flattened records (one per object) in a JSON file."""
     try:
         with open(file, 'r', encoding='utf-8-sig') as f:
             data = json.load(f)
-
-        # Normalize and flatten the json
-        df = pd.json_normalize(data)
-
-        return df
     except json.JSONDecodeError:
         print(f"Could not decode JSON from file: {file}")
-        return pd.DataFrame()  # return empty DataFrame for problematic files
+        return []
+    items = data if isinstance(data, list) else [data]
+    return [flatten(item) for item in items if isinstance(item, dict)]
+
+def value_kind(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    return 'string'
+
+def scan_schema(file):
+    """Column names and value kinds found in one file (no values are kept)."""
+    schema = {}
+    for record in read_records(file):
+        for key, value in record.items():
+            kinds = schema.setdefault(key, set())
+            kind = value_kind(value)
+            if kind:
+                kinds.add(kind)
+    return schema
+
+def build_schema(json_files, pool):
+    """Union of all columns, in order of first appearance, with their value kinds."""
+    schema = {}
+    for file_schema in pool.imap(scan_schema, json_files, chunksize=64):
+        for key, kinds in file_schema.items():
+            schema.setdefault(key, set()).update(kinds)
+    return schema
+
+def column_type(kinds):
+    if kinds == {'bool'}:
+        return 'bool'
+    if kinds == {'int'}:
+        return 'int'
+    if kinds and kinds <= {'int', 'float'}:
+        return 'float'
+    return 'string'
+
+def csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, dict)):
+        return str(value)
+    return value
+
+class CSVBatchWriter:
+    def __init__(self, path, columns, append=False):
+        self.file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file, lineterminator='\n')
+        self.columns = columns
+        if not append:
+            self.writer.writerow(columns)
+
+    def write(self, records):
+        self.writer.writerows([csv_cell(r.get(c)) for c in self.columns] for r in records)
+
+    def close(self):
+        self.file.close()
+
+class ParquetBatchWriter:
+    def __init__(self, path, columns, schema):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: python3 -m pip install pyarrow")
+        self.pa = pa
+        arrow_types = {'bool': pa.bool_(), 'int': pa.int64(), 'float': pa.float64(), 'string': pa.string()}
+        self.types = {c: column_type(schema[c]) for c in columns}
+        self.schema = pa.schema([(c, arrow_types[self.types[c]]) for c in columns])
+        self.writer = pq.ParquetWriter(str(path), self.schema)
+
+    def _cell(self, column, value):
+        if value is None:
+            return None
+        kind = self.types[column]
+        if kind == 'float':
+            return float(value)
+        if kind == 'string' and not isinstance(value, str):
+            return str(value)
+        return value
+
+    def write(self, records):
+        arrays = {c: [self._cell(c, r.get(c)) for r in records] for c in self.schema.names}
+        self.writer.write_table(self.pa.Table.from_pydict(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+def file_state(file):
+    stat = os.stat(file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def state_path(destination):
+    return destination.with_name(destination.name + '.state.json')
+
+def load_state(destination):
+    path = state_path(destination)
+    if not destination.exists() or not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_state(destination, columns, files):
+    path = state_path(destination)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'columns': columns, 'files': files}, f)
+    os.replace(tmp, path)
 
+def convert(json_files, writer, pool, batch_size):
+    """Flatten files in worker processes and write them in batches of about batch_size rows."""
+    batch = []
+    rows = 0
+    for records in pool.imap(read_records, json_files, chunksize=64):
+        batch.extend(records)
+        if len(batch) >= batch_size:
+            writer.write(batch)
+            rows += len(batch)
+            batch = []
+    if batch:
+        writer.write(batch)
+        rows += len(batch)
+    return rows
 
 def main():
     args = parse_args()
     source_dir = Path(args.source)
     destination_file = Path(args.destination)
+    parquet = destination_file.suffix.lower() == '.parquet'
+    if args.incremental and parquet:
+        raise SystemExit("--incremental is only supported for CSV output")
 
-    json_files = list(source_dir.rglob('*.json'))
+    json_files = sorted(source_dir.rglob('*.json'))
+    current = {str(f): file_state(f) for f in json_files}
 
-    # Use a Pool of processes to read the JSON files into DataFrames
-    with Pool(processes=cpu_count()) as pool:
-        df_list = pool.map(read_json, json_files)
+    with Pool(processes=max(1, args.jobs)) as pool:
+        state = load_state(destination_file) if args.incremental else None
+        if state is not None:
+            added = [f for f in json_files if str(f) not in state['files']]
+            # Rows already written for an edited or deleted file cannot be replaced in place
+            modified = [f for f, seen in state['files'].items() if current.get(f) != seen]
+            schema = build_schema(added, pool)
+            new_columns = [c for c in schema if c not in state['columns']]
+            if not modified and not new_columns:
+                writer = CSVBatchWriter(destination_file, state['columns'], append=True)
+                try:
+                    rows = convert(added, writer, pool, args.batch_size)
+                finally:
+                    writer.close()
+                save_state(destination_file, state['columns'], current)
+                print(f"Appended {rows} rows from {len(added)} new JSON files to {destination_file}")
+                return
+            reason = f"{len(modified)} changed or removed JSON files" if modified else f"{len(new_columns)} new columns"
+            print(f"{reason} found; rewriting {destination_file}")
 
-    # Concatenate all dataframes into one
-    df = pd.concat(df_list, ignore_index=True)
+        # Pass 1 collects the column schema, pass 2 streams the rows
+        schema = build_schema(json_files, pool)
+        columns = list(schema)
+        if parquet:
+            writer = ParquetBatchWriter(destination_file, columns, schema)
+        else:
+            writer = CSVBatchWriter(destination_file, columns)
+        try:
+            rows = convert(json_files, writer, pool, args.batch_size)
+        finally:
+            writer.close()
 
-    # Write the dataframe to a csv file
-    df.to_csv(destination_file, index=False)
+    if args.incremental:
+        save_state(destination_file, columns, current)
+    print(f"Wrote {rows} rows x {len(columns)} columns from {len(json_files)} JSON files to {destination_file}")
 
 if __name__ == "__main__":
     main()
@@ -7,10 +7,20 @@ import pandas as pd
 import json
 import re
 import subprocess
+import time
 from tqdm import tqdm
 import xml.etree.ElementTree as ET
 from collections import Counter
 
+try:
+    from ami_scripts.conformance_store import (
+        ConformanceStore, DEFAULT_STORE_PATH, modified_since, parse_since, policy_hash
+    )
+except ImportError:
+    from conformance_store import (
+        ConformanceStore, DEFAULT_STORE_PATH, modified_since, parse_since, policy_hash
+    )
+
 # New MediaConch policies:
 # AUDIO_ANALOG = 'MediaConch_NYPL-FLAC_Analog.xml' # to do (old)
 # AUDIO_DIGITAL = 'MediaConch_NYPL-FLAC_Digital.xml' # to do (old)
@@ -44,6 +54,8 @@ VIDEO_SC_HDV = '2024_video_SC_opt.xml' # to do
 VIDEO_SC_OPT = '2024_video_SC_opt.xml' # in progress
 
 LOGGER = logging.getLogger(__name__)
+TOOL_NAME = 'mediaconch_checker'
+TIMEOUT_PREFIX = 'Command timed out'
 
 def _configure_logging():
     logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
@@ -102,6 +114,15 @@ def parse_args():
     parser.add_argument('--flex', # rename?
                         help="Relax film policies' audio rules (else strict silent/sound)",
                         action='store_true')
+    parser.add_argument('--store',
+                        default=str(DEFAULT_STORE_PATH),
+                        help=f'Path to the local result store (default: {DEFAULT_STORE_PATH})')
+    parser.add_argument('--no-cache',
+                        help='Re-run MediaConch on every asset and ignore the result store',
+                        action='store_true')
+    parser.add_argument('--since',
+                        help="Only check assets modified since YYYY-MM-DD[THH:MM], "
+                        "or 'last' for the previous run")
     return parser.parse_args()
 
 def get_asset_paths(dir_path):
@@ -213,7 +234,23 @@ def run_command(command):
         process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=seconds, text=True)
         return process.stdout
     except subprocess.TimeoutExpired:
-        return f'Command timed out after {seconds} seconds'
+        return f'{TIMEOUT_PREFIX} after {seconds} seconds'
+
+def policy_key(policy, p_dir, flag):
+    # None (missing policy file) keeps the store out of it; MediaConch reports the error per file
+    digest = policy_hash(p_dir.joinpath(policy))
+    return f'{digest}:f{flag}' if digest else None
+
+def run_cached_command(asset_path, command, key, store):
+    use_store = store and key
+    if use_store:
+        output = store.lookup(asset_path, key)
+        if output is not None:
+            return output
+    output = run_command(command)
+    if use_store and not output.startswith(TIMEOUT_PREFIX):
+        store.record(asset_path, key, output)
+    return output
     
 def describe_asset(jvals, policy):
     return (f'{" -- ". join(jvals)} (policy = {policy})')
@@ -316,11 +353,19 @@ def summarize(asset_count, inelig_count, elig_count, outcome_list):
 def main():
     _configure_logging()
     args = parse_args()
+    started_at = time.time()
+    store = None if args.no_cache else ConformanceStore(args.store)
+    try:
+        since_ts = parse_since(args.since, store, TOOL_NAME)
+    except ValueError as e:
+        exit(f'\nERROR - {e}\n')
+    if args.since == 'last' and since_ts is None:
+        LOGGER.info('No previous run recorded; checking all assets')
     cols = ['asset_path', 'json_values', 'policy', 'description', 'command', 'output', 'result', 'outcome']
     df = pd.DataFrame(columns=cols)
 
     print('\nSearching for AMI assets...')
-    df.asset_path = get_asset_paths(args.ami_directory)
+    df.asset_path = [x for x in get_asset_paths(args.ami_directory) if modified_since(x, since_ts)]
     asset_count = len(df)
 
     if asset_count > 0:
@@ -342,8 +387,15 @@ def main():
     
     if elig_count > 0:
         df.command = [build_command(x.asset_path, x.policy, args.policies_dir, args.formatter) for x in df.itertuples()]
+        if store:
+            keys = [policy_key(x, args.policies_dir, args.formatter) for x in df.policy]
+        else:
+            keys = [None] * elig_count
         print('\nRunning MediaConch commands in subprocess...')
-        df.output = [run_command(x) for x in tqdm(df.command)]
+        df.output = [run_cached_command(x.asset_path, x.command, key, store)
+                     for x, key in zip(tqdm(list(df.itertuples())), keys)]
+        if store:
+            print(f'Result store: {store.hits} cached, {store.misses} checked')
         vb = set_verbosity(args.verbosity)
         if args.formatter == 'x':
             df.result = [format_xml_result(x.asset_path, x.output, vb) for x in df.itertuples()]
@@ -356,6 +408,9 @@ def main():
     print(f'\n\nSummary for {args.ami_directory}:')
     summarize(asset_count, inelig_count, elig_count, df.outcome.tolist())
     print()
+    if store:
+        store.mark_run(TOOL_NAME, started_at)
+        store.close()
 
 if __name__ == "__main__":
     main()
@@ -3,8 +3,23 @@ import argparse
 import subprocess
 import os
 import re
+import sys
+import time
 from pathlib import Path
 
+try:
+    from ami_scripts.conformance_store import (
+        ConformanceStore, DEFAULT_STORE_PATH, IMPLEMENTATION_POLICY,
+        modified_since, parse_since
+    )
+except ImportError:
+    from conformance_store import (
+        ConformanceStore, DEFAULT_STORE_PATH, IMPLEMENTATION_POLICY,
+        modified_since, parse_since
+    )
+
+TOOL_NAME = "mkv_conformance_checker"
+
 def run_mediaconch(file_path):
     """Run MediaConch on a file and return the output."""
     try:
@@ -79,8 +94,12 @@ def format_file_size(size_bytes):
     
     return f"{size_bytes:.1f} {size_names[i]}"
 
-def process_directories(input_paths):
-    """Process directories and check MKV files with MediaConch."""
+def process_directories(input_paths, store=None, since_ts=None):
+    """Process directories and check MKV files with MediaConch.
+
+    If a ConformanceStore is given, unchanged files reuse their stored result.
+    If since_ts is given, only files modified after that timestamp are checked.
+    """
     passed_files = []
     failed_files = []
     
@@ -89,6 +108,9 @@ def process_directories(input_paths):
             # Skip hidden files (starting with .)
             if mkv_file.name.startswith('.'):
                 continue
+
+            if not modified_since(mkv_file, since_ts):
+                continue
                 
             # Extract six-digit bag ID from filename (fallback to stem)
             m = re.search(r"(\d{6})", mkv_file.name)
@@ -100,9 +122,15 @@ def process_directories(input_paths):
             print(f"\n[INFO] Checking file: {mkv_file}")
             print(f"       File size: {format_file_size(file_size)}")
             
-            output = run_mediaconch(mkv_file)
-            if not output:
-                continue
+            output = store.lookup(mkv_file, IMPLEMENTATION_POLICY) if store else None
+            if output is not None:
+                print("       (cached result)")
+            else:
+                output = run_mediaconch(mkv_file)
+                if not output:
+                    continue
+                if store:
+                    store.record(mkv_file, IMPLEMENTATION_POLICY, output)
             
             result = extract_conch_results(output)
             
@@ -140,9 +168,39 @@ def main():
         nargs="+",
         help="One or more paths to input directories"
     )
+    parser.add_argument(
+        "--store",
+        default=str(DEFAULT_STORE_PATH),
+        help=f"Path to the local result store (default: {DEFAULT_STORE_PATH})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-run MediaConch on every file and ignore the result store"
+    )
+    parser.add_argument(
+        "--since",
+        help="Only check files modified since YYYY-MM-DD[THH:MM], or 'last' for the previous run"
+    )
     args = parser.parse_args()
-    
-    passed, failed = process_directories(args.input)
+
+    started_at = time.time()
+    store = None if args.no_cache else ConformanceStore(args.store)
+    try:
+        since_ts = parse_since(args.since, store, TOOL_NAME)
+    except ValueError as e:
+        sys.exit(f"[ERROR] {e}")
+    if args.since == "last" and since_ts is None:
+        print("[INFO] No previous run recorded; checking all files.")
+
+    try:
+        passed, failed = process_directories(args.input, store, since_ts)
+        if store:
+            store.mark_run(TOOL_NAME, started_at)
+            print(f"\n[INFO] Result store: {store.hits} cached, {store.misses} checked")
+    finally:
+        if store:
+            store.close()
     
     # Sort failed files by size (largest first)
     failed.sort(key=lambda x: x["file_size"], reverse=True)
@@ -7,11 +7,15 @@ import tempfile
 import shutil
 import sys
 import json
+import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
 def check_dependencies():
     """Ensure mkvtoolnix (mkvmerge/mkvextract) and vobsub-to-srt are installed."""
     for cmd in ['mkvmerge', 'mkvextract', 'vobsub-to-srt']:
@@ -47,8 +51,28 @@ def get_subtitle_tracks(mkv_file):
             
     return sub_tracks
 
-def extract_and_ocr(mkv_file):
-    """Extract VobSub tracks from an MKV using mkvextract and OCR them."""
+def ocr_track(mkv_file, track_id, temp_idx, temp_srt):
+    """OCR one extracted track with vobsub-to-srt (Apple Vision Framework); returns True on success."""
+    if not temp_idx.exists():
+        logging.error(f"mkvextract failed to create .idx for track ID {track_id}")
+        return False
+
+    logging.info(f"[{mkv_file.name}] Running Apple Native OCR on Track {track_id}... (This may take a minute)")
+
+    vobsub_cmd = [
+        "vobsub-to-srt", "-i", str(temp_idx), "-o", str(temp_srt), "-q", "accurate"
+    ]
+
+    try:
+        subprocess.run(vobsub_cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        logging.error(f"OCR failed for track {track_id} in {mkv_file.name}")
+        logging.debug(f"Error: {e.stderr}")
+        return False
+    return True
+
+def extract_and_ocr(mkv_file, jobs=DEFAULT_JOBS):
+    """Extract all VobSub tracks from an MKV in one mkvextract pass and OCR them in parallel."""
     logging.info(f"Probing: {mkv_file.name}")
     
     sub_tracks = get_subtitle_tracks(mkv_file)
@@ -61,45 +85,35 @@ def extract_and_ocr(mkv_file):
     out_dir = mkv_file.parent
 
     with tempfile.TemporaryDirectory() as temp_dir:
+        temp_bases = {track_id: Path(temp_dir) / f"sub_{track_id}" for track_id, _ in sub_tracks}
+
+        # Step 1: Extract idx/sub for every track with a single mkvextract call
         for track_id, lang in sub_tracks:
             logging.info(f"[{mkv_file.name}] Extracting Subtitle Track ID {track_id} (Lang: {lang})")
-            
-            temp_base = Path(temp_dir) / f"sub_{track_id}"
-            temp_idx = temp_base.with_suffix('.idx')
-            temp_srt = temp_base.with_suffix('.srt')
-            
-            # Step 1: Extract idx/sub cleanly using mkvextract
-            mkvextract_cmd = [
-                "mkvextract", str(mkv_file), "tracks",
-                f"{track_id}:{temp_idx}"
-            ]
-            
-            try:
-                subprocess.run(mkvextract_cmd, check=True, capture_output=True, text=True)
-            except subprocess.CalledProcessError as e:
-                logging.error(f"mkvextract failed for track ID {track_id} in {mkv_file.name}")
-                logging.error(f"Error:\n{e.stderr}")
-                continue
-            
-            if not temp_idx.exists():
-                logging.error(f"mkvextract failed to create .idx for track ID {track_id}")
-                continue
+        mkvextract_cmd = ["mkvextract", str(mkv_file), "tracks"]
+        mkvextract_cmd.extend(f"{track_id}:{base.with_suffix('.idx')}" for track_id, base in temp_bases.items())
 
-            # Step 2: OCR with vobsub-to-srt (Apple Vision Framework)
-            logging.info(f"[{mkv_file.name}] Running Apple Native OCR on Track {track_id}... (This may take a minute)")
-            
-            vobsub_cmd = [
-                "vobsub-to-srt", "-i", str(temp_idx), "-o", str(temp_srt), "-q", "accurate"
+        try:
+            subprocess.run(mkvextract_cmd, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            # Tracks written before the failure are still OCR'd
+            logging.error(f"mkvextract failed for {mkv_file.name}")
+            logging.error(f"Error:\n{e.stderr}")
+
+        # Step 2: OCR the tracks concurrently
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(sub_tracks)))) as executor:
+            futures = [
+                executor.submit(ocr_track, mkv_file, track_id,
+                                temp_bases[track_id].with_suffix('.idx'), temp_bases[track_id].with_suffix('.srt'))
+                for track_id, _ in sub_tracks
             ]
-            
-            try:
-                subprocess.run(vobsub_cmd, check=True, capture_output=True, text=True)
-            except subprocess.CalledProcessError as e:
-                logging.error(f"OCR failed for track {track_id} in {mkv_file.name}")
-                logging.debug(f"Error: {e.stderr}")
-                continue
+            results = [future.result() for future in futures]
 
-            # Step 3: Rename and Move Resulting SRT
+        # Step 3: Rename and Move Resulting SRTs, in track order so numbering is stable
+        for (track_id, lang), ok in zip(sub_tracks, results):
+            if not ok:
+                continue
+            temp_srt = temp_bases[track_id].with_suffix('.srt')
             if temp_srt.exists():
                 final_srt = out_dir / f"{base_name}_{lang}.srt"
                 
@@ -118,6 +132,8 @@ def extract_and_ocr(mkv_file):
 def main():
     parser = argparse.ArgumentParser(description='Extract VobSub tracks from MKVs and OCR them to SRT files using macOS Vision.')
     parser.add_argument('-i', '--input', dest='input_path', required=True, help='Path to an MKV file or directory of MKVs')
+    parser.add_argument('-j', '--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'Subtitle tracks OCR\'d at once (default: {DEFAULT_JOBS})')
     args = parser.parse_args()
 
     check_dependencies()
@@ -125,7 +141,7 @@ def main():
     input_path = Path(args.input_path)
 
     if input_path.is_file() and input_path.suffix.lower() == '.mkv':
-        extract_and_ocr(input_path)
+        extract_and_ocr(input_path, args.jobs)
     elif input_path.is_dir():
         mkv_files = sorted([f for f in input_path.glob('*.mkv') if not f.name.startswith('._')])
         if not mkv_files:
@@ -133,7 +149,7 @@ def main():
             sys.exit(1)
             
         for mkv in mkv_files:
-            extract_and_ocr(mkv)
+            extract_and_ocr(mkv, args.jobs)
     else:
         logging.error("Input must be a valid MKV file or a directory containing MKV files.")
         sys.exit(1)
@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 import os
 import argparse
+import csv
+import json
 import random
 import subprocess
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+PASS_MESSAGE = 'Decoding was checked, no issue detected.'
+FAIL_MESSAGE = 'Decoding was checked, issues detected, see below.'
+RESULT_FIELDS = ['file', 'size_bytes', 'stratum', 'status', 'returncode', 'seconds', 'detail']
+DEFAULT_SEED = 1
 
 def check_rawcooked():
     if shutil.which("rawcooked") is None:
@@ -17,43 +27,155 @@ def traverse_directory(directory):
     mkv_files = []
     for root, dirs, files in os.walk(directory):
         for file in files:
-            if file.endswith(".mkv"):
+            if file.endswith(".mkv") and not file.startswith("."):
                 mkv_files.append(os.path.join(root, file))
     print(f"Found {len(mkv_files)} MKV files.")
-    return mkv_files
-
-def process_files(files, percentage):
-    number_to_process = round(len(files) * (percentage/100))
-    if number_to_process == 0:
-        number_to_process = 1
-    print(f"Processing {number_to_process} files ({percentage}% of {len(files)}) with rawcooked...")
-    files_to_process = random.sample(files, number_to_process)
-    success_count = 0
-    failure_count = 0
-    for file in files_to_process:
-        print(f"Processing file: {file}")
-        command = ['rawcooked', '--check', file]
-        process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
-        output = ''
-        for line in iter(process.stdout.readline, ''):
-            print(line, end='')
-            output += line
-        if 'Decoding was checked, no issue detected.' in output:
-            success_count += 1
-        elif 'Decoding was checked, issues detected, see below.' in output:
-            failure_count += 1
-    print(f"Finished processing {number_to_process} files. {success_count} files processed successfully, {failure_count} files failed.")
+    # Sorted so that a given seed always yields the same sample
+    return sorted(mkv_files)
+
+def stratified_sample(files, percentage, strata, seed):
+    """
+    Sample `percentage` of files, drawn from `strata` size bands.
+
+    Files are ordered by size and split into equal-count bands; the sample
+    is allocated across bands in proportion to their size (at least one file
+    per band), so the largest reels are always represented. Returns a list
+    of (file, size, stratum).
+    """
+    rng = random.Random(seed)
+    sized = sorted(((f, os.path.getsize(f)) for f in files), key=lambda x: (x[1], x[0]))
+    total = max(1, round(len(sized) * (percentage / 100)))
+    strata = max(1, min(strata, total))
+    band_size = len(sized) / strata
+    bands = [sized[round(b * band_size):round((b + 1) * band_size)] for b in range(strata)]
+
+    # Largest-remainder allocation of the sample across bands
+    quotas = [len(members) * total / len(sized) for members in bands]
+    counts = [max(1, int(q)) for q in quotas]
+    by_remainder = sorted(range(strata), key=lambda b: quotas[b] - int(quotas[b]), reverse=True)
+    for b in by_remainder[:max(0, total - sum(counts))]:
+        counts[b] += 1
+
+    sample = []
+    for band, (members, count) in enumerate(zip(bands, counts), start=1):
+        for file, size in rng.sample(members, min(count, len(members))):
+            sample.append((file, size, band))
+    return sample
+
+def run_rawcooked_check(file):
+    """Run rawcooked --check on one file and return (status, returncode, detail)."""
+    command = ['rawcooked', '--check', file]
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    output = process.stdout
+    if PASS_MESSAGE in output:
+        return 'pass', process.returncode, ''
+    detail = ' | '.join(line.strip() for line in output.splitlines()[-5:] if line.strip())
+    if FAIL_MESSAGE in output:
+        return 'fail', process.returncode, detail
+    return 'unknown', process.returncode, detail
+
+def load_completed(output_path):
+    """Return {file: result} for results already written to the output file."""
+    completed = {}
+    if not output_path or not os.path.exists(output_path):
+        return completed
+    with open(output_path, newline='', encoding='utf-8') as f:
+        if output_path.endswith('.csv'):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        for row in rows:
+            completed[row['file']] = row
+    return completed
+
+class ResultWriter:
+    """Append one result per file to a CSV or JSON Lines file as checks finish."""
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.lock = threading.Lock()
+        self.is_csv = bool(output_path) and output_path.endswith('.csv')
+        if self.is_csv and not os.path.exists(output_path):
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                csv.DictWriter(f, fieldnames=RESULT_FIELDS).writeheader()
+
+    def write(self, result):
+        if not self.output_path:
+            return
+        with self.lock, open(self.output_path, 'a', newline='', encoding='utf-8') as f:
+            if self.is_csv:
+                csv.DictWriter(f, fieldnames=RESULT_FIELDS).writerow(result)
+            else:
+                f.write(json.dumps(result) + '\n')
+
+def check_file(file, size, stratum):
+    start = time.perf_counter()
+    status, returncode, detail = run_rawcooked_check(file)
+    return {
+        'file': file,
+        'size_bytes': size,
+        'stratum': stratum,
+        'status': status,
+        'returncode': returncode,
+        'seconds': round(time.perf_counter() - start, 1),
+        'detail': detail,
+    }
+
+def process_files(files, percentage, jobs=1, strata=4, seed=DEFAULT_SEED, output_path=None, resume=False):
+    if not files:
+        print("No MKV files to process.")
+        return
+    sample = stratified_sample(files, percentage, strata, seed)
+    print(f"Sampled {len(sample)} files ({percentage}% of {len(files)} across "
+          f"{len({item[2] for item in sample})} size strata, seed {seed}).")
+
+    if output_path and not resume and os.path.exists(output_path):
+        os.remove(output_path)
+    completed = load_completed(output_path) if resume else {}
+    pending = [item for item in sample if item[0] not in completed]
+    if completed:
+        print(f"Resuming: {len(sample) - len(pending)} sampled files already checked.")
+
+    writer = ResultWriter(output_path)
+    counts = {'pass': 0, 'fail': 0, 'unknown': 0}
+    for file, _, _ in sample:
+        if file in completed:
+            counts[completed[file]['status']] = counts.get(completed[file]['status'], 0) + 1
+
+    print(f"Checking {len(pending)} files with rawcooked using {jobs} workers...")
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(check_file, *item) for item in pending]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            writer.write(result)
+            counts[result['status']] += 1
+            line = f"[{done}/{len(pending)}] {result['status'].upper():7} {result['file']} ({result['seconds']}s)"
+            if result['detail']:
+                line += f"\n    {result['detail']}"
+            print(line)
+
+    print(f"Finished processing {len(sample)} files. {counts['pass']} files processed successfully, "
+          f"{counts['fail']} files failed, {counts['unknown']} files with unrecognized output.")
+    if output_path:
+        print(f"Results written to {output_path}")
 
 def main():
     parser = argparse.ArgumentParser(description="Process a given percentage of MKV files in a directory with rawcooked.")
     parser.add_argument('-d', '--directory', type=str, required=True, help="Directory containing MKV files.")
     parser.add_argument('-p', '--percentage', type=int, default=10, help="Percentage of MKV files to process.")
-    
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="Number of rawcooked checks to run in parallel (default: 1).")
+    parser.add_argument('--strata', type=int, default=4, help="Number of file-size bands to sample from (default: 4).")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"Random seed for the sample (default: {DEFAULT_SEED}).")
+    parser.add_argument('-o', '--output', type=str, help="Write per-file results to this .csv or .jsonl file.")
+    parser.add_argument('--resume', action='store_true', help="Skip sampled files already recorded in the output file.")
+
     args = parser.parse_args()
+    if args.resume and not args.output:
+        parser.error("--resume requires -o/--output")
 
     check_rawcooked()
     files = traverse_directory(args.directory)
-    process_files(files, args.percentage)
+    process_files(files, args.percentage, args.jobs, args.strata, args.seed, args.output, args.resume)
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 
 import argparse
-import hashlib
 import json
 import logging
-import os
 import re
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from pathlib import Path
 from typing import List, Optional, Tuple
 
@@ -17,6 +19,20 @@ except ImportError:
     print("Error: pymediainfo is required. Install with: pip install pymediainfo")
     sys.exit(1)
 
+try:
+    from ami_scripts.bag_updater import BagUpdater
+    from ami_scripts.stage_timer import StageTimer, timed as _timed
+except ImportError:
+    from bag_updater import BagUpdater
+    from stage_timer import StageTimer, timed as _timed
+
+try:
+    from ami_scripts.audio_analysis import probe_audio_streams, analyze_stream
+    from ami_scripts.ltc_decoder import decode_timecodes, format_timecode
+except ImportError:
+    from audio_analysis import probe_audio_streams, analyze_stream
+    from ltc_decoder import decode_timecodes, format_timecode
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, 
@@ -29,7 +45,8 @@ REQUIRED_BAGIT_FILES = ['bag-info.txt', 'bagit.txt', 'manifest-md5.txt', 'tagman
 SILENCE_THRESHOLD = -60.0  # dB
 DEFAULT_MATCH_THRESHOLD = 5
 DEFAULT_PROBE_DURATION = 120
-CHUNK_SIZE = 4096
+DEFAULT_ENCODE_JOBS = 1
+DEFAULT_IO_JOBS = 2
 
 
 def is_bag(directory: Path) -> bool:
@@ -83,99 +100,54 @@ def run_command(cmd: List[str], input_data: Optional[bytes] = None,
         raise
 
 
-def detect_ltc_in_channel(input_file: Path, stream_index: int, channel: str, 
-                         probe_duration: int = DEFAULT_PROBE_DURATION, 
+def detect_ltc_in_channel(samples, channel: int,
                          match_threshold: int = DEFAULT_MATCH_THRESHOLD) -> bool:
     """
-    Detect LTC (Linear Time Code) in a specific audio channel.
+    Detect LTC (Linear Time Code) in one channel of a decoded audio stream.
     
     Args:
-        input_file: Path to input media file
-        stream_index: Audio stream index
-        channel: 'left' or 'right'
-        probe_duration: Duration in seconds to analyze
+        samples: (samples, channels) buffer from audio_analysis.decode_stream_pcm
+        channel: 0 for left, 1 for right
         match_threshold: Minimum matches required to consider LTC valid
         
     Returns:
         True if LTC is detected with sufficient matches
     """
-    if channel not in ['left', 'right']:
-        raise ValueError("Channel must be 'left' or 'right'")
-    
-    # Set up channel mapping
-    pan_filter = 'pan=mono|c0=c0' if channel == 'left' else 'pan=mono|c0=c1'
-
-    # Build FFmpeg command for audio extraction
-    ffmpeg_cmd = [
-        "ffmpeg",
-        "-t", str(probe_duration),
-        "-i", str(input_file),
-        "-map", f"0:{stream_index}",
-        "-af", pan_filter,
-        "-ar", "48000",
-        "-ac", "1",
-        "-f", "wav",
-        "pipe:1"
-    ]
-
-    ltcdump_cmd = ["ltcdump", "-"]
-
     try:
-        # Run FFmpeg -> ltcdump pipeline
-        with subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as ffmpeg_proc:
-            with subprocess.Popen(ltcdump_cmd, stdin=ffmpeg_proc.stdout, 
-                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, 
-                                text=True) as ltcdump_proc:
-                ffmpeg_proc.stdout.close()  # Allow ffmpeg to receive SIGPIPE
-                ltcdump_out, ltcdump_err = ltcdump_proc.communicate()
-                ffmpeg_proc.wait()
-
-        # Extract timecode matches (HH:MM:SS:FF format)
-        matches = re.findall(r'\d{2}:\d{2}:\d{2}:\d{2}', ltcdump_out)
+        # Decode timecode frames in-process from the already decoded samples
+        matches, _ = decode_timecodes(samples[:, channel])
         
-        logger.debug(f"LTC analysis for {input_file} stream {stream_index} {channel}: {len(matches)} matches")
+        logger.debug(f"LTC analysis for channel {channel}: {len(matches)} matches")
         if matches:
-            logger.debug(f"First few matches: {matches[:5]}")
+            logger.debug(f"First few matches: {[format_timecode(tc) for tc in matches[:5]]}")
 
         return len(matches) >= match_threshold
 
     except Exception as e:
-        logger.warning(f"LTC detection failed for {input_file} stream {stream_index} {channel}: {e}")
+        logger.warning(f"LTC detection failed for channel {channel}: {e}")
         return False
 
 
-def analyze_audio_volume(input_file: Path, stream_index: int, channel: str, 
-                        probe_duration: int = DEFAULT_PROBE_DURATION) -> Optional[float]:
+def analyze_stream_volumes(input_file: Path, stream_index: int, channels: int,
+                           probe_duration: int = DEFAULT_PROBE_DURATION) -> Tuple[Optional["np.ndarray"], Optional[List[float]]]:
     """
-    Analyze the volume of a specific audio channel.
+    Decode an audio stream once and measure the volume of every channel.
     
     Args:
         input_file: Path to input media file
         stream_index: Audio stream index
-        channel: 'left' or 'right'
+        channels: Number of channels in the stream
         probe_duration: Duration in seconds to analyze
         
     Returns:
-        Mean volume in dB, or None if analysis fails
+        (samples, mean volumes in dB per channel), or (None, None) if analysis fails
     """
-    if channel not in ['left', 'right']:
-        raise ValueError("Channel must be 'left' or 'right'")
-    
-    pan_filter = 'pan=mono|c0=c0' if channel == 'left' else 'pan=mono|c0=c1'
-    
-    cmd = [
-        "ffmpeg", "-t", str(probe_duration), "-i", str(input_file),
-        "-map", f"0:{stream_index}",
-        "-af", f"{pan_filter},volumedetect", "-f", "null", "-"
-    ]
-    
     try:
-        result = run_command(cmd, capture_output=True)
-        match = re.search(r"mean_volume:\s*(-?\d+(?:\.\d+)?)", result.stderr)
-        return float(match.group(1)) if match else None
+        samples, levels = analyze_stream(input_file, stream_index, channels, probe_duration)
+        return samples, [stats['mean_vol'] for stats in levels]
     except Exception as e:
-        logger.warning(f"Volume analysis failed for {input_file} stream {stream_index} {channel}: {e}")
-        return None
+        logger.warning(f"Volume analysis failed for {input_file} stream {stream_index}: {e}")
+        return None, None
 
 
 def detect_audio_pan(input_file: Path, audio_pan: str, 
@@ -194,39 +166,28 @@ def detect_audio_pan(input_file: Path, audio_pan: str,
     if audio_pan not in ['none', 'left', 'right', 'center', 'auto']:
         raise ValueError(f"Invalid audio_pan value: {audio_pan}")
     
-    # Get audio stream indices
-    ffprobe_cmd = [
-        "ffprobe", "-i", str(input_file),
-        "-show_entries", "stream=index:stream=codec_type",
-        "-select_streams", "a", "-of", "compact=p=0:nk=1", "-v", "0"
-    ]
-    
-    try:
-        result = run_command(ffprobe_cmd)
-        audio_streams = [
-            int(line.split('|')[0]) 
-            for line in result.stdout.splitlines() 
-            if "audio" in line
-        ]
-    except Exception as e:
-        logger.error(f"Failed to detect audio streams in {input_file}: {e}")
+    # Get audio stream indices and channel counts
+    streams = probe_audio_streams(input_file)
+    if not streams:
+        logger.error(f"Failed to detect audio streams in {input_file}")
         return []
+    audio_streams = [index for index, _ in streams]
 
     logger.info(f"Detected {len(audio_streams)} audio streams: {audio_streams} in {input_file}")
 
     pan_filters = []
     pan_filter_idx = 0
 
-    for stream_index in audio_streams:
+    for stream_index, channels in streams:
         logger.info(f"Analyzing audio stream: {stream_index}")
 
-        # Analyze channel volumes
-        left_volume = analyze_audio_volume(input_file, stream_index, 'left', probe_duration)
-        right_volume = analyze_audio_volume(input_file, stream_index, 'right', probe_duration)
+        # Analyze channel volumes from a single decode of the stream
+        samples, volumes = analyze_stream_volumes(input_file, stream_index, channels, probe_duration)
 
-        if left_volume is None or right_volume is None:
+        if volumes is None or len(volumes) < 2 or None in volumes[:2]:
             logger.warning(f"Stream {stream_index}: Unable to analyze audio. Skipping.")
             continue
+        left_volume, right_volume = volumes[0], volumes[1]
 
         logger.info(f"Stream {stream_index} - Left: {left_volume}dB, Right: {right_volume}dB")
 
@@ -235,8 +196,8 @@ def detect_audio_pan(input_file: Path, audio_pan: str,
         right_has_ltc = False
         
         if audio_pan == "auto":
-            left_has_ltc = detect_ltc_in_channel(input_file, stream_index, 'left', probe_duration)
-            right_has_ltc = detect_ltc_in_channel(input_file, stream_index, 'right', probe_duration)
+            left_has_ltc = detect_ltc_in_channel(samples, 0)
+            right_has_ltc = detect_ltc_in_channel(samples, 1)
 
         # Apply logic for stream processing
         if left_has_ltc and not right_has_ltc:
@@ -317,13 +278,15 @@ def get_video_filter(width: int, height: int) -> str:
         return "idet,bwdif=1"
 
 
-def remake_scs_from_pm(bag_path: Path, audio_pan: str = "none") -> List[str]:
+def remake_scs_from_pm(bag_path: Path, audio_pan: str = "none",
+                       timer: Optional[StageTimer] = None) -> List[str]:
     """
     Create new Service Copy MP4 files from Preservation Master MKV files.
     
     Args:
         bag_path: Path to BagIt bag directory
         audio_pan: Audio panning mode
+        timer: Optional StageTimer recording analysis and encode time
         
     Returns:
         List of modified file paths
@@ -355,7 +318,8 @@ def remake_scs_from_pm(bag_path: Path, audio_pan: str = "none") -> List[str]:
             # Get audio pan filters
             pan_filters = []
             if audio_pan != "none":
-                pan_filters = detect_audio_pan(pm_file, audio_pan)
+                with _timed(timer, 'analysis'):
+                    pan_filters = detect_audio_pan(pm_file, audio_pan)
 
             # Build filter_complex
             filter_parts = [f"[0:v]{video_filter}[v]"]
@@ -388,7 +352,8 @@ def remake_scs_from_pm(bag_path: Path, audio_pan: str = "none") -> List[str]:
 
             # Execute transcoding
             logger.debug(f"FFmpeg command: {' '.join(cmd)}")
-            run_command(cmd, check=True)
+            with _timed(timer, 'encode'):
+                run_command(cmd, check=True)
 
             # Replace original file
             sc_file.unlink()
@@ -404,13 +369,15 @@ def remake_scs_from_pm(bag_path: Path, audio_pan: str = "none") -> List[str]:
     return modified_files
 
 
-def remake_scs_from_sc(bag_path: Path, audio_pan: str = "none") -> List[str]:
+def remake_scs_from_sc(bag_path: Path, audio_pan: str = "none",
+                       timer: Optional[StageTimer] = None) -> List[str]:
     """
     Create new Service Copy MP4 files from existing Service Copy files.
     
     Args:
         bag_path: Path to BagIt bag directory
         audio_pan: Audio panning mode
+        timer: Optional StageTimer recording analysis and encode time
         
     Returns:
         List of modified file paths
@@ -430,7 +397,8 @@ def remake_scs_from_sc(bag_path: Path, audio_pan: str = "none") -> List[str]:
             # Get audio pan filters
             pan_filters = []
             if audio_pan != "none":
-                pan_filters = detect_audio_pan(sc_file, audio_pan)
+                with _timed(timer, 'analysis'):
+                    pan_filters = detect_audio_pan(sc_file, audio_pan)
 
             # Build base command
             cmd = [
@@ -459,7 +427,8 @@ def remake_scs_from_sc(bag_path: Path, audio_pan: str = "none") -> List[str]:
 
             # Execute transcoding
             logger.debug(f"FFmpeg command: {' '.join(cmd)}")
-            run_command(cmd, check=True)
+            with _timed(timer, 'encode'):
+                run_command(cmd, check=True)
 
             # Replace original file
             sc_file.unlink()
@@ -547,241 +516,56 @@ def update_sidecar_json(data_dir: Path) -> List[str]:
     return modified_files
 
 
-def calculate_md5(file_path: Path) -> str:
+def process_bag(bag_path: Path, source: str, audio_pan: str,
+                encode_slots: Optional[threading.Semaphore] = None,
+                io_slots: Optional[threading.Semaphore] = None,
+                timer: Optional[StageTimer] = None) -> None:
     """
-    Calculate MD5 checksum for a file.
-    
-    Args:
-        file_path: Path to file
-        
-    Returns:
-        MD5 checksum as hex string
-    """
-    logger.debug(f"Calculating MD5 for: {file_path}")
-    hash_md5 = hashlib.md5()
-    
-    try:
-        with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-    except Exception as e:
-        logger.error(f"Failed to calculate MD5 for {file_path}: {e}")
-        raise
-
-
-def update_manifests(bag_path: Path, modified_paths: List[str]) -> None:
-    """
-    Update BagIt manifest files with new checksums.
-    
-    Args:
-        bag_path: Path to BagIt bag directory
-        modified_paths: List of modified file paths relative to bag_path
-    """
-    manifest_path = bag_path / 'manifest-md5.txt'
-    tag_manifest_path = bag_path / 'tagmanifest-md5.txt'
-
-    # Update manifest-md5.txt
-    if manifest_path.exists():
-        try:
-            with open(manifest_path, 'r') as f:
-                lines = f.readlines()
-
-            updated_lines = []
-            for line in lines:
-                parts = line.strip().split(' ', 1)
-                if len(parts) != 2:
-                    updated_lines.append(line)
-                    continue
-                    
-                old_checksum, rel_path = parts
-                rel_path = rel_path.strip()
-                
-                if rel_path in modified_paths:
-                    full_path = bag_path / rel_path
-                    if full_path.is_file():
-                        new_checksum = calculate_md5(full_path)
-                        updated_lines.append(f"{new_checksum} {rel_path}\n")
-                    else:
-                        logger.warning(f"File not found for manifest update: {full_path}")
-                        updated_lines.append(line)
-                else:
-                    updated_lines.append(line)
-
-            with open(manifest_path, 'w') as f:
-                f.writelines(updated_lines)
-                
-            logger.info("Updated manifest-md5.txt")
-
-        except Exception as e:
-            logger.error(f"Failed to update manifest: {e}")
-            raise
-
-    # Update tagmanifest-md5.txt
-    if tag_manifest_path.exists() and manifest_path.exists():
-        try:
-            with open(tag_manifest_path, 'r') as f:
-                lines = f.readlines()
-
-            updated_lines = []
-            for line in lines:
-                parts = line.strip().split(' ', 1)
-                if len(parts) != 2:
-                    updated_lines.append(line)
-                    continue
-                    
-                old_checksum, filename = parts
-                if 'manifest-md5.txt' in filename:
-                    new_checksum = calculate_md5(manifest_path)
-                    updated_lines.append(f"{new_checksum} {filename}\n")
-                else:
-                    updated_lines.append(line)
-
-            with open(tag_manifest_path, 'w') as f:
-                f.writelines(updated_lines)
-                
-        except Exception as e:
-            logger.error(f"Failed to update tagmanifest: {e}")
-            raise
-
+    Process a single BagIt bag.
 
-def update_payload_oxum(bag_path: Path) -> None:
-    """
-    Recalculate and update Payload-Oxum in bag-info.txt.
+    The CPU-heavy analysis/encode stage and the I/O-heavy sidecar/manifest
+    stage each acquire their own semaphore, so several bags can run at once
+    with independent concurrency limits per stage.
     
     Args:
         bag_path: Path to BagIt bag directory
+        source: Source type ('pm' or 'sc')
+        audio_pan: Audio panning mode
+        encode_slots: Optional semaphore limiting concurrent encode stages
+        io_slots: Optional semaphore limiting concurrent hashing/manifest stages
+        timer: Optional StageTimer for the end-of-run summary
     """
-    data_path = bag_path / 'data'
-    bag_info_path = bag_path / 'bag-info.txt'
-
-    if not data_path.exists():
-        logger.warning(f"Data directory not found: {data_path}")
-        return
-
-    # Calculate totals
-    total_size = 0
-    total_files = 0
-
-    for file_path in data_path.rglob('*'):
-        if file_path.is_file():
-            total_size += file_path.stat().st_size
-            total_files += 1
-
-    new_oxum = f"{total_size}.{total_files}"
-    logger.info(f"Calculated Payload-Oxum: {new_oxum}")
-
-    # Update bag-info.txt
-    if bag_info_path.exists():
-        try:
-            with open(bag_info_path, 'r') as f:
-                lines = f.readlines()
+    logger.info(f"Processing BagIt bag: {bag_path}")
 
-            updated_lines = []
-            oxum_found = False
-            
-            for line in lines:
-                if line.startswith('Payload-Oxum:'):
-                    updated_lines.append(f'Payload-Oxum: {new_oxum}\n')
-                    oxum_found = True
-                else:
-                    updated_lines.append(line)
-
-            if not oxum_found:
-                updated_lines.append(f'Payload-Oxum: {new_oxum}\n')
-
-            with open(bag_info_path, 'w') as f:
-                f.writelines(updated_lines)
-                
-        except Exception as e:
-            logger.error(f"Failed to update bag-info.txt: {e}")
-            raise
+    try:
+        # Record sizes of the files this run may rewrite, so the
+        # Payload-Oxum can be adjusted without re-walking data/
+        data_dir = bag_path / 'data'
+        updater = BagUpdater(bag_path)
+        updater.snapshot(list(data_dir.rglob('*_sc.mp4')) + list(data_dir.rglob('*_sc.json')))
 
+        # Re-encode service copies
+        with encode_slots or nullcontext():
+            if source == 'sc':
+                sc_modified = remake_scs_from_sc(bag_path, audio_pan, timer)
+            else:
+                sc_modified = remake_scs_from_pm(bag_path, audio_pan, timer)
 
-def update_tagmanifest(bag_path: Path) -> None:
-    """
-    Update tagmanifest-md5.txt with new checksums for metadata files.
-    
-    Args:
-        bag_path: Path to BagIt bag directory
-    """
-    tag_manifest_path = bag_path / 'tagmanifest-md5.txt'
-    bag_info_path = bag_path / 'bag-info.txt'
-    manifest_path = bag_path / 'manifest-md5.txt'
+        with io_slots or nullcontext():
+            # Update JSON sidecars
+            with _timed(timer, 'sidecars'):
+                json_modified = update_sidecar_json(data_dir)
 
-    if not tag_manifest_path.exists():
-        logger.warning(f"tagmanifest-md5.txt not found: {tag_manifest_path}")
-        return
+            all_modified = sc_modified + json_modified
 
-    try:
-        with open(tag_manifest_path, 'r') as f:
-            lines = f.readlines()
-
-        updated_lines = []
-        for line in lines:
-            parts = line.strip().split(' ', 1)
-            if len(parts) != 2:
-                updated_lines.append(line)
-                continue
+            if all_modified:
+                # Update BagIt metadata
+                with _timed(timer, 'manifests'):
+                    updater.commit(all_modified)
                 
-            old_checksum, filename = parts
-
-            if 'manifest-md5.txt' in filename and manifest_path.exists():
-                new_checksum = calculate_md5(manifest_path)
-                updated_lines.append(f"{new_checksum} {filename}\n")
-            elif 'bag-info.txt' in filename and bag_info_path.exists():
-                new_checksum = calculate_md5(bag_info_path)
-                updated_lines.append(f"{new_checksum} {filename}\n")
+                logger.info(f"Successfully processed {len(all_modified)} files in {bag_path}")
             else:
-                updated_lines.append(line)
-
-        with open(tag_manifest_path, 'w') as f:
-            f.writelines(updated_lines)
-            
-        logger.info("Updated tagmanifest-md5.txt")
-
-    except Exception as e:
-        logger.error(f"Failed to update tagmanifest: {e}")
-        raise
-
-
-def process_bag(bag_path: Path, source: str, audio_pan: str) -> None:
-    """
-    Process a single BagIt bag.
-    
-    Args:
-        bag_path: Path to BagIt bag directory
-        source: Source type ('pm' or 'sc')
-        audio_pan: Audio panning mode
-    """
-    logger.info(f"Processing BagIt bag: {bag_path}")
-
-    try:
-        # Re-encode service copies
-        if source == 'sc':
-            sc_modified = remake_scs_from_sc(bag_path, audio_pan)
-        else:
-            sc_modified = remake_scs_from_pm(bag_path, audio_pan)
-
-        # Update JSON sidecars
-        json_modified = update_sidecar_json(bag_path / 'data')
-
-        # Convert to relative paths
-        all_modified = sc_modified + json_modified
-        rel_modified = [
-            os.path.relpath(path, start=bag_path).replace('\\', '/')
-            for path in all_modified
-        ]
-
-        if rel_modified:
-            # Update BagIt metadata
-            update_manifests(bag_path, rel_modified)
-            update_payload_oxum(bag_path)
-            update_tagmanifest(bag_path)
-            
-            logger.info(f"Successfully processed {len(rel_modified)} files in {bag_path}")
-        else:
-            logger.info(f"No files modified in {bag_path}")
+                logger.info(f"No files modified in {bag_path}")
 
     except Exception as e:
         logger.error(f"Failed to process bag {bag_path}: {e}")
@@ -816,6 +600,20 @@ def main() -> None:
         help='Audio panning mode: none, left, right, center, or auto (includes LTC detection)'
     )
     
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=DEFAULT_ENCODE_JOBS,
+        help=f'Maximum concurrent analysis/encode stages (default: {DEFAULT_ENCODE_JOBS})'
+    )
+
+    parser.add_argument(
+        '--io-jobs',
+        type=int,
+        default=DEFAULT_IO_JOBS,
+        help=f'Maximum concurrent sidecar/manifest hashing stages (default: {DEFAULT_IO_JOBS})'
+    )
+    
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -838,23 +636,42 @@ def main() -> None:
         logger.error(f"Path is not a directory: {top_dir}")
         sys.exit(1)
 
-    # Process each bag
+    if args.jobs < 1 or args.io_jobs < 1:
+        logger.error("--jobs and --io-jobs must be at least 1")
+        sys.exit(1)
+
+    bags = []
+    for item in sorted(top_dir.iterdir()):
+        if item.is_dir() and is_bag(item):
+            bags.append(item)
+        else:
+            logger.debug(f"Skipping non-bag directory: {item}")
+
+    # Process bags concurrently: one worker per encode or I/O slot keeps
+    # both stages busy while the semaphores enforce each stage's limit
+    encode_slots = threading.Semaphore(args.jobs)
+    io_slots = threading.Semaphore(args.io_jobs)
+    timer = StageTimer()
     processed_count = 0
     error_count = 0
-    
-    for item in top_dir.iterdir():
-        if item.is_dir() and is_bag(item):
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.jobs + args.io_jobs) as pool:
+        futures = {
+            pool.submit(process_bag, bag, args.source, args.audio_pan,
+                        encode_slots, io_slots, timer): bag
+            for bag in bags
+        }
+        for future in as_completed(futures):
             try:
-                process_bag(item, args.source, args.audio_pan)
+                future.result()
                 processed_count += 1
             except Exception as e:
-                logger.error(f"Failed to process bag {item}: {e}")
+                logger.error(f"Failed to process bag {futures[future]}: {e}")
                 error_count += 1
-                continue
-        else:
-            logger.debug(f"Skipping non-bag directory: {item}")
-    
+
     # Summary
+    timer.log_summary(time.perf_counter() - start)
     logger.info(f"Processing complete: {processed_count} bags processed, {error_count} errors")
     
     if error_count > 0:
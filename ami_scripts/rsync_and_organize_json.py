@@ -1,49 +1,114 @@
 #!/usr/bin/env python3
 
 import os
+import shutil
 import subprocess
+import time
 from pathlib import Path
-from multiprocessing import Pool, cpu_count
-from functools import partial
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import argparse
 
-def rsync_file(dst_dir, json_file):
+def bucket_for(json_file):
     # split the file name into parts
     parts = json_file.stem.split('_')
-    
+
     # check if the filename has at least two parts
     if len(parts) < 2:
-        print(f"Skipping file {json_file} as it does not meet the expected format.")
-        return
+        return None
+
+    # the subdirectory is named for the first three digits of the ID
+    return parts[1][:3]
+
+def group_by_bucket(json_files):
+    buckets = defaultdict(list)
+    skipped = 0
+    for json_file in json_files:
+        bucket = bucket_for(json_file)
+        if bucket is None:
+            print(f"Skipping file {json_file} as it does not meet the expected format.")
+            skipped += 1
+            continue
+        buckets[bucket].append(json_file)
+    return buckets, skipped
 
-    # create a subdirectory path based on the first three digits of the file name
-    subdir = dst_dir / parts[1][:3]
-    
-    # create the subdirectory if it does not exist
-    subdir.mkdir(parents=True, exist_ok=True)
+def rsync_bucket(src_dir, subdir, json_files):
+    # one rsync per bucket; --no-relative drops the source subdirectories so files land flat in the bucket
+    file_list = '\n'.join(str(f.relative_to(src_dir)) for f in json_files) + '\n'
+    subprocess.run(
+        ['rsync', '-a', '--no-relative', '--files-from=-', f"{src_dir}/", f"{subdir}/"],
+        input=file_list, text=True, check=True
+    )
+    return len(json_files), 0
 
-    # rsync the file into the subdirectory
-    subprocess.run(['rsync', '-av', str(json_file), str(subdir)], check=True)
+def is_identical(src, dst):
+    # same quick check rsync uses: size and modification time
+    try:
+        dst_stat = dst.stat()
+    except FileNotFoundError:
+        return False
+    src_stat = src.stat()
+    return src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime)
+
+def copy_bucket(src_dir, subdir, json_files):
+    copied = skipped = 0
+    for json_file in json_files:
+        target = subdir / json_file.name
+        if is_identical(json_file, target):
+            skipped += 1
+            continue
+        shutil.copy2(json_file, target)
+        copied += 1
+    return copied, skipped
 
 def main():
     parser = argparse.ArgumentParser(description='Rsync JSON files into subdirectories.')
     parser.add_argument('-s', '--source', required=True, help='Source directory containing JSON files.')
     parser.add_argument('-d', '--destination', required=True, help='Destination directory to rsync files to.')
+    parser.add_argument('-e', '--engine', choices=['rsync', 'copy'], default='rsync',
+                        help='rsync: one rsync per subdirectory (default); copy: copy in-process, skipping identical files')
+    parser.add_argument('-j', '--jobs', type=int, default=min(8, os.cpu_count() or 1),
+                        help='Subdirectories transferred at once (default: 8 or the core count, whichever is lower)')
     args = parser.parse_args()
 
     # convert source and destination directories to Path objects
-    src_dir = Path(args.source)
+    src_dir = Path(args.source).resolve()
     dst_dir = Path(args.destination)
 
+    if args.engine == 'rsync' and not shutil.which('rsync'):
+        print("rsync not found; falling back to the copy engine.")
+        args.engine = 'copy'
+    transfer = rsync_bucket if args.engine == 'rsync' else copy_bucket
+
     # create the destination directory if it does not exist
     dst_dir.mkdir(parents=True, exist_ok=True)
 
-    # get a list of all JSON files in the source directory and subdirectories
+    # get a list of all JSON files in the source directory and subdirectories, grouped by destination subdirectory
     json_files = list(src_dir.glob('**/*.json'))
+    buckets, invalid = group_by_bucket(json_files)
+
+    start = time.monotonic()
+    transferred = unchanged = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {}
+        for bucket, files in sorted(buckets.items()):
+            subdir = dst_dir / bucket
+            subdir.mkdir(parents=True, exist_ok=True)
+            futures[executor.submit(transfer, src_dir, subdir, files)] = bucket
+        for future in as_completed(futures):
+            copied, skipped = future.result()
+            transferred += copied
+            unchanged += skipped
 
-    # use a Pool of processes to rsync the files
-    with Pool(processes=cpu_count()) as pool:
-        pool.map(partial(rsync_file, dst_dir), json_files)
+    elapsed = time.monotonic() - start
+    total = transferred + unchanged
+    rate = total / elapsed if elapsed > 0 else float(total)
+    summary = f"{total} files into {len(buckets)} subdirectories in {elapsed:.1f}s ({rate:.0f} files/s)"
+    if args.engine == 'copy':
+        summary += f"; {transferred} copied, {unchanged} already up to date"
+    if invalid:
+        summary += f"; {invalid} skipped (unexpected file name)"
+    print(summary)
 
 if __name__ == "__main__":
     main()
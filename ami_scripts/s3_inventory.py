@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Cached inventory of an S3 bucket, shared by the scripts that need to know
+which AMI service copies are already in the bucket.
+
+The inventory is a small SQLite file per bucket holding every key (with size,
+last-modified and ETag) plus an index from 6-digit AMI IDs to keys. It can be
+filled by a parallel live listing, in which the key space is split into
+ranges around the bucket's division prefixes and AMI IDs (found with a few
+one-key probes) that are paginated concurrently, or by ingesting an S3 Inventory
+report (CSV, CSV.gz or Parquet) so no listing is needed at all. Lookups then
+run against the local file and work offline.
+"""
+
+import csv
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+DEFAULT_INVENTORY_DIR = Path(
+    os.environ.get('AMI_S3_INVENTORY_DIR', Path.home() / '.ami_s3_inventory')
+)
+DEFAULT_LIST_WORKERS = 16
+DEFAULT_MAX_AGE_HOURS = 24
+
+# Matches exactly 6 digits not surrounded by other digits
+AMI_ID_RE = re.compile(r'(?<!\d)(\d{6})(?!\d)')
+
+# Keys are bag file names such as myd_123456_v01f01_sc.mp4: a division prefix, then the AMI ID
+DIVISION_PREFIX_RE = re.compile(r'^([^_]+_)\d')
+# Leading ID digits used to split each division into ranges (2 → up to 100 ranges per division)
+ID_SPLIT_DIGITS = 2
+# Sorts after every character a key can contain; S3 lists keys in UTF-8 byte order
+KEY_SPACE_END = '\U0010ffff'
+MAX_PREFIX_PROBES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    key TEXT PRIMARY KEY,
+    size INTEGER,
+    last_modified TEXT,
+    etag TEXT
+);
+CREATE TABLE IF NOT EXISTS ami_ids (
+    ami_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (ami_id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+ObjectRow = Tuple[str, Optional[int], Optional[str], Optional[str]]
+
+
+def extract_ami_ids(key: str) -> List[str]:
+    """Return every 6-digit AMI ID found in a key."""
+    return AMI_ID_RE.findall(key)
+
+
+def _object_row(obj) -> ObjectRow:
+    last_modified = obj.get('LastModified')
+    if isinstance(last_modified, datetime):
+        last_modified = last_modified.isoformat()
+    return obj['Key'], obj.get('Size'), last_modified, (obj.get('ETag') or '').strip('"') or None
+
+
+def _list_range(s3_client, bucket: str, start_after: Optional[str],
+                stop_after: Optional[str]) -> List[ObjectRow]:
+    """List keys k with start_after < k <= stop_after (open-ended when None)."""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    params = {'Bucket': bucket}
+    if start_after is not None:
+        params['StartAfter'] = start_after
+    rows = []
+    for page in paginator.paginate(**params):
+        for obj in page.get('Contents', []):
+            if stop_after is not None and obj['Key'] > stop_after:
+                return rows
+            rows.append(_object_row(obj))
+    return rows
+
+
+def discover_boundaries(s3_client, bucket: str) -> List[str]:
+    """
+    Range boundaries that follow the bucket's real key distribution.
+
+    Each probe fetches the first key after the previous prefix (MaxKeys=1).
+    A key with a division prefix (myd_, myh_, ...) contributes one boundary
+    per leading ID digits (myd_00 ... myd_99), so a division's keys are
+    spread across many ranges; any other key contributes its first
+    character. The probe then skips past that whole prefix, so the number of
+    requests is the number of distinct prefixes, not keys.
+    """
+    boundaries = []
+    start_after = None
+    for _ in range(MAX_PREFIX_PROBES):
+        params = {'Bucket': bucket, 'MaxKeys': 1}
+        if start_after is not None:
+            params['StartAfter'] = start_after
+        contents = s3_client.list_objects_v2(**params).get('Contents', [])
+        if not contents:
+            break
+        key = contents[0]['Key']
+        match = DIVISION_PREFIX_RE.match(key)
+        if match:
+            prefix = match.group(1)
+            boundaries.extend(f"{prefix}{n:0{ID_SPLIT_DIGITS}d}" for n in range(10 ** ID_SPLIT_DIGITS))
+        else:
+            prefix = key[0]
+        boundaries.append(prefix + KEY_SPACE_END)
+        start_after = prefix + KEY_SPACE_END
+    else:
+        logging.warning(f"Stopped probing s3://{bucket} after {MAX_PREFIX_PROBES} prefixes; "
+                        f"the remaining keys are listed as one range")
+    return boundaries
+
+
+def list_bucket_parallel(s3_client, bucket: str, workers: int = DEFAULT_LIST_WORKERS,
+                         boundaries: Optional[Iterable[str]] = None) -> Iterator[List[ObjectRow]]:
+    """
+    List a whole bucket by paginating disjoint key ranges concurrently.
+
+    The ranges (None, b0], (b0, b1], ..., (bn, None) cover the key space
+    exactly once, so the union of all ranges is the full bucket listing
+    whatever the boundaries; they only decide how evenly the work is split.
+    Boundaries default to discover_boundaries(). Yields one list of rows
+    per range, in key order.
+    """
+    if boundaries is None:
+        boundaries = discover_boundaries(s3_client, bucket)
+    edges = [None] + sorted(set(boundaries)) + [None]
+    ranges = list(zip(edges[:-1], edges[1:]))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(_list_range, s3_client, bucket, start, stop) for start, stop in ranges]
+        for future in futures:
+            yield future.result()
+
+
+def _open_text(path: Path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def _read_inventory_csv(path: Path, fields: List[str]) -> Iterator[ObjectRow]:
+    """Read an S3 Inventory CSV data file (no header, URL-encoded keys)."""
+    index = {name.strip(): i for i, name in enumerate(fields)}
+    with _open_text(path) as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            key = unquote(row[index['Key']])
+            size = row[index['Size']] if 'Size' in index else None
+            last_modified = row[index['LastModifiedDate']] if 'LastModifiedDate' in index else None
+            etag = row[index['ETag']] if 'ETag' in index else None
+            yield key, int(size) if size else None, last_modified or None, etag or None
+
+
+def _read_inventory_parquet(path: Path) -> Iterator[ObjectRow]:
+    import pandas as pd  # Parquet support needs pandas with pyarrow or fastparquet
+    df = pd.read_parquet(path)
+    columns = {c.lower(): c for c in df.columns}
+
+    def column(name):
+        return df[columns[name]] if name in columns else pd.Series([None] * len(df))
+
+    sizes = column('size')
+    modified = column('last_modified_date')
+    etags = column('e_tag')
+    for key, size, last_modified, etag in zip(df[columns['key']], sizes, modified, etags):
+        yield (key,
+               int(size) if pd.notna(size) else None,
+               str(last_modified) if pd.notna(last_modified) else None,
+               etag if pd.notna(etag) else None)
+
+
+class S3Inventory:
+    """Local SQLite index of one bucket's keys, keyed by AMI ID."""
+
+    def __init__(self, bucket: str, path: Optional[Path] = None):
+        self.bucket = bucket
+        self.path = Path(path) if path else DEFAULT_INVENTORY_DIR / f"{bucket}.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = self._connect(self.path)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(path))
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ----- metadata -----
+
+    def refreshed_at(self) -> Optional[float]:
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def is_stale(self, max_age_hours: float = DEFAULT_MAX_AGE_HOURS) -> bool:
+        refreshed = self.refreshed_at()
+        return refreshed is None or (time.time() - refreshed) > max_age_hours * 3600
+
+    def object_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0]
+
+    # ----- loading -----
+
+    @staticmethod
+    def _insert_rows(conn: sqlite3.Connection, rows: Iterable[ObjectRow]) -> int:
+        rows = list(rows)
+        conn.executemany("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?)", rows)
+        conn.executemany(
+            "INSERT OR IGNORE INTO ami_ids VALUES (?, ?)",
+            ((ami_id, row[0]) for row in rows for ami_id in extract_ami_ids(row[0]))
+        )
+        return len(rows)
+
+    def _replace_all(self, batches: Iterable[Iterable[ObjectRow]], source: str) -> int:
+        """Build a fresh index beside the current one and swap it in atomically."""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        if tmp_path.exists():
+            tmp_path.unlink()
+        tmp_conn = self._connect(tmp_path)
+        total = 0
+        try:
+            for batch in batches:
+                total += self._insert_rows(tmp_conn, batch)
+            tmp_conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [('bucket', self.bucket), ('refreshed_at', str(time.time())), ('source', source)]
+            )
+            tmp_conn.commit()
+        finally:
+            tmp_conn.close()
+        self.conn.close()
+        os.replace(tmp_path, self.path)
+        self.conn = self._connect(self.path)
+        return total
+
+    def refresh(self, s3_client, workers: int = DEFAULT_LIST_WORKERS) -> int:
+        """Re-list the whole bucket in parallel and replace the index; returns the key count."""
+        logging.info(f"Listing s3://{self.bucket} with {workers} parallel range listings...")
+        previous = self.object_count()
+        total = self._replace_all(list_bucket_parallel(s3_client, self.bucket, workers), 'list_objects_v2')
+        logging.info(f"S3 inventory refreshed: {total:,} keys ({total - previous:+,} since last refresh)")
+        return total
+
+    def refresh_prefix(self, s3_client, prefix: str) -> int:
+        """Re-list only keys under `prefix` and update just those index rows."""
+        paginator = s3_client.get_paginator('list_objects_v2')
+        rows = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            rows.extend(_object_row(obj) for obj in page.get('Contents', []))
+        upper = prefix + '\U0010ffff'
+        self.conn.execute("DELETE FROM ami_ids WHERE key >= ? AND key < ?", (prefix, upper))
+        self.conn.execute("DELETE FROM objects WHERE key >= ? AND key < ?", (prefix, upper))
+        count = self._insert_rows(self.conn, rows)
+        self.conn.commit()
+        return count
+
+    def add_keys(self, keys: Iterable[str]) -> None:
+        """Record keys just uploaded by this machine, without re-listing."""
+        self._insert_rows(self.conn, ((key, None, datetime.now().isoformat(), None) for key in keys))
+        self.conn.commit()
+
+    def ingest_inventory(self, path: Path) -> int:
+        """
+        Replace the index from an S3 Inventory report.
+
+        `path` may be a manifest.json (its data files are looked up beside it,
+        by key or by file name), or a single CSV, CSV.gz or Parquet data file.
+        """
+        path = Path(path)
+        if path.name.endswith('.json'):
+            manifest = json.loads(path.read_text())
+            fmt = manifest.get('fileFormat', 'CSV').upper()
+            fields = [f.strip() for f in manifest.get('fileSchema', '').split(',')]
+            data_files = []
+            for entry in manifest.get('files', []):
+                candidate = path.parent / entry['key']
+                data_files.append(candidate if candidate.exists() else path.parent / Path(entry['key']).name)
+        else:
+            fmt = 'PARQUET' if path.suffix == '.parquet' else 'CSV'
+            fields = ['Bucket', 'Key', 'Size', 'LastModifiedDate', 'ETag']
+            data_files = [path]
+
+        def batches():
+            for data_file in data_files:
+                if fmt == 'PARQUET':
+                    yield _read_inventory_parquet(data_file)
+                else:
+                    yield _read_inventory_csv(data_file, fields)
+
+        total = self._replace_all(batches(), f'inventory:{path.name}')
+        logging.info(f"S3 inventory ingested from {path}: {total:,} keys")
+        return total
+
+    # ----- lookups -----
+
+    def keys_for_id(self, ami_id) -> List[str]:
+        ami_id = f"{int(ami_id):06d}"
+        return [row[0] for row in self.conn.execute(
+            "SELECT key FROM ami_ids WHERE ami_id = ? ORDER BY key", (ami_id,)
+        )]
+
+    def id_map(self) -> Dict[str, List[str]]:
+        """Mapping of every AMI ID to its keys (keys sorted)."""
+        mapping: Dict[str, List[str]] = {}
+        for ami_id, key in self.conn.execute("SELECT ami_id, key FROM ami_ids ORDER BY ami_id, key"):
+            mapping.setdefault(ami_id, []).append(key)
+        return mapping
+
+    def all_ids(self) -> Set[str]:
+        return {row[0] for row in self.conn.execute("SELECT DISTINCT ami_id FROM ami_ids")}
+
+    def existing_keys(self, keys: Iterable[str]) -> Set[str]:
+        """Subset of `keys` present in the inventory."""
+        keys = list(keys)
+        found = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT key FROM objects WHERE key IN ({placeholders})", chunk
+            ))
+        return found
+
+    def iter_objects(self) -> Iterator[ObjectRow]:
+        yield from self.conn.execute("SELECT key, size, last_modified, etag FROM objects ORDER BY key")
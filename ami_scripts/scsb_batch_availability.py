@@ -4,74 +4,25 @@ import argparse
 import csv
 import logging
 import os
-import requests
-import time
-from typing import List, Dict
+
+try:
+    from ami_scripts.catalog_clients import (SCSBClient, ResponseCache, SCSB_BATCH_SIZE,
+                                             DEFAULT_CONCURRENCY, DEFAULT_CACHE_TTL)
+except ImportError:
+    from catalog_clients import SCSBClient, ResponseCache, SCSB_BATCH_SIZE, DEFAULT_CONCURRENCY, DEFAULT_CACHE_TTL
 
 # Set up logging. Adjust level to DEBUG if you need extra detail:
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
-def get_scsb_availability(barcodes: List[str]) -> Dict[str, str]:
-    """
-    Retrieves item availability for a list of barcodes from the SCSB API.
-    Returns a dict {barcode: availability or error_message}.
-    """
-    # Log which barcodes we're about to call with
-    logging.info(f"Calling SCSB API for barcodes: {barcodes}")
-
-    api_key = os.getenv("SCSB_API_KEY")
-    url = os.getenv("SCSB_API_URL")  # e.g., https://[some_endpoint]/sharedCollection/itemAvailabilityStatus
-
-    if not api_key or not url:
-        logging.error("SCSB_API_KEY or SCSB_API_URL environment variables not set.")
-        # Return an error status for each barcode.
-        return {bc: "Error: Missing API credentials/URL" for bc in barcodes}
-
-    headers = {
-        'Accept': 'application/json',
-        'api_key': api_key,
-        'Content-Type': 'application/json'
-    }
-    payload = {
-        "barcodes": barcodes
-    }
-
-    try:
-        response = requests.post(url, json=payload, headers=headers)
-        if response.status_code == 200:
-            try:
-                # response.json() should be a list of dicts,
-                # e.g. [{"itemBarcode": "33433068831985", "itemAvailabilityStatus": "Available", ...}]
-                results = response.json() or []
-            except Exception as parse_exc:
-                logging.error(f"Failed to parse JSON response: {parse_exc}")
-                return {bc: f"Error: JSON parse error - {parse_exc}" for bc in barcodes}
-
-            availability_dict = {}
-
-            print("")
-            for item in results:
-                bc = item.get("itemBarcode", "")
-                status = item.get("itemAvailabilityStatus", "unknown")
-
-                # Log each barcode’s status
-                logging.info(f"For barcode {bc}, got status: {status}")
-                availability_dict[bc] = status
-
-            return availability_dict
-        else:
-            logging.error(f"SCSB API returned status code: {response.status_code}")
-            # Return an error status for each barcode in this batch
-            return {bc: f"Error: API returned {response.status_code}" for bc in barcodes}
-    except Exception as e:
-        logging.error(f"SCSB API request failed: {e}")
-        return {bc: f"Error: {str(e)}" for bc in barcodes}
-
-
 def main():
     parser = argparse.ArgumentParser(description="Check SCSB availability for barcodes in a CSV.")
     parser.add_argument("input_csv", help="Path to the input CSV file.")
     parser.add_argument("output_csv", help="Path to the output CSV file.")
+    parser.add_argument("--batch-size", type=int, default=SCSB_BATCH_SIZE, help=f"Barcodes per SCSB request (default: {SCSB_BATCH_SIZE}).")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"Maximum concurrent requests (default: {DEFAULT_CONCURRENCY}).")
+    parser.add_argument("--rate", type=float, default=0.2, help="Maximum requests per second (default: 0.2, i.e. one every 5 seconds).")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL / 3600,
+                        help=f"Reuse cached availability up to this many hours old; 0 disables the cache (default: {DEFAULT_CACHE_TTL // 3600}).")
     args = parser.parse_args()
 
     input_path = args.input_csv
@@ -93,22 +44,22 @@ def main():
             rows.append(r)
             barcodes.append(bc_str)
 
-    # Prepare to store barcode -> availability result
-    availability_map = {}
-
     logging.info(f"Total barcodes read: {len(barcodes)}")
 
-    # Batch up barcodes in groups of up to 100
-    batch_size = 100
-    for i in range(0, len(barcodes), batch_size):
-        batch = barcodes[i:i+batch_size]
-        # Log the batch info
-        logging.info(f"Processing batch {i//batch_size + 1}, barcodes {i} to {i+len(batch)-1}")
-        batch_result = get_scsb_availability(batch)
-        # Merge into the availability_map
-        availability_map.update(batch_result)
-        # Delay 1 second between calls to stay polite
-        time.sleep(5)
+    api_key = os.getenv("SCSB_API_KEY")
+    url = os.getenv("SCSB_API_URL")
+    if not api_key or not url:
+        logging.error("SCSB_API_KEY or SCSB_API_URL environment variables not set.")
+        availability_map = {bc: "Error: Missing API credentials/URL" for bc in barcodes}
+    else:
+        # Batches of up to --batch-size barcodes, --concurrency in flight, at most --rate requests/sec
+        cache = ResponseCache(ttl=args.cache_ttl * 3600) if args.cache_ttl > 0 else None
+        client = SCSBClient(url, api_key, batch_size=args.batch_size, concurrency=args.concurrency,
+                            rate=args.rate, cache=cache)
+        availability_map = client.availability(barcodes)
+        logging.info(f"Made {client.requests_made} SCSB requests for {len(set(barcodes))} unique barcodes")
+        if cache:
+            cache.close()
 
     # Write out the output CSV
     fieldnames = ["SPEC_ID", "id_barcode", "building", "room", "row", "SCSB_availability"]
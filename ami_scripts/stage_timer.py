@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Per-stage wall-clock accounting for the multi-stage (rip / OCR / analysis /
+encode ...) pipelines, safe to use from worker threads.
+
+    timer = StageTimer()
+    with timer.stage('encode'):
+        ...
+    timer.log_summary(wall_seconds)
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Thread-safe accumulator of wall-clock time spent in each pipeline stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.durations[name].append(elapsed)
+
+    def log_summary(self, wall_seconds: float) -> None:
+        """Log count, total, mean and max time per stage, plus overall wall time."""
+        logger.info("Stage timing summary:")
+        logger.info(f"  {'stage':<10} {'runs':>6} {'total s':>10} {'mean s':>9} {'max s':>9}")
+        for name, times in self.durations.items():
+            total = sum(times)
+            logger.info(f"  {name:<10} {len(times):>6} {total:>10.1f} "
+                        f"{total / len(times):>9.1f} {max(times):>9.1f}")
+        logger.info(f"  wall clock: {wall_seconds:.1f} s")
+
+
+def timed(timer: Optional[StageTimer], name: str):
+    """timer.stage(name), or a no-op context when no timer is in use."""
+    return timer.stage(name) if timer else nullcontext()
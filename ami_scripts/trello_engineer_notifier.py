@@ -4,6 +4,11 @@ import os
 import argparse
 import requests
 
+try:
+    from ami_scripts.trello_snapshot import TrelloSnapshot
+except ImportError:
+    from trello_snapshot import TrelloSnapshot
+
 # Set up the argument parser
 parser = argparse.ArgumentParser(description="Move a Trello card to an engineer's specific list and notify them")
 parser.add_argument('-c', '--card', required=True, help='Card ID to be moved')
@@ -31,18 +36,17 @@ def get_list_id(engineer_name):
 def get_card_id_by_name(board_id, card_name):
     api_key = os.getenv('TRELLO_API_KEY')
     token = os.getenv('TRELLO_TOKEN')
-    url = f"https://api.trello.com/1/boards/{board_id}/cards?key={api_key}&token={token}"
-    response = requests.get(url)
-    if response.status_code != 200:
-        print(f"Failed to fetch cards, status code: {response.status_code}")
-        print("Response text:", response.text)
-        return None
-
-    cards = response.json()
-    for card in cards:
-        if card['name'].strip().lower() == card_name.strip().lower():
-            print(f"Found card: {card['name']} with ID: {card['id']}")
-            return card['id']
+    with TrelloSnapshot(board_id, api_key, token) as snapshot:
+        try:
+            snapshot.sync()
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to sync board snapshot: {e}")
+            return None
+        card = snapshot.find_card(card_name)
+
+    if card:
+        print(f"Found card: {card['name']} with ID: {card['id']}")
+        return card['id']
     
     print(f"No card found with the name: {card_name}")
     return None
@@ -151,6 +155,8 @@ def main():
         result = move_card(card_id, list_id, 'bottom')
         if result and 'id' in result:
             print(f"Card successfully moved to {args.engineer}'s list.")
+            with TrelloSnapshot(board_id, os.getenv('TRELLO_API_KEY'), os.getenv('TRELLO_TOKEN')) as snapshot:
+                snapshot.record_move(card_id, list_id)
             notification_result = assign_member(card_id, args.engineer)
             if 'id' in notification_result:
                 print("Engineer notified successfully.")
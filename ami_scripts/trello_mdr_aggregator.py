@@ -6,6 +6,11 @@ import requests
 import csv
 from datetime import datetime
 
+try:
+    from ami_scripts.trello_snapshot import TrelloSnapshot
+except ImportError:
+    from trello_snapshot import TrelloSnapshot
+
 # --- CONFIGURATION ---
 # Set this to False if you want to see projects that are 100% in QC
 HIDE_COMPLETED = True 
@@ -20,14 +25,11 @@ class Color:
     DIM = '\033[2m'
     END = '\033[0m'
 
-def get_trello_data(url, api_key, token):
-    """Helper function to cleanly fetch data from Trello."""
-    params = {'key': api_key, 'token': token}
-    response = requests.get(url, params=params)
-    if response.status_code != 200:
-        print(f"{Color.RED}Error fetching data: {response.status_code} - {response.text}{Color.END}")
-        return None
-    return response.json()
+def load_board(board_id, api_key, token):
+    """Sync the local snapshot of a board and return (list id -> name, cards)."""
+    with TrelloSnapshot(board_id, api_key, token) as snapshot:
+        snapshot.sync()
+        return snapshot.lists(), snapshot.cards()
 
 def main():
     api_key = os.getenv('TRELLO_API_KEY')
@@ -39,18 +41,15 @@ def main():
         print(f"{Color.RED}Missing environment variables. Please check your .zshrc.{Color.END}")
         return
 
-    print("Fetching Board Data... this takes a few seconds.\n")
-
-    # Fetch Lists mapping
-    prod_lists_data = get_trello_data(f"https://api.trello.com/1/boards/{prod_board_id}/lists", api_key, token)
-    qc_lists_data = get_trello_data(f"https://api.trello.com/1/boards/{qc_board_id}/lists", api_key, token)
-    
-    prod_lists = {lst['id']: lst['name'] for lst in prod_lists_data} if prod_lists_data else {}
-    qc_lists = {lst['id']: lst['name'] for lst in qc_lists_data} if qc_lists_data else {}
+    print("Syncing Board Data...\n")
 
-    # Fetch all Cards
-    prod_cards = get_trello_data(f"https://api.trello.com/1/boards/{prod_board_id}/cards", api_key, token)
-    qc_cards = get_trello_data(f"https://api.trello.com/1/boards/{qc_board_id}/cards", api_key, token)
+    # Lists mapping and all cards, from the local snapshots (refreshed from the actions feed)
+    try:
+        prod_lists, prod_cards = load_board(prod_board_id, api_key, token)
+        qc_lists, qc_cards = load_board(qc_board_id, api_key, token)
+    except requests.RequestException as e:
+        print(f"{Color.RED}Error fetching data: {e}{Color.END}")
+        return
 
     report_data = {}
     total_projects = 0
@@ -3,44 +3,52 @@
 import os
 import requests
 
+try:
+    from ami_scripts.trello_snapshot import TrelloSnapshot
+except ImportError:
+    from trello_snapshot import TrelloSnapshot
+
 
 def move_cards(source_list_id, target_list_id):
     api_key = os.getenv('TRELLO_API_KEY')
     token = os.getenv('TRELLO_TOKEN')
     
-    # Get the correct target board ID from the target list
-    url_get_list = f"https://api.trello.com/1/lists/{target_list_id}?key={api_key}&token={token}"
-    list_response = requests.get(url_get_list)
-    if list_response.status_code == 200:
-        list_details = list_response.json()
-        target_board_id = list_details['idBoard']  # This ensures you are using the correct board ID
-        print(f"Target list details: {list_details}")
-    else:
-        print(f"Failed to fetch target list details: {list_response.text}")
+    try:
+        # Board of the target list, from a local snapshot if one already knows the list
+        with TrelloSnapshot.for_list(target_list_id, api_key, token) as target:
+            target_board_id = target.board_id
+        print(f"Target board: {target_board_id}")
+        source = TrelloSnapshot.for_list(source_list_id, api_key, token)
+    except requests.RequestException as e:
+        print(f"Failed to fetch target list details: {e}")
         return
 
-    url_get_cards = f"https://api.trello.com/1/lists/{source_list_id}/cards?key={api_key}&token={token}"
-    cards_response = requests.get(url_get_cards)
-    if cards_response.status_code != 200:
-        print("Failed to fetch cards:", cards_response.status_code, cards_response.text)
-        return
+    with source:
+        try:
+            source.sync()
+        except requests.RequestException as e:
+            print(f"Failed to fetch cards: {e}")
+            return
+        cards = source.cards(source_list_id)
+        print(f"Moving {len(cards)} cards from the source list to the target list.")
 
-    cards = cards_response.json()
-    print(f"Moving {len(cards)} cards from the source list to the target list.")
-
-    for card in cards:
-        url_move_card = f"https://api.trello.com/1/cards/{card['id']}"
-        params = {
-            'key': api_key,
-            'token': token,
-            'idList': target_list_id,
-            'idBoard': target_board_id  # Use the correct board ID obtained from the list details
-        }
-        move_response = requests.put(url_move_card, params=params)
-        if move_response.status_code != 200:
-            print(f"Failed to move card {card['id']} to list {target_list_id} on board {target_board_id}: {move_response.text}")
-        else:
-            print(f"Card {card['id']} moved successfully to list {target_list_id} on board {target_board_id}.")
+        for card in cards:
+            url_move_card = f"https://api.trello.com/1/cards/{card['id']}"
+            params = {
+                'key': api_key,
+                'token': token,
+                'idList': target_list_id,
+                'idBoard': target_board_id  # Use the correct board ID obtained from the list details
+            }
+            move_response = requests.put(url_move_card, params=params)
+            if move_response.status_code != 200:
+                print(f"Failed to move card {card['id']} to list {target_list_id} on board {target_board_id}: {move_response.text}")
+            else:
+                print(f"Card {card['id']} moved successfully to list {target_list_id} on board {target_board_id}.")
+                if source.board_id == target_board_id:
+                    source.record_move(card['id'], target_list_id)
+                else:
+                    source.record_removal(card['id'])
 
 def main():
     source_list_id = os.getenv('TRELLO_QCQUEUE_LIST_ID')
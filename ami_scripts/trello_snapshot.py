@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Local snapshot of Trello boards shared by the trello_* scripts.
+
+Each board is kept in a small SQLite file holding its lists and cards, with
+an index on normalized card names. The first sync loads the whole board in
+one request (board + lists + cards). Later syncs ask only for the board's
+actions since the last one seen and apply the card/list changes they
+describe. If the action feed cannot be applied (too many actions, or an
+unreadable action), the board is simply reloaded.
+
+    snapshot = TrelloSnapshot(board_id, api_key, token)
+    snapshot.sync()
+    card = snapshot.find_card('MDR1234 Box 5')
+"""
+
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+API_ROOT = "https://api.trello.com/1"
+DEFAULT_SNAPSHOT_DIR = Path(
+    os.environ.get('AMI_TRELLO_SNAPSHOT_DIR', Path.home() / '.ami_trello')
+)
+ACTIONS_LIMIT = 1000
+
+CARD_CREATE_ACTIONS = {'createCard', 'copyCard', 'convertToCardFromCheckItem', 'moveCardToBoard'}
+CARD_REMOVE_ACTIONS = {'deleteCard', 'moveCardFromBoard'}
+LIST_CREATE_ACTIONS = {'createList', 'moveListToBoard'}
+SYNC_ACTIONS = sorted(CARD_CREATE_ACTIONS | CARD_REMOVE_ACTIONS | LIST_CREATE_ACTIONS |
+                      {'updateCard', 'updateList', 'moveListFromBoard'})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lists (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    closed INTEGER DEFAULT 0,
+    pos REAL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    name_key TEXT,
+    id_list TEXT,
+    closed INTEGER DEFAULT 0,
+    pos REAL
+);
+CREATE INDEX IF NOT EXISTS cards_name_key ON cards (name_key);
+CREATE INDEX IF NOT EXISTS cards_id_list ON cards (id_list);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class _ReloadNeeded(Exception):
+    """An action refers to cards the snapshot never saw (e.g. an unarchived list)."""
+
+
+def name_key(name: str) -> str:
+    """Normalized form used for card-name lookups (case and surrounding space ignored)."""
+    return (name or '').strip().lower()
+
+
+def trello_get(path: str, api_key: str, token: str, **params) -> Any:
+    params.update({'key': api_key, 'token': token})
+    response = requests.get(f"{API_ROOT}{path}", params=params, timeout=60)
+    response.raise_for_status()
+    return response.json()
+
+
+class TrelloSnapshot:
+    """Cached lists and cards of one Trello board."""
+
+    def __init__(self, board_id: str, api_key: str, token: str, path: Optional[Path] = None):
+        self.board_id = board_id
+        self.api_key = api_key
+        self.token = token
+        self.path = Path(path) if path else DEFAULT_SNAPSHOT_DIR / f"{board_id}.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+        self.api_calls = 0
+
+    @classmethod
+    def for_list(cls, list_id: str, api_key: str, token: str) -> 'TrelloSnapshot':
+        """Open the snapshot of the board that owns `list_id`, looking the board up only if no snapshot has it."""
+        if DEFAULT_SNAPSHOT_DIR.exists():
+            for snapshot_file in sorted(DEFAULT_SNAPSHOT_DIR.glob('*.sqlite')):
+                with sqlite3.connect(str(snapshot_file)) as conn:
+                    try:
+                        if conn.execute("SELECT 1 FROM lists WHERE id = ?", (list_id,)).fetchone():
+                            return cls(snapshot_file.stem, api_key, token)
+                    except sqlite3.DatabaseError:
+                        continue
+        board_id = trello_get(f"/lists/{list_id}", api_key, token, fields='idBoard')['idBoard']
+        return cls(board_id, api_key, token)
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get(self, path: str, **params) -> Any:
+        self.api_calls += 1
+        return trello_get(path, self.api_key, self.token, **params)
+
+    def _meta(self, name: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, **values) -> None:
+        self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", values.items())
+
+    # ----- syncing -----
+
+    def sync(self) -> None:
+        """Bring the snapshot up to date: full load the first time, action deltas afterwards."""
+        since = self._meta('last_action_date')
+        if since is None:
+            self.reload()
+            return
+        actions = self._get(f"/boards/{self.board_id}/actions", since=since,
+                            filter=','.join(SYNC_ACTIONS), limit=ACTIONS_LIMIT)
+        if len(actions) >= ACTIONS_LIMIT:
+            logging.info(f"{len(actions)}+ Trello actions since last sync; reloading board {self.board_id}")
+            self.reload()
+            return
+        try:
+            # The feed is newest first; apply oldest first
+            for action in reversed(actions):
+                self._apply(action)
+        except (KeyError, TypeError, _ReloadNeeded) as e:
+            logging.warning(f"Could not apply Trello action ({e}); reloading board {self.board_id}")
+            self.conn.rollback()
+            self.reload()
+            return
+        if actions:
+            self._set_meta(last_action_date=actions[0]['date'])
+        self._set_meta(synced_at=datetime.now(timezone.utc).isoformat())
+        self.conn.commit()
+
+    def reload(self) -> None:
+        """Replace the snapshot with the full board, fetched in a single request."""
+        board = self._get(
+            f"/boards/{self.board_id}",
+            lists='open', list_fields='name,closed,pos',
+            cards='visible', card_fields='name,idList,closed,pos',
+            actions='all', actions_limit=1, action_fields='date',
+        )
+        self.conn.execute("DELETE FROM lists")
+        self.conn.execute("DELETE FROM cards")
+        self.conn.executemany(
+            "INSERT INTO lists VALUES (?, ?, ?, ?)",
+            [(lst['id'], lst['name'], int(lst.get('closed', False)), lst.get('pos')) for lst in board.get('lists', [])]
+        )
+        self.conn.executemany(
+            "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?)",
+            [(card['id'], card['name'], name_key(card['name']), card['idList'], int(card.get('closed', False)),
+              card.get('pos')) for card in board.get('cards', [])]
+        )
+        actions = board.get('actions') or []
+        last_action = actions[0]['date'] if actions else datetime.now(timezone.utc).isoformat()
+        self._set_meta(last_action_date=last_action, synced_at=datetime.now(timezone.utc).isoformat())
+        self.conn.commit()
+
+    def _apply(self, action: Dict[str, Any]) -> None:
+        kind = action['type']
+        data = action['data']
+        if kind in CARD_CREATE_ACTIONS:
+            card = data['card']
+            list_id = card.get('idList') or data['list']['id']
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cards VALUES (?, ?, ?, ?, 0, ?)",
+                (card['id'], card['name'], name_key(card['name']), list_id, card.get('pos'))
+            )
+        elif kind in CARD_REMOVE_ACTIONS:
+            self.conn.execute("DELETE FROM cards WHERE id = ?", (data['card']['id'],))
+        elif kind == 'updateCard':
+            card = data['card']
+            changes = {}
+            if 'name' in card:
+                changes.update(name=card['name'], name_key=name_key(card['name']))
+            if 'idList' in card:
+                changes['id_list'] = card['idList']
+            elif 'listAfter' in data:
+                changes['id_list'] = data['listAfter']['id']
+            if 'closed' in card:
+                changes['closed'] = int(card['closed'])
+            if 'pos' in card:
+                changes['pos'] = card['pos']
+            if not self.conn.execute("SELECT 1 FROM cards WHERE id = ?", (card['id'],)).fetchone():
+                if not card.get('closed', False):
+                    raise _ReloadNeeded(f"unknown card {card['id']}")
+                return
+            if changes:
+                assignments = ', '.join(f"{column} = ?" for column in changes)
+                self.conn.execute(f"UPDATE cards SET {assignments} WHERE id = ?", (*changes.values(), card['id']))
+        elif kind in LIST_CREATE_ACTIONS:
+            lst = data['list']
+            self.conn.execute("INSERT OR REPLACE INTO lists VALUES (?, ?, 0, ?)", (lst['id'], lst['name'], lst.get('pos')))
+        elif kind == 'updateList':
+            lst = data['list']
+            if 'name' in lst:
+                self.conn.execute("UPDATE lists SET name = ? WHERE id = ?", (lst['name'], lst['id']))
+            if 'closed' in lst:
+                if not lst['closed']:
+                    raise _ReloadNeeded(f"list {lst['id']} unarchived")
+                self.conn.execute("UPDATE lists SET closed = ? WHERE id = ?", (int(lst['closed']), lst['id']))
+            if 'pos' in lst:
+                self.conn.execute("UPDATE lists SET pos = ? WHERE id = ?", (lst['pos'], lst['id']))
+        elif kind == 'moveListFromBoard':
+            self.conn.execute("DELETE FROM lists WHERE id = ?", (data['list']['id'],))
+
+    def record_move(self, card_id: str, list_id: str) -> None:
+        """Reflect a card move made by the caller, so the snapshot is current before the next sync."""
+        self.conn.execute("UPDATE cards SET id_list = ? WHERE id = ?", (list_id, card_id))
+        self.conn.commit()
+
+    def record_removal(self, card_id: str) -> None:
+        """Reflect a card moved off this board by the caller."""
+        self.conn.execute("DELETE FROM cards WHERE id = ?", (card_id,))
+        self.conn.commit()
+
+    # ----- lookups -----
+
+    def lists(self) -> Dict[str, str]:
+        """Mapping of open list ID to list name, in board order."""
+        return {row['id']: row['name'] for row in self.conn.execute(
+            "SELECT id, name FROM lists WHERE closed = 0 ORDER BY pos")}
+
+    def cards(self, list_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Open cards on open lists (optionally one list), as dicts with id, name and idList, in board order."""
+        sql = ("SELECT c.id, c.name, c.id_list FROM cards c JOIN lists l ON l.id = c.id_list "
+               "WHERE c.closed = 0 AND l.closed = 0")
+        params = ()
+        if list_id is not None:
+            sql += " AND c.id_list = ?"
+            params = (list_id,)
+        sql += " ORDER BY l.pos, c.pos"
+        return [{'id': row['id'], 'name': row['name'], 'idList': row['id_list']}
+                for row in self.conn.execute(sql, params)]
+
+    def find_card(self, card_name: str) -> Optional[Dict[str, Any]]:
+        """Look up an open card by name (case-insensitive) through the name index."""
+        row = self.conn.execute(
+            "SELECT id, name, id_list FROM cards WHERE name_key = ? AND closed = 0 LIMIT 1", (name_key(card_name),)
+        ).fetchone()
+        return {'id': row['id'], 'name': row['name'], 'idList': row['id_list']} if row else None
+
+    def has_list(self, list_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM lists WHERE id = ?", (list_id,)).fetchone() is not None
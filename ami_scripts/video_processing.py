@@ -9,20 +9,37 @@ import itertools
 import csv
 import re
 import logging
+import threading
+import time
 from pymediainfo import MediaInfo
 import importlib.util
 import json
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Iterable, Optional
 
 # IMPORTANT: Ensure numpy is installed in your environment (pip install numpy)
 import numpy as np
 
+try:
+    from ami_scripts.audio_analysis import probe_audio_streams, analyze_stream, empty_levels
+    from ami_scripts.ltc_decoder import detect_ltc, format_timecode
+    from ami_scripts.stage_timer import StageTimer
+except ImportError:
+    from audio_analysis import probe_audio_streams, analyze_stream, empty_levels
+    from ltc_decoder import detect_ltc, format_timecode
+    from stage_timer import StageTimer
+
 LOGGER = logging.getLogger(__name__)
 video_extensions = {'.mkv', '.mov', '.mp4', '.dv', '.iso'}
 audio_extensions = {'.wav', '.flac'}
 
+# Concurrent service copy encodes; the cores are split between them as x264 threads
+DEFAULT_ENCODE_JOBS = max(1, (os.cpu_count() or 4) // 4)
+# framemd5 runs are decode-bound (FFV1 decodes in parallel slices), so a few at a time is enough
+DEFAULT_FRAMEMD5_JOBS = max(1, min(4, (os.cpu_count() or 1) // 4))
+
 # ---------------------------------------------------------------------------
 # Colorbar Detection Configuration / tunables
 # ---------------------------------------------------------------------------
@@ -464,21 +481,111 @@ def rename_files(input_directory, extensions):
                 shutil.move(file, new_file)
                 LOGGER.info(f"Renamed file: {file.name} -> {new_file.name}")
 
-def convert_mkv_dv_to_mp4(input_directory, audio_pan, force_16x9=False, trim_colorbars=False):
+@dataclass
+class ServiceCopyJob:
+    input_file: pathlib.Path
+    output_file: Optional[pathlib.Path]
+    command: Optional[list]
+    master_command: Optional[list] = None      # FFV1 preservation master transcode (MOV sources)
+    master_file: Optional[pathlib.Path] = None
+    framemd5_file: Optional[pathlib.Path] = None
+
+class ServiceCopyScheduler:
+    """
+    Runs the analysis of the next file (ffprobe, colorbar detection, audio pan analysis)
+    on the calling thread while earlier files encode. At most encode_jobs encodes run at
+    once, each with an equal share of the cores as x264 threads, and analysis stays at
+    most one file ahead of them.
+    """
+
+    def __init__(self, encode_jobs=DEFAULT_ENCODE_JOBS):
+        self.encode_jobs = max(1, encode_jobs)
+        # ffmpeg's own thread default when encoding one file at a time
+        self.encode_threads = max(1, (os.cpu_count() or 1) // self.encode_jobs) if self.encode_jobs > 1 else None
+        self.timer = StageTimer()
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def _record(self, file, stage, seconds):
+        with self._lock:
+            self.timings.setdefault(file.name, {})[stage] = seconds
+
+    def _encode(self, job, slots):
+        try:
+            start = time.perf_counter()
+            try:
+                with self.timer.stage("encode"):
+                    return encode_service_copy(job, threads=self.encode_threads, quiet=self.encode_jobs > 1)
+            finally:
+                self._record(job.input_file, "encode", time.perf_counter() - start)
+        finally:
+            slots.release()
+
+    def run(self, files, plan):
+        """Analyze each file with plan(file) -> ServiceCopyJob or None, then encode it; returns the MP4 paths."""
+        start = time.perf_counter()
+        slots = threading.Semaphore(self.encode_jobs + 1)
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.encode_jobs) as executor:
+            for file in files:
+                slots.acquire()
+                analysis_start = time.perf_counter()
+                try:
+                    with self.timer.stage("analysis"):
+                        job = plan(file)
+                except BaseException:
+                    slots.release()
+                    raise
+                finally:
+                    self._record(file, "analysis", time.perf_counter() - analysis_start)
+                if job is None:
+                    slots.release()
+                    continue
+                futures.append((file, executor.submit(self._encode, job, slots)))
+
+        outputs, failures = [], []
+        for file, future in futures:
+            try:
+                outputs.append(future.result())
+            except Exception as e:
+                LOGGER.error(f"Service copy encode failed for {file.name}: {e}")
+                failures.append(e)
+
+        self.log_report(time.perf_counter() - start)
+        if failures:
+            raise failures[0]
+        return outputs
+
+    def log_report(self, wall_seconds):
+        LOGGER.info(f"Service copy timing ({self.encode_jobs} encode job(s)"
+                    + (f" x {self.encode_threads} threads):" if self.encode_threads else "):"))
+        LOGGER.info(f"  {'file':<40} {'analysis s':>11} {'encode s':>10}")
+        for name, stages in self.timings.items():
+            encode = f"{stages['encode']:.1f}" if "encode" in stages else "-"
+            LOGGER.info(f"  {name:<40} {stages.get('analysis', 0.0):>11.1f} {encode:>10}")
+        self.timer.log_summary(wall_seconds)
+
+def convert_mkv_dv_to_mp4(input_directory, audio_pan, force_16x9=False, trim_colorbars=False, framemd5=False,
+                          encode_jobs=DEFAULT_ENCODE_JOBS):
     mkv_files = sorted(input_directory.glob("*.mkv"))
     dv_files  = sorted(input_directory.glob("*.dv"))
     
     if mkv_files or dv_files:
         LOGGER.info("Converting MKV and DV to MP4...")
-        for file in itertools.chain(mkv_files, dv_files):
-            convert_to_mp4(file, input_directory, audio_pan, force_16x9, trim_colorbars)
+        ServiceCopyScheduler(encode_jobs).run(
+            itertools.chain(mkv_files, dv_files),
+            lambda file: plan_mp4(file, input_directory, audio_pan, force_16x9, trim_colorbars, framemd5=framemd5)
+        )
 
-def process_mov_files(input_directory, audio_pan, force_16x9=False, trim_colorbars=False):
+def process_mov_files(input_directory, audio_pan, force_16x9=False, trim_colorbars=False,
+                      encode_jobs=DEFAULT_ENCODE_JOBS):
     mov_files = list(input_directory.glob("*.mov"))
     if mov_files:
         LOGGER.info("Processing MOV files...")
-        for mov_file in mov_files:
-            convert_mov_file(mov_file, input_directory, audio_pan, force_16x9, trim_colorbars)
+        ServiceCopyScheduler(encode_jobs).run(
+            mov_files,
+            lambda mov_file: plan_mov_file(mov_file, input_directory, audio_pan, force_16x9, trim_colorbars)
+        )
 
 def rename_mkv_parts(input_directory):
     mkv_files = list(input_directory.glob("*_part*.mkv"))
@@ -550,15 +657,52 @@ def process_hdv_files(input_directory):
 
     return hdv_files
 
-def generate_framemd5_files(input_directory):
+def framemd5_path(file):
+    return file.with_name(f"{file.stem}.framemd5")
+
+def framemd5_is_current(file, output_file):
+    # An empty or older framemd5 is left over from an interrupted or earlier run
+    try:
+        output_stat = output_file.stat()
+    except FileNotFoundError:
+        return False
+    return output_stat.st_size > 0 and output_stat.st_mtime >= file.stat().st_mtime
+
+def framemd5_output_args(temp_file):
+    # Output options only: with no -map, this output gets ffmpeg's default video stream
+    # selection, matching a standalone `ffmpeg -i file -f framemd5 -an out` run
+    return ["-f", "framemd5", "-an", str(temp_file)]
+
+def framemd5_temp_path(output_file):
+    temp_file = output_file.with_name(output_file.name + ".tmp")
+    if temp_file.exists():
+        temp_file.unlink()
+    return temp_file
+
+def write_framemd5(file):
+    output_file = framemd5_path(file)
+    temp_file = framemd5_temp_path(output_file)
+    command = ["ffmpeg", "-i", str(file)] + framemd5_output_args(temp_file)
+    result = subprocess.run(command)
+    if result.returncode == 0 and temp_file.exists():
+        temp_file.replace(output_file)
+        LOGGER.info(f"framemd5 created: {output_file.name}")
+        return True
+    LOGGER.error(f"framemd5 generation failed for {file.name}")
+    if temp_file.exists():
+        temp_file.unlink()
+    return False
+
+def generate_framemd5_files(input_directory, jobs=DEFAULT_FRAMEMD5_JOBS):
     mkv_files = sorted(input_directory.glob("*.mkv"))
     if mkv_files:
         LOGGER.info("Generating framemd5 files...")
-        for file in mkv_files:
-            output_file = input_directory / f"{file.stem}.framemd5"
-            if not output_file.exists():
-                command = ["ffmpeg", "-i", str(file), "-f", "framemd5", "-an", str(output_file)]
-                subprocess.run(command)
+        pending = [file for file in mkv_files if not framemd5_is_current(file, framemd5_path(file))]
+        if len(pending) < len(mkv_files):
+            LOGGER.info(f"{len(mkv_files) - len(pending)} framemd5 file(s) already up to date.")
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(pending)))) as executor:
+                list(executor.map(write_framemd5, pending))
 
 def module_exists(module_name):
     return importlib.util.find_spec(module_name) is not None
@@ -587,136 +731,36 @@ def transcribe_directory(input_directory, model, output_format):
             output_writer = whisper.utils.get_writer(output_format, str(file.parent))
             output_writer(transcription_response, file.stem)
 
-def detect_ltc_in_channel(input_file, stream_index, channel, probe_duration=240, match_threshold=6, min_unique=4, min_monotonic_ratio=0.6, fps_candidates=(24, 25, 30), start_time=0.0):
-    pan_filter = 'pan=mono|c0=c0' if channel == 'left' else 'pan=mono|c0=c1'
-    ffmpeg_command = ["ffmpeg", "-hide_banner", "-nostats", "-loglevel", "error"]
-    if start_time > 0.0:
-        ffmpeg_command.extend(["-ss", f"{start_time:.6f}"])
-    ffmpeg_command.extend([
-        "-t", str(probe_duration),
-        "-i", str(input_file), "-map", f"0:{stream_index}", "-af", pan_filter,
-        "-ar", "48000", "-ac", "1", "-f", "wav", "pipe:1"
-    ])
-    ltcdump_command = ["ltcdump", "-"]
-
-    ffmpeg_proc = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    ltcdump_proc = subprocess.Popen(ltcdump_command, stdin=ffmpeg_proc.stdout, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    ffmpeg_proc.stdout.close()
-    ltcdump_out, ltcdump_err = ltcdump_proc.communicate()
-    ffmpeg_proc.wait()
-
-    LOGGER.info(f"ltcdump output: {ltcdump_out}")
-
-    tc_pat = re.compile(r'(?P<h>\d{2}):(?P<m>\d{2}):(?P<s>\d{2})[.:;](?P<f>\d{2})')
-    raw = [(int(m.group('h')), int(m.group('m')), int(m.group('s')), int(m.group('f'))) for m in tc_pat.finditer(ltcdump_out)]
-
-    if not raw:
-        LOGGER.info("Found LTC matches: []")
-        return False
-
-    def to_frames(h, m, s, f, fps):
-        return (((h * 60) + m) * 60 + s) * fps + f
-
-    seen = set()
-    ordered_unique = []
-    for tc in raw:
-        if tc not in seen:
-            seen.add(tc)
-            ordered_unique.append(tc)
-
-    best_ratio = 0.0
-    best_fps = None
-    best_valid_seq = []
-
-    for fps in fps_candidates:
-        valid = [(h, m, s, f) for (h, m, s, f) in ordered_unique if m < 60 and s < 60 and f < fps]
-        if len(valid) < match_threshold or len(set(valid)) < min_unique: continue
-
-        frames = [to_frames(h, m, s, f, fps) for (h, m, s, f) in valid]
-        if len(frames) < 2: continue
+def detect_ltc_in_channel(samples, channel, match_threshold=6, min_unique=4, min_monotonic_ratio=0.6, fps_candidates=(24, 25, 30)):
+    # samples is the stream's decoded 48 kHz buffer; channel is 0 (left) or 1 (right)
+    result = detect_ltc(samples[:, channel], match_threshold=match_threshold, min_unique=min_unique,
+                        min_monotonic_ratio=min_monotonic_ratio, fps_candidates=fps_candidates)
 
-        deltas = [frames[i+1] - frames[i] for i in range(len(frames) - 1)]
-        max_jump = 2 * fps
+    LOGGER.info(f"Found LTC matches: {[format_timecode(tc) for tc in result.timecodes]}")
+    LOGGER.info(f"LTC score → fps={result.fps} monotonic_ratio={result.monotonic_ratio:.2f} valid={len(result.timecodes)} unique={result.unique}")
 
-        good_fwd = sum(1 for d in deltas if 0 < d <= max_jump)
-        good_rev = sum(1 for d in deltas if -max_jump <= d < 0)
-        ratio = max(good_fwd, good_rev) / len(deltas)
-
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_fps = fps
-            best_valid_seq = valid
-
-    LOGGER.info(f"Found LTC matches: {[f'{h:02d}:{m:02d}:{s:02d}.{f:02d}' for (h, m, s, f) in best_valid_seq]}")
-    LOGGER.info(f"LTC score → fps={best_fps} monotonic_ratio={best_ratio:.2f} valid={len(best_valid_seq)} unique={len(set(best_valid_seq))}")
-
-    if best_fps is not None and best_ratio >= min_monotonic_ratio and len(best_valid_seq) >= match_threshold:
-        return True
-    return False
-
-def analyze_channel_activity(input_file, stream_index, channel, probe_duration=240, headroom_db=8.0, min_active_ratio=0.01, start_time=0.0):
-    chan_idx = 0 if channel == 'left' else 1
-    af_astats = f"pan=mono|c0=c{chan_idx},highpass=f=20,lowpass=f=18000,astats=metadata=1:reset=1,ametadata=print:key=lavfi.astats.0.RMS_level:mode=print"
-    cmd1 = ["ffmpeg","-hide_banner","-nostats"]
-    if start_time > 0.0:
-        cmd1.extend(["-ss", f"{start_time:.6f}"])
-    cmd1.extend(["-t", str(probe_duration),"-i", str(input_file),"-map", f"0:{stream_index}","-af", af_astats, "-f", "null", "-"])
-    proc1 = subprocess.run(cmd1, capture_output=True, text=True)
-
-    regex_pattern = r"lavfi\.astats\.0\.RMS_level\s*[:=]\s*(-?\d+(?:\.\d+)?|-inf)"
-    levels = [float(x) for x in re.findall(regex_pattern, proc1.stdout)]
-    if not levels:
-        fallback_pattern = r"(?:lavfi\.astats\.\d+\.RMS_level|RMS[_\s]?level(?:\s*dB)?)\s*[:=]\s*(-?\d+(?:\.\d+)?|-inf)"
-        levels = [float(x) for x in re.findall(fallback_pattern, proc1.stderr)]
-
-    def percentile(vals, p):
-        if not vals: return None
-        vals = sorted(vals)
-        if p <= 0: return vals[0]
-        if p >= 100: return vals[-1]
-        idx = int(round((p/100.0) * (len(vals)-1)))
-        return vals[idx]
-
-    p20 = percentile(levels, 20) if levels else -90.0
-    p50 = percentile(levels, 50) if levels else -90.0
-    p95 = percentile(levels, 95) if levels else -90.0
-
-    threshold = (p20 + headroom_db) if levels else -60.0
-    active = sum(lvl > threshold for lvl in levels) if levels else 0
-    active_ratio = (active / len(levels)) if levels else 0.0
-
-    af_vol = f"pan=mono|c0=c{chan_idx},volumedetect"
-    cmd2 = ["ffmpeg","-hide_banner","-nostats"]
-    if start_time > 0.0:
-        cmd2.extend(["-ss", f"{start_time:.6f}"])
-    cmd2.extend(["-t", str(probe_duration),"-i", str(input_file),"-map", f"0:{stream_index}","-af", af_vol, "-f", "null", "-"])
-    proc2 = subprocess.run(cmd2, capture_output=True, text=True)
-    mean_m = re.search(r"mean_volume:\s*(-?\d+(?:\.\d+)?)\s*dB", proc2.stderr)
-    max_m  = re.search(r"max_volume:\s*(-?\d+(?:\.\d+)?)\s*dB",  proc2.stderr)
-    mean_vol = float(mean_m.group(1)) if mean_m else None
-    max_vol  = float(max_m.group(1))  if max_m  else None
-
-    return {
-        "noise_floor": p20, "median": p50, "p95": p95, "threshold": threshold,
-        "active_ratio": active_ratio, "is_silent": (active_ratio < min_active_ratio),
-        "mean_vol": mean_vol, "max_vol": max_vol
-    }
+    return result.detected
 
 def detect_audio_pan(input_file, audio_pan, probe_duration=240, relative_db_gate=8.0, start_time=0.0):
     LOGGER.info(f"  → Analyzing audio for auto-panning (probing 240s starting at {start_time:.3f}s)...")
-    ffprobe_command = ["ffprobe", "-i", str(input_file), "-show_entries", "stream=index:stream=codec_type", "-select_streams", "a", "-of", "compact=p=0:nk=1", "-v", "0"]
-    ffprobe_result = subprocess.run(ffprobe_command, capture_output=True, text=True)
-    audio_streams = [int(line.split('|')[0]) for line in ffprobe_result.stdout.splitlines() if "audio" in line]
+    streams = probe_audio_streams(input_file)
+    audio_streams = [index for index, _ in streams]
 
     LOGGER.info(f"Detected {len(audio_streams)} audio streams: {audio_streams} in {input_file}")
 
     pan_filters = []
     pan_filter_idx = 0
 
-    for stream_index in audio_streams:
+    for stream_index, channels in streams:
         LOGGER.info(f"Analyzing audio stream: {stream_index}")
-        L = analyze_channel_activity(input_file, stream_index, 'left',  probe_duration=probe_duration, start_time=start_time)
-        R = analyze_channel_activity(input_file, stream_index, 'right', probe_duration=probe_duration, start_time=start_time)
+        # One decode per stream feeds the level stats of every channel and the LTC check
+        try:
+            samples, levels = analyze_stream(input_file, stream_index, channels, probe_duration, start_time=start_time)
+        except RuntimeError as e:
+            LOGGER.warning(f"Stream {stream_index}: audio decode failed ({e})")
+            samples, levels = None, []
+        L = levels[0] if len(levels) > 0 else empty_levels()
+        R = levels[1] if len(levels) > 1 else empty_levels()
 
         def fmt(stats):
             return (f"nf={stats['noise_floor']:.1f}dB p50={stats['median']:.1f}dB "
@@ -732,8 +776,8 @@ def detect_audio_pan(input_file, audio_pan, probe_duration=240, relative_db_gate
 
         left_has_ltc = right_has_ltc = False
         if audio_pan == "auto":
-            left_has_ltc  = detect_ltc_in_channel(input_file, stream_index, 'left',  probe_duration=probe_duration, start_time=start_time)
-            right_has_ltc = detect_ltc_in_channel(input_file, stream_index, 'right', probe_duration=probe_duration, start_time=start_time)
+            left_has_ltc  = len(levels) > 0 and detect_ltc_in_channel(samples, 0)
+            right_has_ltc = len(levels) > 1 and detect_ltc_in_channel(samples, 1)
 
         if left_has_ltc and not right_has_ltc:
             if right_is_silent:
@@ -780,7 +824,8 @@ def detect_audio_pan(input_file, audio_pan, probe_duration=240, relative_db_gate
         pan_filter_idx += 1
     return pan_filters
 
-def convert_to_mp4(input_file, input_directory, audio_pan, force_16x9=False, trim_colorbars=False):
+def plan_mp4(input_file, input_directory, audio_pan, force_16x9=False, trim_colorbars=False, framemd5=False):
+    # Analysis half of convert_to_mp4: probes, colorbar detection and audio pan analysis
     def get_video_metadata(input_file):
         ffprobe_command = ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height,sample_aspect_ratio", "-of", "csv=p=0"]
         result = subprocess.run(ffprobe_command + [str(input_file)], capture_output=True, text=True)
@@ -870,13 +915,67 @@ def convert_to_mp4(input_file, input_directory, audio_pan, force_16x9=False, tri
 
     command.append(str(output_file))
 
-    LOGGER.info(f"FFmpeg command: {' '.join(command)}")
-    subprocess.check_call(command)
-    LOGGER.info(f"MP4 created: {output_file}")
+    job = ServiceCopyJob(input_file=input_file, output_file=output_file, command=command)
+
+    # Lossless preservation masters are decoded once for both the MP4 and the framemd5;
+    # a trimmed service copy starts mid-file, so its framemd5 is left to generate_framemd5_files
+    if framemd5 and input_file.suffix == ".mkv" and not trim_args:
+        framemd5_file = framemd5_path(input_file)
+        if not framemd5_is_current(input_file, framemd5_file):
+            job.framemd5_file = framemd5_file
+
+    return job
+
+def with_encode_options(command, threads=None, quiet=False):
+    command = list(command)
+    if threads:
+        # -threads right after the codec applies to the x264 encoder of the MP4 output
+        position = command.index("libx264") + 1
+        command[position:position] = ["-threads", str(threads)]
+    if quiet:
+        # Concurrent encodes would interleave their progress lines
+        command[1:1] = ["-hide_banner", "-loglevel", "error", "-nostats"]
+    return command
+
+def encode_service_copy(job, threads=None, quiet=False):
+    # Encode half of convert_to_mp4 / convert_mov_file
+    if job.master_command:
+        master_command = with_encode_options(job.master_command, quiet=quiet)
+        LOGGER.info(f"Running MKV (FFV1) command: {' '.join(master_command)}")
+        subprocess.run(master_command, check=True)
+        LOGGER.info(f"Created Preservation Master: {job.master_file}")
+
+    if job.command is None:
+        return None
 
-    return output_file
+    command = with_encode_options(job.command, threads=threads, quiet=quiet)
+    framemd5_temp = None
+    if job.framemd5_file is not None:
+        framemd5_temp = framemd5_temp_path(job.framemd5_file)
+        command += framemd5_output_args(framemd5_temp)
 
-def convert_mov_file(input_file, input_directory, audio_pan, force_16x9=False, trim_colorbars=False):
+    LOGGER.info(f"FFmpeg command: {' '.join(command)}")
+    try:
+        subprocess.check_call(command)
+    except subprocess.CalledProcessError:
+        if framemd5_temp is not None and framemd5_temp.exists():
+            framemd5_temp.unlink()
+        raise
+    LOGGER.info(f"MP4 created: {job.output_file}")
+    if framemd5_temp is not None and framemd5_temp.exists():
+        framemd5_temp.replace(job.framemd5_file)
+        LOGGER.info(f"framemd5 created alongside the MP4: {job.framemd5_file.name}")
+
+    return job.output_file
+
+def convert_to_mp4(input_file, input_directory, audio_pan, force_16x9=False, trim_colorbars=False, framemd5=False):
+    job = plan_mp4(input_file, input_directory, audio_pan, force_16x9, trim_colorbars, framemd5=framemd5)
+    if job is None:
+        return None
+    return encode_service_copy(job)
+
+def plan_mov_file(input_file, input_directory, audio_pan, force_16x9=False, trim_colorbars=False):
+    # The MP4 is analyzed from the MOV itself, so analysis does not wait for the FFV1 master
     def get_video_resolution(path):
         ffprobe_command = ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height", "-of", "csv=p=0", str(path)]
         result = subprocess.run(ffprobe_command, capture_output=True, text=True)
@@ -917,11 +1016,16 @@ def convert_mov_file(input_file, input_directory, audio_pan, force_16x9=False, t
 
     ffv1_cmd.append(str(mkv_output))
 
-    LOGGER.info(f"Running MKV (FFV1) command: {' '.join(ffv1_cmd)}")
-    subprocess.run(ffv1_cmd, check=True)
-    LOGGER.info(f"Created Preservation Master: {mkv_output}")
+    job = plan_mp4(input_file, input_directory, audio_pan, force_16x9, trim_colorbars)
+    if job is None:
+        # No MP4 can be made, but the preservation master is still transcoded
+        job = ServiceCopyJob(input_file=input_file, output_file=None, command=None)
+    job.master_command = ffv1_cmd
+    job.master_file = mkv_output
+    return job
 
-    convert_to_mp4(input_file, input_directory, audio_pan, force_16x9, trim_colorbars)
+def convert_mov_file(input_file, input_directory, audio_pan, force_16x9=False, trim_colorbars=False):
+    return encode_service_copy(plan_mov_file(input_file, input_directory, audio_pan, force_16x9, trim_colorbars))
 
 def move_files(input_directory):
     files_to_move = list(itertools.chain(input_directory.glob("*.mp4"), input_directory.glob("*.mov"), input_directory.glob("*.mkv"), input_directory.glob("*.framemd5"), input_directory.glob("*.vtt")))
@@ -1038,6 +1142,9 @@ def main():
     parser.add_argument("-p", "--audio-pan", choices=["left", "right", "none", "center", "auto"], default="none", help="Pan audio to center from left, right, or auto-detect mono audio.")
     parser.add_argument("--force-16x9", action="store_true", help="For SD sources (720x486/576), force MP4 display aspect ratio to 16:9 (anamorphic).")
     parser.add_argument("--trim-colorbars", action="store_true", help="Detect and trim head colorbars/tone during the generation of the MP4 Service Copy.")
+    parser.add_argument("--encode-jobs", type=int, default=DEFAULT_ENCODE_JOBS, help=f"Service copies encoded at once; the next file is analyzed while they encode (default: {DEFAULT_ENCODE_JOBS}).")
+    parser.add_argument("--framemd5-jobs", type=int, default=DEFAULT_FRAMEMD5_JOBS, help=f"framemd5 files generated at once (default: {DEFAULT_FRAMEMD5_JOBS}).")
+    parser.add_argument("--separate-framemd5", action="store_true", help="Generate every framemd5 in its own pass instead of alongside the MP4 transcode of the same MKV.")
 
     args = parser.parse_args()
 
@@ -1056,9 +1163,10 @@ def main():
     process_dv_files(input_dir)
     rename_mkv_parts(input_dir)
     process_hdv_files(input_dir)
-    convert_mkv_dv_to_mp4(input_dir, args.audio_pan, args.force_16x9, args.trim_colorbars)
-    process_mov_files(input_dir, args.audio_pan, args.force_16x9, args.trim_colorbars)
-    generate_framemd5_files(input_dir)
+    convert_mkv_dv_to_mp4(input_dir, args.audio_pan, args.force_16x9, args.trim_colorbars,
+                          framemd5=not args.separate_framemd5, encode_jobs=args.encode_jobs)
+    process_mov_files(input_dir, args.audio_pan, args.force_16x9, args.trim_colorbars, encode_jobs=args.encode_jobs)
+    generate_framemd5_files(input_dir, jobs=args.framemd5_jobs)
     rename_files(input_dir, video_extensions.union(audio_extensions))
     move_files(input_dir)
     process_log_and_xml_files(input_dir)